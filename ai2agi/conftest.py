@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The modules import each other as top-level packages (core, ada_network, ...), as run.py does
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -1,7 +1,10 @@
 # ai_control.py
 
 import random
-import time
+import asyncio
+import inspect
+from core.tick_scheduler import TickScheduler
+from core.rule_engine import DecisionTable
 
 class AIControl:
     """
@@ -9,21 +12,42 @@ class AIControl:
     activation, decision-making, and task execution in a more advanced manner.
     """
 
-    def __init__(self):
+    def __init__(self, tick_interval=2.0, sensor_reader=None, scheduler=None, decision_table=None):
+        """
+        :param tick_interval: Seconds between two environment checks; can be changed while running.
+        :param sensor_reader: Optional function or coroutine function returning environmental data.
+        :param scheduler: TickScheduler shared with other controllers (a new one when None).
+        :param decision_table: Compiled DecisionTable (the "control_decision" table of
+            settings/decision_rules.json when None).
+        """
         # Initializing the AI's status and any necessary components like environment
         self.status = "Idle"  # The initial status of the AI is 'Idle'
         self.environment = {}  # Placeholder for environmental data
         self.active_tasks = []  # List to track active tasks for AI
         self.is_active = False  # The AI is not active initially
+        self.tick_interval = tick_interval
+        self.sensor_reader = sensor_reader or self.simulate_sensors
+        self.scheduler = scheduler or TickScheduler()
+        self.monitor_task = None  # asyncio task running the control loop
+        self.decision_table = decision_table or DecisionTable.from_file("control_decision")
 
     def activate_ai(self):
         """
         Activate the AI system to begin decision-making, task execution, and environmental interaction.
+
+        Inside a running event loop the control loop is scheduled as a task and returned,
+        so many controllers can share one loop. Outside of an event loop it runs until deactivated.
         """
         self.status = "Active"
         self.is_active = True
         print("AI Activated.")
-        self.monitor_environment()
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self.monitor_environment()
+            return None
+        self.monitor_task = self.scheduler.every(lambda: self.tick_interval, self.monitor_tick)
+        return self.monitor_task
 
     def deactivate_ai(self):
         """
@@ -31,6 +55,12 @@ class AIControl:
         """
         self.status = "Idle"
         self.is_active = False
+        if self.monitor_task is not None:
+            loop = self.monitor_task.get_loop()
+            if not loop.is_closed():  # A closed loop no longer runs the task
+                # Thread-safe, so a blocking monitor_environment() can be stopped from another thread
+                loop.call_soon_threadsafe(self.monitor_task.cancel)
+            self.monitor_task = None
         print("AI Deactivated.")
 
     def analyze_environment(self, environmental_data):
@@ -51,12 +81,7 @@ class AIControl:
         :param environmental_data: The processed environment data.
         :return: The decision to be made based on the environment.
         """
-        if environmental_data.get("temperature") > 30:
-            return "Cool down the environment."
-        elif environmental_data.get("light") == "low":
-            return "Increase light."
-        else:
-            return "Maintain current state."
+        return self.decision_table.evaluate(environmental_data)[0]
 
     def create_child_cell(self):
         """
@@ -65,29 +90,57 @@ class AIControl:
         print("Creating a new child cell to enhance the system.")
         # Logic for creating a child cell can be added here.
 
+    def simulate_sensors(self):
+        """
+        Simulate environmental data (you can replace this with real data sources).
+        """
+        return {
+            "temperature": random.randint(10, 35),  # Random temperature
+            "light": random.choice(["low", "medium", "high"])  # Random light condition
+        }
+
+    async def monitor_tick(self):
+        """
+        One monitoring step: read the sensors, analyze the environment and act on the decision.
+        :return: False once the AI is deactivated, which stops the periodic job.
+        """
+        if not self.is_active:
+            return False
+        environmental_data = self.sensor_reader()
+        if inspect.isawaitable(environmental_data):
+            environmental_data = await environmental_data
+        
+        # Analyze the environment
+        decision = self.analyze_environment(environmental_data)
+        print(f"Action decided: {decision}")
+        
+        if decision == "Cool down the environment.":
+            self.create_child_cell()  # Example of action taken based on decision
+        return True
+
     def monitor_environment(self):
         """
         Simulate monitoring the environment. This is an ongoing process that continues while the AI is active.
+        Blocks the calling thread; inside an event loop use activate_ai(), which schedules a task instead.
         """
-        while self.is_active:
-            # Simulate environmental data (you can replace this with real data sources)
-            environmental_data = {
-                "temperature": random.randint(10, 35),  # Random temperature
-                "light": random.choice(["low", "medium", "high"])  # Random light condition
-            }
-            
-            # Analyze the environment
-            decision = self.analyze_environment(environmental_data)
-            print(f"Action decided: {decision}")
-            
-            if decision == "Cool down the environment.":
-                self.create_child_cell()  # Example of action taken based on decision
-            
-            # Sleep before re-running the environment monitoring
-            time.sleep(2)  # Simulating real-time monitoring with a delay
+        async def monitor():
+            self.monitor_task = self.scheduler.every(lambda: self.tick_interval, self.monitor_tick)
+            try:
+                await self.monitor_task
+            except asyncio.CancelledError:
+                pass
+
+        asyncio.run(monitor())
 
 # Example of controlling AI activation
 if __name__ == "__main__":
-    ai_control = AIControl()  # Create an AIControl instance
-    ai_control.activate_ai()  # Activate AI to start the process
-    # ai_control.deactivate_ai()  # Uncomment to deactivate AI later
+    async def main():
+        scheduler = TickScheduler()
+        controllers = [AIControl(tick_interval=0.5, scheduler=scheduler) for _ in range(3)]  # Create AIControl instances
+        for ai_control in controllers:
+            ai_control.activate_ai()  # Activate AI to start the process; returns immediately
+        await asyncio.sleep(2)
+        for ai_control in controllers:
+            ai_control.deactivate_ai()  # Cancel the control loops
+
+    asyncio.run(main())
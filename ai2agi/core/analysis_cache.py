@@ -0,0 +1,102 @@
+import json
+import time
+import threading
+from collections import OrderedDict
+
+
+def normalize_environment(environment_data):
+    """
+    Build a cache key from environment input, so equivalent inputs share one entry.
+    Strings only have their whitespace collapsed (the analysis chain receives the raw input,
+    so inputs that differ in case are kept apart); other data is serialized with sorted keys.
+    """
+    if isinstance(environment_data, str):
+        return " ".join(environment_data.split())
+    try:
+        return json.dumps(environment_data, sort_keys=True, default=str)
+    except TypeError:
+        return repr(environment_data)
+
+
+class AnalysisCache:
+    """
+    Bounded LRU cache with an optional time-to-live, for results of the analysis chain.
+
+    Keeps hit, miss, eviction and expiration counters and can be cleared through invalidate()
+    or by registered invalidation hooks.
+    """
+
+    def __init__(self, max_size=1024, ttl=None):
+        """
+        :param max_size: Maximum number of cached results; the least recently used is evicted.
+        :param ttl: Seconds a result stays valid, or None to keep it until evicted.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (value, stored at)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.listeners = []
+
+    def get(self, key, default=None):
+        """Return the cached value for a key and mark it as recently used."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+                del self.entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entry when the cache is full."""
+        with self.lock:
+            self.entries[key] = (value, time.monotonic())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, reason=None):
+        """Drop every cached result, e.g. after the cell's chromosomes changed."""
+        with self.lock:
+            self.entries.clear()
+            self.invalidations += 1
+        for listener in self.listeners:
+            listener(reason)
+
+    def add_invalidation_listener(self, listener):
+        """Register a function called with the reason whenever the cache is invalidated."""
+        self.listeners.append(listener)
+
+    def get_stats(self):
+        """Return the cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations
+        }
+
+# Example of caching repeated environments
+if __name__ == "__main__":
+    cache = AnalysisCache(max_size=2, ttl=60)
+    for environment in ["safe  environment", "safe environment", "danger zone", "new area", "safe environment"]:
+        key = normalize_environment(environment)
+        if cache.get(key) is None:
+            cache.put(key, f"analysis of {key}")
+    print(cache.get_stats())
@@ -0,0 +1,307 @@
+import json
+import asyncio
+import threading
+from urllib.parse import parse_qs
+from core.cell_registry import IdAllocator
+
+STATUS_TEXT = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 411: "Length Required", 413: "Payload Too Large"}
+MAX_BODY_SIZE = 64 * 1024 * 1024
+STREAM_CHUNK_SIZE = 1000  # Cells per chunk of a streamed listing
+
+
+class CellStore:
+    """Thread-safe in-memory store of cells, keyed by ID."""
+
+    def __init__(self):
+        self.cells = {}
+        self.allocator = IdAllocator()
+        self.lock = threading.Lock()
+
+    def create(self, cell_data):
+        cell = dict(cell_data, id=self.allocator.allocate("CELL"))
+        with self.lock:
+            self.cells[cell["id"]] = cell
+        return cell
+
+    def update(self, cell_id, updated_data):
+        with self.lock:
+            cell = self.cells.get(cell_id)
+            if cell is not None:
+                cell.update(updated_data)
+                cell["id"] = cell_id
+            return cell
+
+    def get(self, cell_id):
+        return self.cells.get(cell_id)
+
+    def delete(self, cell_id):
+        with self.lock:
+            return self.cells.pop(cell_id, None) is not None
+
+    def snapshot(self):
+        """Return the current cells as a list, safe to iterate while the store changes."""
+        with self.lock:
+            return list(self.cells.values())
+
+
+def _encode(body):
+    return json.dumps(body, separators=(",", ":")).encode("utf-8")
+
+
+def _is_list_of(payload, item_type):
+    """Return True if a bulk payload is a list (or absent) whose items all have the given type."""
+    return payload is None or isinstance(payload, list) and all(isinstance(item, item_type) for item in payload)
+
+
+class CellAPIProtocol(asyncio.Protocol):
+    """
+    Minimal HTTP/1.1 server protocol for the cell API.
+
+    Supports keep-alive and pipelined requests with Content-Length bodies. Endpoints:
+        POST   /create_cell            create one cell
+        POST   /create_cells           create a list of cells
+        GET    /cells/{id}             status of one cell
+        PUT    /cells/{id}/update      update one cell
+        DELETE /cells/{id}[/delete]    delete one cell
+        PUT    /cells/bulk_update      update a list of cells (each with its "id")
+        POST   /cells/bulk_status      status of a list of cell IDs
+        POST   /cells/bulk_delete      delete a list of cell IDs
+        GET    /cells[?status=...]     stream all (matching) cells as JSON lines
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.transport = None
+        self.buffer = bytearray()
+        self.streaming = None  # Task writing a streamed response; pipelined requests wait for it
+        self.can_write = asyncio.Event()
+        self.can_write.set()
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def connection_lost(self, exc):
+        self.can_write.set()
+        if self.streaming is not None:
+            self.streaming.cancel()
+
+    def pause_writing(self):
+        self.can_write.clear()
+
+    def resume_writing(self):
+        self.can_write.set()
+
+    def data_received(self, data):
+        self.buffer += data
+        if self.streaming is None:
+            self.process_buffer()
+
+    def process_buffer(self):
+        """
+        Handle every complete request in the buffer.
+
+        Requests are parsed at an increasing offset and the consumed bytes are removed once
+        at the end, so a burst of pipelined requests is handled in linear time.
+        """
+        offset = 0
+        try:
+            while self.streaming is None and not self.transport.is_closing():
+                header_end = self.buffer.find(b"\r\n\r\n", offset)
+                if header_end < 0:
+                    return
+                try:
+                    request_line, *header_lines = self.buffer[offset:header_end].decode("latin-1").split("\r\n")
+                    method, target, version = request_line.split(" ", 2)
+                    headers = {}
+                    for line in header_lines:
+                        name, _, value = line.partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                    length = int(headers.get("content-length", 0) or 0)
+                    if length < 0:
+                        raise ValueError("Negative Content-Length")
+                except ValueError:
+                    self.respond(400, {"error": "Malformed request"}, keep_alive=False)
+                    return
+                if "chunked" in headers.get("transfer-encoding", ""):
+                    self.respond(411, {"error": "Chunked request bodies are not supported"}, keep_alive=False)
+                    return
+                if length > MAX_BODY_SIZE:
+                    self.respond(413, {"error": "Body too large"}, keep_alive=False)
+                    return
+                body_end = header_end + 4 + length
+                if len(self.buffer) < body_end:
+                    return  # Wait for the rest of the body
+                body = bytes(self.buffer[header_end + 4:body_end])
+                offset = body_end
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                try:
+                    payload = json.loads(body) if body else None
+                except ValueError:
+                    self.respond(400, {"error": "Invalid JSON body"}, keep_alive)
+                    continue
+                self.route(method, target, payload, keep_alive)
+                if not keep_alive:
+                    return
+        finally:
+            del self.buffer[:offset]
+
+    def respond(self, status, body, keep_alive=True):
+        payload = _encode(body)
+        self.transport.write(
+            f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+            .encode("latin-1") + payload)
+        if not keep_alive:
+            self.transport.close()
+
+    def route(self, method, target, payload, keep_alive):
+        path, _, query = target.partition("?")
+        parts = path.strip("/").split("/")
+        store = self.store
+
+        # Bodies of the bulk endpoints are lists of cells (objects) or of cell IDs (strings)
+        expected = {"/create_cells": dict, "/cells/bulk_update": dict,
+                    "/cells/bulk_status": str, "/cells/bulk_delete": str}.get(path)
+        if expected is not None and not _is_list_of(payload, expected):
+            kind = "objects" if expected is dict else "cell IDs"
+            self.respond(400, {"error": f"Body must be a list of {kind}"}, keep_alive)
+        elif path == "/cells/bulk_update" and not all(isinstance(item.get("id"), str) for item in payload or []):
+            self.respond(400, {"error": "Every cell must have a string \"id\""}, keep_alive)
+        elif payload is not None and not isinstance(payload, dict) and (
+                path == "/create_cell" or parts[-1:] == ["update"]):
+            self.respond(400, {"error": "Body must be an object"}, keep_alive)
+        elif method == "POST" and path == "/create_cell":
+            self.respond(201, store.create(payload or {}), keep_alive)
+        elif method == "POST" and path == "/create_cells":
+            self.respond(201, [store.create(cell_data) for cell_data in payload or []], keep_alive)
+        elif method == "PUT" and path == "/cells/bulk_update":
+            self.respond(200, [store.update(item.get("id"), item) for item in payload or []], keep_alive)
+        elif method == "POST" and path == "/cells/bulk_status":
+            self.respond(200, [store.get(cell_id) for cell_id in payload or []], keep_alive)
+        elif method == "POST" and path == "/cells/bulk_delete":
+            self.respond(200, [store.delete(cell_id) for cell_id in payload or []], keep_alive)
+        elif method == "GET" and path == "/cells":
+            status = parse_qs(query).get("status", [None])[0]
+            self.streaming = asyncio.get_running_loop().create_task(self.stream_cells(status, keep_alive))
+        elif len(parts) >= 2 and parts[0] == "cells":
+            cell_id = parts[1]
+            if method == "GET" and len(parts) == 2:
+                cell = store.get(cell_id)
+            elif method == "PUT" and parts[2:] == ["update"]:
+                cell = store.update(cell_id, payload or {})
+            elif method == "DELETE" and parts[2:] in ([], ["delete"]):
+                cell = {"deleted": cell_id} if store.delete(cell_id) else None
+            else:
+                self.respond(405, {"error": "Method not allowed"}, keep_alive)
+                return
+            if cell is None:
+                self.respond(404, {"error": "Cell not found"}, keep_alive)
+            else:
+                self.respond(200, cell, keep_alive)
+        else:
+            self.respond(404, {"error": "Not found"}, keep_alive)
+
+    async def stream_cells(self, status, keep_alive):
+        """Stream the cells as JSON lines with chunked transfer encoding, honouring flow control."""
+        try:
+            self.transport.write(
+                "HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nTransfer-Encoding: chunked\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1"))
+            cells = self.store.snapshot()
+            for start in range(0, len(cells), STREAM_CHUNK_SIZE):
+                lines = b"".join(_encode(cell) + b"\n" for cell in cells[start:start + STREAM_CHUNK_SIZE]
+                                 if status is None or cell.get("status") == status)
+                if lines:
+                    self.transport.write(b"%x\r\n%s\r\n" % (len(lines), lines))
+                await self.can_write.wait()
+                if self.transport.is_closing():
+                    return
+            self.transport.write(b"0\r\n\r\n")
+            if not keep_alive:
+                self.transport.close()
+        finally:
+            self.streaming = None
+        if self.buffer and not self.transport.is_closing():
+            self.process_buffer()
+
+
+class CellAPIServer:
+    """Local asyncio server for the cell REST API, backed by an in-memory CellStore."""
+
+    def __init__(self, host="127.0.0.1", port=0, store=None):
+        """
+        :param port: Port to listen on (0 picks a free port).
+        :param store: CellStore to serve (a new, empty one when None).
+        """
+        self.host = host
+        self.port = port
+        self.store = store or CellStore()
+        self.server = None
+        self.loop = None
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    async def start_async(self):
+        """Start listening on the running event loop."""
+        self.loop = asyncio.get_running_loop()
+        self.server = await self.loop.create_server(lambda: CellAPIProtocol(self.store), self.host, self.port,
+                                                    backlog=1024)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    def start(self):
+        """Start the server on its own event loop in a background thread."""
+        started = threading.Event()
+
+        def run():
+            loop = asyncio.new_event_loop()
+            loop.run_until_complete(self.start_async())
+            started.set()
+            loop.run_forever()
+            loop.close()
+
+        self.thread = threading.Thread(target=run, daemon=True)
+        self.thread.start()
+        started.wait()
+        return self
+
+    def shutdown(self):
+        """Stop the server and, if started with start(), its background loop."""
+        if self.server is None:
+            return
+        if self.thread is not None:
+            def stop():
+                self.server.close()
+                self.loop.stop()
+            self.loop.call_soon_threadsafe(stop)
+            self.thread.join()
+            self.thread = None
+        else:
+            self.server.close()
+        self.server = None
+
+
+def start_server(host="127.0.0.1", port=0):
+    """
+    Start a local server for the cell API in a background thread.
+
+    :param port: Port to listen on (0 picks a free port).
+    :return: (server, base URL); call server.shutdown() to stop it.
+    """
+    server = CellAPIServer(host, port).start()
+    return server, server.url
+
+# Run the cell API on a fixed port
+if __name__ == "__main__":
+    async def main():
+        server = await CellAPIServer(port=8080).start_async()
+        print(f"Cell API listening on {server.url}")
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
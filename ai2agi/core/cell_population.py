@@ -0,0 +1,434 @@
+import time
+import numpy as np
+from core.cell_registry import default_allocator
+from core.performance_log import get_performance_log
+
+# Status codes stored in the population's status array
+STATUS_ACTIVE = 0
+STATUS_RESTING = 1
+STATUS_INACTIVE = 2
+STATUS_NAMES = ("active", "resting", "inactive")
+
+GENE_NAMES = ("performance_genes", "evolution_genes", "learning_genes")
+
+# Rules a population follows: those of GrandchildCell or of ChildCell
+CELL_TYPES = ("grandchild", "child")
+
+
+class CellPopulation:
+    """
+    Struct-of-arrays engine for large GrandchildCell or ChildCell populations.
+
+    Instead of one Python object per cell, the energy level, status, completed task count
+    and the three chromosome genes of every cell live in NumPy arrays. perform_task,
+    self_evolve and receive_energy are applied to the whole population (or to a subset of
+    indices) in one vectorized step, following the same rules as GrandchildCell, or as
+    ChildCell when cell_type is "child": energy is not capped, evolution only depends on
+    energy (> 0.8) and tasks are recorded by active cells without being performed.
+    """
+
+    def __init__(self, size, parent_id, initial_energy=None, energy_threshold=0.3,
+                 task_capacity=4, seed=None, allocator=None, cell_type="grandchild"):
+        """
+        Initialize a population of cells that share the same parent.
+
+        :param size: Number of cells in the population.
+        :param parent_id: The ID of the parent cell of every cell in the population.
+        :param initial_energy: Starting energy of each cell (1.0 for grandchild cells, 0.5 for child cells when None).
+        :param energy_threshold: Energy level at or below which a cell goes to rest after a task.
+        :param task_capacity: Initial length of each cell's task queue; grows when needed.
+        :param seed: Optional seed for the random generator used for the genes.
+        :param allocator: IdAllocator reserving the population's block of IDs (the shared one when None).
+        :param cell_type: "grandchild" for GrandchildCell rules, "child" for ChildCell rules.
+        """
+        if cell_type not in CELL_TYPES:
+            raise ValueError(f"Unknown cell type: {cell_type}")
+        if initial_energy is None:
+            initial_energy = 1.0 if cell_type == "grandchild" else 0.5
+        self.cell_type = cell_type
+        self.parent_id = parent_id
+        self.size = size
+        self.energy_threshold = energy_threshold
+        self.creation_time = time.time()
+        self.rng = np.random.default_rng(seed)
+        self.first_id = (allocator or default_allocator).allocate_block(size)
+
+        self.energy_level = np.full(size, initial_energy, dtype=np.float64)
+        self.status = np.full(size, STATUS_ACTIVE, dtype=np.int8)
+        self.completed_tasks = np.zeros(size, dtype=np.int64)
+        self.performance_genes = self.rng.uniform(0.5, 1.0, size)
+        self.evolution_genes = self.rng.uniform(0.5, 1.0, size)
+        self.learning_genes = self.rng.uniform(0.5, 1.0, size)
+
+        # Task queues: one ring buffer of task codes per cell, task names are interned
+        self.task_names = []
+        self._task_codes = {}
+        self._queue = np.zeros((size, max(1, task_capacity)), dtype=np.int32)
+        self._queue_head = np.zeros(size, dtype=np.int64)
+        self.pending_tasks = np.zeros(size, dtype=np.int64)
+
+    def __len__(self):
+        return self.size
+
+    def _select(self, indices, unique=False):
+        """
+        Return the cell indices an operation applies to (all cells when indices is None).
+
+        :param unique: Drop repeated indices, for operations applied at most once per cell.
+        """
+        if indices is None:
+            return np.arange(self.size)
+        idx = np.atleast_1d(np.asarray(indices, dtype=np.int64))
+        return np.unique(idx) if unique else idx
+
+    def cell_id(self, index):
+        """Return the ID of the cell stored at the given index."""
+        return f"{self.cell_type.upper()}_{self.first_id + index}"
+
+    def task_code(self, task):
+        """Return the integer code of a task name, interning it on first use."""
+        code = self._task_codes.get(task)
+        if code is None:
+            code = len(self.task_names)
+            self._task_codes[task] = code
+            self.task_names.append(task)
+        return code
+
+    def _grow_queues(self, required):
+        """Double the task queue capacity until it holds the required number of tasks."""
+        capacity = self._queue.shape[1]
+        new_capacity = capacity
+        while new_capacity < required:
+            new_capacity *= 2
+        # Unroll each ring buffer so that its head moves back to column 0
+        order = (self._queue_head[:, None] + np.arange(capacity)) % capacity
+        unrolled = np.take_along_axis(self._queue, order, axis=1)
+        self._queue = np.zeros((self.size, new_capacity), dtype=np.int32)
+        self._queue[:, :capacity] = unrolled
+        self._queue_head[:] = 0
+
+    def assign_task(self, task, indices=None):
+        """
+        Append a task to the queue of every selected cell.
+
+        Child cells record the task (as ChildCell.execute_task does) only while they are active
+        and count it as completed; their queue keeps the recorded tasks.
+
+        :param task: The task to assign.
+        :param indices: Indices of the cells receiving the task (all cells when None).
+        """
+        idx = self._select(indices, unique=True)
+        if self.cell_type == "child":
+            idx = idx[self.status[idx] == STATUS_ACTIVE]
+            self.completed_tasks[idx] += 1
+        if idx.size == 0:
+            return
+        required = int(self.pending_tasks[idx].max()) + 1
+        if required > self._queue.shape[1]:
+            self._grow_queues(required)
+        capacity = self._queue.shape[1]
+        tail = (self._queue_head[idx] + self.pending_tasks[idx]) % capacity
+        self._queue[idx, tail] = self.task_code(task)
+        self.pending_tasks[idx] += 1
+
+    def tasks_of(self, index):
+        """Return the pending task names of one cell, oldest first."""
+        capacity = self._queue.shape[1]
+        head = self._queue_head[index]
+        positions = (head + np.arange(self.pending_tasks[index])) % capacity
+        return [self.task_names[code] for code in self._queue[index, positions]]
+
+    def perform_task(self, indices=None):
+        """
+        Perform the next queued task of every selected cell, based on energy and genes.
+
+        Cells without energy go to rest, cells with a task spend 0.1 * performance_genes
+        of energy and go to rest when they reach the energy threshold.
+
+        :param indices: Indices of the cells performing a task (all cells when None).
+        Child cells have no such step (their tasks are recorded by assign_task), so nothing is done for them.
+        No performance log entry is written here; CellView.perform_task logs the task of a single cell.
+
+        :return: A tuple (indices of the cells that completed a task, codes of the completed tasks).
+        """
+        if self.cell_type == "child":
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32)
+        idx = self._select(indices, unique=True)
+        exhausted = self.energy_level[idx] <= 0
+        self.status[idx[exhausted]] = STATUS_RESTING
+
+        working = idx[~exhausted & (self.pending_tasks[idx] > 0)]
+        capacity = self._queue.shape[1]
+        codes = self._queue[working, self._queue_head[working]]
+        self._queue_head[working] = (self._queue_head[working] + 1) % capacity
+        self.pending_tasks[working] -= 1
+
+        self.energy_level[working] -= 0.1 * self.performance_genes[working]
+        self.completed_tasks[working] += 1
+        tired = working[self.energy_level[working] <= self.energy_threshold]
+        self.status[tired] = STATUS_RESTING
+        return working, codes
+
+    def self_evolve(self, indices=None):
+        """
+        Evolve every selected cell whose energy and evolution genes are high enough.
+
+        :param indices: Indices of the cells attempting to evolve (all cells when None).
+        :return: Indices of the cells that evolved.
+        """
+        idx = self._select(indices, unique=True)
+        if self.cell_type == "child":
+            evolving = idx[self.energy_level[idx] > 0.8]
+            self.energy_level[evolving] *= 0.9  # Decrease energy after evolution
+            return evolving
+        evolving = idx[(self.energy_level[idx] >= 0.8) & (self.evolution_genes[idx] > 0.7)]
+        self.energy_level[evolving] *= 0.9  # Decrease energy after evolution
+        self.performance_genes[evolving] += 0.05  # Better performance after evolution
+        return evolving
+
+    def receive_energy(self, energy_amount, indices=None):
+        """
+        Give energy to every selected cell, capped at 100% for grandchild cells.
+
+        A cell selected several times receives every grant.
+
+        :param energy_amount: Amount of energy per cell (scalar or one value per selected cell).
+        :param indices: Indices of the cells receiving energy (all cells when None).
+        """
+        idx = self._select(indices)
+        np.add.at(self.energy_level, idx, energy_amount)
+        if self.cell_type == "grandchild":
+            self.energy_level[idx] = np.minimum(self.energy_level[idx], 1.0)
+
+    def tick(self, energy_amount=None):
+        """
+        Run one simulation step over the whole population: perform tasks, evolve and receive energy.
+
+        :param energy_amount: Energy given to every cell at the end of the step (scalar or one value
+        per cell), or None to give no energy.
+        :return: Number of tasks completed during the step.
+        """
+        performed, _ = self.perform_task()
+        self.self_evolve()
+        if energy_amount is not None:
+            self.receive_energy(energy_amount)
+        return performed.size
+
+    # Arrays that change while tasks run, i.e. the delta of a shard
+    _shard_arrays = ("energy_level", "status", "completed_tasks", "performance_genes",
+                     "evolution_genes", "learning_genes", "_queue_head", "pending_tasks")
+
+    def shard(self, start, stop):
+        """
+        Return a detached copy of the cells in [start, stop), e.g. to run them in another process.
+        Merge the changes back with merge_shard().
+        """
+        shard = CellPopulation.__new__(CellPopulation)
+        shard.__dict__.update(self.__dict__)
+        shard.size = stop - start
+        shard.first_id = self.first_id + start
+        shard.rng = None
+        shard.task_names = list(self.task_names)
+        shard._task_codes = dict(self._task_codes)
+        for name in self._shard_arrays + ("_queue",):
+            setattr(shard, name, getattr(self, name)[start:stop].copy())
+        return shard
+
+    def shard_delta(self):
+        """Return the arrays of a shard that change while its tasks run."""
+        return {name: getattr(self, name) for name in self._shard_arrays}
+
+    def merge_shard(self, start, delta):
+        """Write the delta of a shard created with shard(start, ...) back into the population."""
+        for name, values in delta.items():
+            getattr(self, name)[start:start + len(values)] = values
+
+    def status_counts(self):
+        """Return the number of cells in each status."""
+        counts = np.bincount(self.status, minlength=len(STATUS_NAMES))
+        return {name: int(count) for name, count in zip(STATUS_NAMES, counts)}
+
+    def index_of(self, cell_id):
+        """Return the index of a cell from its ID, or None if the ID is not in this population."""
+        prefix, _, number = cell_id.rpartition("_")
+        index = int(number) - self.first_id if prefix == self.cell_type.upper() and number.isdigit() else -1
+        return index if 0 <= index < self.size else None
+
+    def cell(self, index):
+        """Return a GrandchildCell-like (or ChildCell-like) view of the cell stored at the given index."""
+        if not 0 <= index < self.size:
+            raise IndexError(f"Cell index {index} out of range")
+        return CellView(self, index)
+
+    def __iter__(self):
+        for index in range(self.size):
+            yield CellView(self, index)
+
+
+class _ChromosomeView:
+    """Dict-like access to one cell's genes, backed by the population arrays."""
+
+    def __init__(self, population, index):
+        self._population = population
+        self._index = index
+
+    def __getitem__(self, gene):
+        if gene not in GENE_NAMES:
+            raise KeyError(gene)
+        return float(getattr(self._population, gene)[self._index])
+
+    def __setitem__(self, gene, value):
+        if gene not in GENE_NAMES:
+            raise KeyError(gene)
+        getattr(self._population, gene)[self._index] = value
+
+    def __contains__(self, gene):
+        return gene in GENE_NAMES
+
+    def keys(self):
+        return list(GENE_NAMES)
+
+    def items(self):
+        return [(gene, self[gene]) for gene in GENE_NAMES]
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class CellView:
+    """
+    Thin view of a single cell in a CellPopulation with GrandchildCell (or ChildCell) semantics.
+
+    The view stores no state of its own; every read and write goes to the population arrays.
+    It offers the GrandchildCell interface, plus mother_cell_id for cells of a child population.
+    """
+
+    def __init__(self, population, index):
+        self.population = population
+        self.index = index
+
+    @property
+    def id(self):
+        return self.population.cell_id(self.index)
+
+    @property
+    def parent_id(self):
+        return self.population.parent_id
+
+    @property
+    def mother_cell_id(self):
+        if self.population.cell_type != "child":
+            raise AttributeError("Only child cells have a mother cell")
+        return self.population.parent_id
+
+    @property
+    def energy_level(self):
+        return float(self.population.energy_level[self.index])
+
+    @energy_level.setter
+    def energy_level(self, value):
+        self.population.energy_level[self.index] = value
+
+    @property
+    def status(self):
+        return STATUS_NAMES[self.population.status[self.index]]
+
+    @status.setter
+    def status(self, value):
+        self.population.status[self.index] = STATUS_NAMES.index(value)
+
+    @property
+    def completed_tasks(self):
+        return int(self.population.completed_tasks[self.index])
+
+    @property
+    def tasks(self):
+        return self.population.tasks_of(self.index)
+
+    @property
+    def chromosomes(self):
+        return _ChromosomeView(self.population, self.index)
+
+    @property
+    def layers(self):
+        """The layers of a GrandchildCell, built from the population arrays (a snapshot except the genes)."""
+        return {
+            "genetic_layer": self.chromosomes,
+            "behavioral_layer": {"task_priority": 1, "task_behavior": "default"},
+            "energy_layer": {"current_energy": self.energy_level,
+                             "energy_threshold": self.population.energy_threshold}
+        }
+
+    def assign_task(self, task):
+        """Assign a task to the cell."""
+        self.population.assign_task(task, [self.index])
+
+    def perform_task(self):
+        """Perform the next task of the cell and log it once completed."""
+        performed, codes = self.population.perform_task([self.index])
+        if performed.size:
+            self.log_performance(self.population.task_names[codes[0]], "completed")
+
+    def self_evolve(self):
+        """Evolve the cell if its energy and genes allow it."""
+        self.population.self_evolve([self.index])
+
+    def receive_energy(self, energy_amount):
+        """Receive energy, capped at 100% in grandchild populations only."""
+        self.population.receive_energy(energy_amount, [self.index])
+
+    def collaborate_with(self, other_cell):
+        """Share energy with another cell (a view or a cell object) that runs low, as GrandchildCell does."""
+        if self.energy_level > 0.3 and other_cell.energy_level < 0.5:
+            transfer_energy = min(self.energy_level * 0.2, 0.2)
+            self.energy_level -= transfer_energy
+            other_cell.energy_level += transfer_energy
+            print(f"🤝 الخلية {self.id} شاركت الطاقة مع {other_cell.id}.")
+        else:
+            print(f"⚠️ لا يمكن التعاون بين {self.id} و {other_cell.id} الآن.")
+
+    def log_performance(self, task, status):
+        """Append a performance record of the cell to the shared performance log."""
+        log_entry = {
+            "cell_id": self.id,
+            "task": task,
+            "status": status,
+            "energy_level": self.energy_level,
+            "timestamp": time.time()
+        }
+        get_performance_log("cell_performance.json").log(log_entry)
+
+    def check_status(self):
+        """Print the current status of the cell."""
+        print(f"ℹ️ حالة الخلية {self.id}: {self.status}. الطاقة: {self.energy_level}")
+
+    def monitor_performance(self):
+        """Print the performance statistics of the cell."""
+        print(f"📊 تقرير الخلية {self.id}:")
+        print(f"  🔹 المهام المكتملة: {self.completed_tasks}")
+        print(f"  🔹 مستوى الطاقة: {self.energy_level}")
+        print(f"  🔹 جين الأداء: {self.chromosomes['performance_genes']}")
+        print(f"  🔹 جين التطور: {self.chromosomes['evolution_genes']}")
+
+# Example of running a large population in vectorized steps
+if __name__ == "__main__":
+    population = CellPopulation(100000, parent_id="CHILD_1001", seed=42)
+
+    population.assign_task("Analyze environment")
+    population.assign_task("Run adaptation protocol", indices=np.arange(0, 100000, 2))
+
+    for _ in range(3):
+        print(population.tick(energy_amount=0.05), "tasks completed")
+
+    print(population.status_counts())
+
+    # Child-cell populations follow the ChildCell rules
+    children = CellPopulation(1000, parent_id="MOTHER_CELL_1", seed=42, cell_type="child")
+    children.receive_energy(0.7)
+    print(children.self_evolve().size, "child cells evolved")
+
+    # Single cells can still be used like a GrandchildCell
+    cell = population.cell(0)
+    cell.assign_task("Collect data")
+    cell.perform_task()
+    cell.monitor_performance()
@@ -0,0 +1,162 @@
+import threading
+
+
+class IdAllocator:
+    """
+    Monotonic, thread-safe allocator of compact cell IDs.
+
+    IDs are small increasing integers formatted with a prefix (e.g. "CHILD_17"), so two cells
+    never receive the same ID, even when they are created in the same second.
+    """
+
+    def __init__(self, start=1):
+        """
+        :param start: The first number handed out by the allocator.
+        """
+        self.next_number = start
+        self.lock = threading.Lock()
+
+    def allocate(self, prefix):
+        """
+        Allocate a single ID.
+
+        :param prefix: The prefix of the ID (e.g. "CHILD" or "GRANDCHILD").
+        :return: The new ID as a string.
+        """
+        return f"{prefix}_{self.allocate_block(1)}"
+
+    def reserve(self, cell_id):
+        """
+        Mark an existing ID (e.g. restored from a saved state) as used, so it is never allocated again.
+
+        :param cell_id: The ID in the "PREFIX_NUMBER" format; other formats cannot collide and are ignored.
+        """
+        number = cell_id.rpartition("_")[2]
+        if number.isdigit():
+            with self.lock:
+                self.next_number = max(self.next_number, int(number) + 1)
+
+    def allocate_block(self, count):
+        """
+        Reserve a contiguous block of numbers, e.g. for a whole CellPopulation.
+
+        :param count: How many numbers to reserve.
+        :return: The first number of the block.
+        """
+        with self.lock:
+            start = self.next_number
+            self.next_number += count
+        return start
+
+
+# Shared allocator so that IDs stay unique across registries and stand-alone cells
+default_allocator = IdAllocator()
+
+
+class CellRegistry:
+    """
+    Central index of cells with O(1) lookups by ID, by parent and by siblings.
+
+    Cells are kept in a dictionary keyed by ID; each parent ID maps to an insertion-ordered
+    dictionary of its children's IDs, so adding, removing and finding children never scans a list.
+    """
+
+    def __init__(self, allocator=None):
+        """
+        :param allocator: The IdAllocator used for new IDs (the shared default allocator when None).
+        """
+        self.allocator = allocator or default_allocator
+        self.cells = {}  # cell ID -> cell
+        self.parents = {}  # cell ID -> parent ID
+        self.children_index = {}  # parent ID -> {child ID: None}
+        self.lock = threading.RLock()
+
+    def allocate_id(self, prefix):
+        """Allocate a new collision-free cell ID."""
+        return self.allocator.allocate(prefix)
+
+    def register(self, cell, parent_id=None):
+        """
+        Add a cell to the registry.
+
+        :param cell: The cell to register; it must have an `id` attribute.
+        :param parent_id: The ID of the cell's parent, or None for a root cell.
+        """
+        with self.lock:
+            if cell.id in self.cells:
+                raise ValueError(f"Cell {cell.id} is already registered")
+            self.cells[cell.id] = cell
+            self.parents[cell.id] = parent_id
+            if parent_id is not None:
+                self.children_index.setdefault(parent_id, {})[cell.id] = None
+
+    def unregister(self, cell_id):
+        """
+        Remove a cell from the registry. Its own children keep their parent reference.
+
+        :param cell_id: The ID of the cell to remove.
+        :return: The removed cell, or None if it was not registered.
+        """
+        with self.lock:
+            cell = self.cells.pop(cell_id, None)
+            if cell is None:
+                return None
+            parent_id = self.parents.pop(cell_id)
+            siblings = self.children_index.get(parent_id)
+            if siblings is not None:
+                siblings.pop(cell_id, None)
+                if not siblings:
+                    del self.children_index[parent_id]
+            return cell
+
+    def get(self, cell_id):
+        """Return the cell with the given ID, or None."""
+        return self.cells.get(cell_id)
+
+    def get_parent(self, cell_id):
+        """Return the parent cell of a cell, or None if it has no registered parent."""
+        return self.cells.get(self.parents.get(cell_id))
+
+    def children_ids(self, parent_id):
+        """Return the IDs of the children of a cell, in creation order."""
+        return list(self.children_index.get(parent_id, ()))
+
+    def children(self, parent_id):
+        """Return the children of a cell, in creation order."""
+        return [self.cells[child_id] for child_id in self.children_index.get(parent_id, ())]
+
+    def child_count(self, parent_id):
+        """Return the number of children of a cell."""
+        return len(self.children_index.get(parent_id, ()))
+
+    def siblings(self, cell_id):
+        """Return the other cells that share the same parent as the given cell."""
+        parent_id = self.parents.get(cell_id)
+        if parent_id is None:
+            return []
+        return [self.cells[other] for other in self.children_index[parent_id] if other != cell_id]
+
+    def __contains__(self, cell_id):
+        return cell_id in self.cells
+
+    def __len__(self):
+        return len(self.cells)
+
+# Example of registering a small lineage
+if __name__ == "__main__":
+    class _Cell:
+        def __init__(self, cell_id):
+            self.id = cell_id
+
+    registry = CellRegistry()
+    mother = _Cell("MOTHER_CELL_1")
+    registry.register(mother)
+
+    for _ in range(3):
+        child = _Cell(registry.allocate_id("CHILD"))
+        registry.register(child, parent_id=mother.id)
+
+    first_child_id = registry.children_ids(mother.id)[0]
+    print(f"Children of {mother.id}: {registry.children_ids(mother.id)}")
+    print(f"Parent of {first_child_id}: {registry.get_parent(first_child_id).id}")
+    print(f"Siblings of {first_child_id}: {[cell.id for cell in registry.siblings(first_child_id)]}")
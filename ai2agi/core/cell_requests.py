@@ -1,15 +1,47 @@
 import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 class CellRequestHandler:
-    def __init__(self, api_url):
+    def __init__(self, api_url, timeout=(3.05, 10), retries=3, backoff_factor=0.2, pool_size=32,
+                 batch_size=500, max_workers=8):
         """
         Initializes the request handler for interacting with external APIs or services.
         
         :param api_url: The base URL of the API or endpoint that handles cell operations.
+        :param timeout: (connect, read) timeout in seconds for every request.
+        :param retries: How many times a failed request is retried, with exponential backoff.
+            Connection errors are retried for every method, 429/5xx answers only for GET/PUT/DELETE.
+        :param backoff_factor: Base delay of the exponential backoff between retries.
+        :param pool_size: Number of keep-alive connections kept open to the API.
+        :param batch_size: Number of cells sent per request by the bulk methods.
+        :param max_workers: Number of requests the bulk methods keep in flight.
         """
         self.api_url = api_url  # The base URL for the API that interacts with the cells (e.g., "http://example.com/api")
         self.headers = {'Content-Type': 'application/json'}  # The headers for the requests
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.executor = None  # Thread pool of the bulk methods, created on first use
+
+        # One pooled session: connections are reused instead of opening one per request
+        retry = Retry(total=retries, backoff_factor=backoff_factor, status_forcelist=(429, 502, 503, 504),
+                      allowed_methods=frozenset({"GET", "PUT", "DELETE"}), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _request(self, method, path, payload=None):
+        """Send one request through the pooled session and return the decoded JSON response."""
+        data = json.dumps(payload) if payload is not None else None
+        response = self.session.request(method, f"{self.api_url}{path}", data=data, timeout=self.timeout)
+        response.raise_for_status()  # Check for HTTP errors
+        return response.json()
 
     def create_cell(self, cell_data):
         """
@@ -20,7 +52,7 @@ class CellRequestHandler:
         """
         try:
             # POST request to create a new cell
-            response = requests.post(f"{self.api_url}/create_cell", headers=self.headers, data=json.dumps(cell_data))
+            response = self.session.post(f"{self.api_url}/create_cell", data=json.dumps(cell_data), timeout=self.timeout)
             response.raise_for_status()  # Check for HTTP errors
             print(f"Cell created successfully with ID: {response.json()['id']}")
             return response.json()
@@ -38,7 +70,7 @@ class CellRequestHandler:
         """
         try:
             # PUT request to update the cell's information
-            response = requests.put(f"{self.api_url}/cells/{cell_id}/update", headers=self.headers, data=json.dumps(updated_data))
+            response = self.session.put(f"{self.api_url}/cells/{cell_id}/update", data=json.dumps(updated_data), timeout=self.timeout)
             response.raise_for_status()  # Check for HTTP errors
             print(f"Cell with ID {cell_id} updated successfully.")
             return response.json()
@@ -55,7 +87,7 @@ class CellRequestHandler:
         """
         try:
             # DELETE request to remove a cell
-            response = requests.delete(f"{self.api_url}/cells/{cell_id}/delete", headers=self.headers)
+            response = self.session.delete(f"{self.api_url}/cells/{cell_id}/delete", timeout=self.timeout)
             response.raise_for_status()  # Check for HTTP errors
             print(f"Cell with ID {cell_id} deleted successfully.")
             return True
@@ -72,7 +104,7 @@ class CellRequestHandler:
         """
         try:
             # GET request to fetch the status of the specified cell
-            response = requests.get(f"{self.api_url}/cells/{cell_id}", headers=self.headers)
+            response = self.session.get(f"{self.api_url}/cells/{cell_id}", timeout=self.timeout)
             response.raise_for_status()  # Check for HTTP errors
             print(f"Cell {cell_id} status retrieved successfully.")
             return response.json()
@@ -80,11 +112,143 @@ class CellRequestHandler:
             print(f"Error retrieving cell {cell_id} status: {e}")
             return None
 
+    def _map(self, function, items):
+        """Run a function over items with up to max_workers requests in flight."""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return list(self.executor.map(function, items))
+
+    def _bulk(self, path, items, single):
+        """
+        Send items to a bulk endpoint in batches, pipelining the batches over the pool.
+        Falls back to one request per item if the API has no bulk endpoint.
+        """
+        batches = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+
+        def send(batch):
+            try:
+                return self._request("POST" if path == "/create_cells" else "PUT", path, batch)
+            except requests.exceptions.HTTPError as e:
+                if e.response is not None and e.response.status_code in (404, 405):
+                    return [single(item) for item in batch]
+                raise
+
+        results = []
+        for batch, result in zip(batches, self._map(self._safe(send), batches)):
+            results.extend(result if result is not None else [None] * len(batch))
+        return results
+
+    def _safe(self, function):
+        """Wrap a request function so that a failure returns None instead of raising."""
+        def call(item):
+            try:
+                return function(item)
+            except requests.exceptions.RequestException as e:
+                print(f"Error in bulk cell request: {e}")
+                return None
+        return call
+
+    def create_cells(self, cells_data):
+        """
+        Create many cells with as few round trips as possible.
+        
+        :param cells_data: List of dictionaries, one per cell to create.
+        :return: List of created cells in the same order (None for cells that failed).
+        """
+        results = self._bulk("/create_cells", list(cells_data),
+                             self._safe(lambda cell_data: self._request("POST", "/create_cell", cell_data)))
+        print(f"{sum(result is not None for result in results)} of {len(results)} cells created.")
+        return results
+
+    def update_cells(self, updates):
+        """
+        Update many cells with as few round trips as possible.
+        
+        :param updates: Dictionary {cell ID: updated data} or list of dictionaries that contain an "id".
+        :return: List of updated cells in the same order (None for cells that failed).
+        """
+        if isinstance(updates, dict):
+            updates = [dict(data, id=cell_id) for cell_id, data in updates.items()]
+        results = self._bulk("/cells/bulk_update", list(updates),
+                             self._safe(lambda item: self._request("PUT", f"/cells/{item['id']}/update", item)))
+        print(f"{sum(result is not None for result in results)} of {len(results)} cells updated.")
+        return results
+
+    def close(self):
+        """Close the pooled connections and the bulk thread pool."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        self.session.close()
+
+
+class AsyncCellRequestHandler:
+    """
+    asyncio variant of CellRequestHandler with bounded concurrency.
+
+    Requests run on the pooled, retrying session of a CellRequestHandler in a dedicated pool
+    of `max_concurrency` worker threads (not the event loop's default executor, which may be
+    smaller); a semaphore keeps at most `max_concurrency` of them in flight.
+    """
+
+    def __init__(self, api_url, max_concurrency=32, **options):
+        """
+        :param api_url: The base URL of the API that handles cell operations.
+        :param max_concurrency: Maximum number of requests in flight.
+        :param options: Timeouts, retries and batching options passed to CellRequestHandler.
+        """
+        options.setdefault("pool_size", max_concurrency)
+        options.setdefault("max_workers", max_concurrency)
+        self.handler = CellRequestHandler(api_url, **options)
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    async def _call(self, function, *args):
+        async with self.semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    async def create_cell(self, cell_data):
+        return await self._call(self.handler.create_cell, cell_data)
+
+    async def update_cell(self, cell_id, updated_data):
+        return await self._call(self.handler.update_cell, cell_id, updated_data)
+
+    async def delete_cell(self, cell_id):
+        return await self._call(self.handler.delete_cell, cell_id)
+
+    async def get_cell_status(self, cell_id):
+        return await self._call(self.handler.get_cell_status, cell_id)
+
+    async def create_cells(self, cells_data):
+        """Create many cells; each batch is one request, at most max_concurrency in flight."""
+        cells_data = list(cells_data)
+        size = self.handler.batch_size
+        batches = await asyncio.gather(*(self._call(self.handler.create_cells, cells_data[i:i + size])
+                                         for i in range(0, len(cells_data), size)))
+        return [cell for batch in batches for cell in batch]
+
+    async def update_cells(self, updates):
+        """Update many cells; each batch is one request, at most max_concurrency in flight."""
+        if isinstance(updates, dict):
+            updates = [dict(data, id=cell_id) for cell_id, data in updates.items()]
+        updates = list(updates)
+        size = self.handler.batch_size
+        batches = await asyncio.gather(*(self._call(self.handler.update_cells, updates[i:i + size])
+                                         for i in range(0, len(updates), size)))
+        return [cell for batch in batches for cell in batch]
+
+    def close(self):
+        """Shut the worker threads down and close the pooled connections."""
+        self.executor.shutdown()
+        self.handler.close()
+
 
 # Example usage in context of the 'MotherCell' and its child cells:
 
 if __name__ == "__main__":
-    api_url = "http://example.com/api"  # Replace with your actual API URL
+    from core.cell_api_server import start_server
+
+    server, api_url = start_server()  # Local stand-in; replace with your actual API URL
     cell_handler = CellRequestHandler(api_url)
     
     # Example data for creating a new child cell:
@@ -115,3 +279,9 @@ if __name__ == "__main__":
         success = cell_handler.delete_cell(cell_id)
         if success:
             print("Cell deleted successfully.")
+
+        # Create and update many cells with a few pooled bulk requests
+        created_cells = cell_handler.create_cells([new_child_data] * 1000)
+        cell_handler.update_cells({cell["id"]: {"status": "resting"} for cell in created_cells})
+    cell_handler.close()
+    server.shutdown()
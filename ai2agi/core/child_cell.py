@@ -1,17 +1,26 @@
-import time
+from core.cell_registry import default_allocator
 
 class ChildCell:
-    def __init__(self, mother_cell_id):
+    def __init__(self, mother_cell_id, registry=None, cell_id=None):
         """
         Initialize a new ChildCell with reference to the MotherCell it originates from.
         
         :param mother_cell_id: The ID of the MotherCell from which this child cell originates.
+        :param registry: Optional CellRegistry that allocates the ID and indexes the cell.
+        :param cell_id: Existing ID to restore the cell under (a new ID is allocated when None).
         """
-        self.id = f"CHILD_{int(time.time())}"  # Unique ID based on the time
+        allocator = registry.allocator if registry else default_allocator
+        if cell_id is None:
+            cell_id = allocator.allocate("CHILD")  # Unique, collision-free ID
+        else:
+            allocator.reserve(cell_id)  # Never hand the restored ID out again
+        self.id = cell_id
         self.mother_cell_id = mother_cell_id  # The ID of the MotherCell
         self.energy_level = 0.5  # Initial energy level for the child cell
         self.tasks = []  # List of tasks to be executed by the child cell
         self.status = "active"  # Current status of the child cell
+        if registry:
+            registry.register(self, parent_id=mother_cell_id)
     
     def receive_energy(self, energy_amount):
         """
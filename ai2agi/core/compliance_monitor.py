@@ -1,5 +1,8 @@
-import json
 import time
+from types import MappingProxyType
+from core.compliance_records import ComplianceRecords
+
+COMPLIANT_STATUS = "completed"  # Any other task status makes a cell non-compliant
 
 class ComplianceMonitor:
     def __init__(self, mother_cell):
@@ -9,7 +12,12 @@ class ComplianceMonitor:
         :param mother_cell: The MotherCell instance.
         """
         self.mother_cell = mother_cell  # Reference to the MotherCell instance
-        self.compliance_data = {}  # Data structure to track compliance information
+        self.records = ComplianceRecords()  # Columnar store of the tracked task records
+        # Aggregates kept up to date by track_task_compliance, so queries never rescan the records
+        self.status_counts = {}  # Status -> number of task records, across all cells
+        self.cell_stats = {}  # Cell ID -> {"status_counts", "tasks", "last_error", "last_update"}
+        self.non_compliant_cells = {}  # Cell ID -> rows of its task records whose status is not "completed"
+        self.non_compliant_records = 0
     
     def track_task_compliance(self, child_cell_id, task, status, error_message=None):
         """
@@ -21,55 +29,126 @@ class ComplianceMonitor:
         :param error_message: Optional error message if the task fails.
         """
         timestamp = time.time()
-        compliance_status = {
-            "task": task,
-            "status": status,
-            "timestamp": timestamp,
-            "error_message": error_message
-        }
-        
-        if child_cell_id not in self.compliance_data:
-            self.compliance_data[child_cell_id] = []
-        
-        self.compliance_data[child_cell_id].append(compliance_status)
+        row = self.records.append(child_cell_id, task, status, timestamp, error_message)
+        self._update_aggregates(child_cell_id, row, status, timestamp, error_message)
         
         # Print compliance status for the child cell
         print(f"Compliance for Child Cell {child_cell_id}: Task '{task}' - {status}")
         if error_message:
             print(f"Error: {error_message}")
     
+    @property
+    def compliance_data(self):
+        """
+        Read-only snapshot of the task records grouped by cell: cell ID -> tuple of record dictionaries.
+
+        It is rebuilt from the columnar store on each access (O(records)); use get_cell_records for
+        one cell, and track_task_compliance to add records. Writing to the snapshot raises an error.
+        """
+        data = {}
+        for record in self.records.records():
+            data.setdefault(record.pop("cell_id"), []).append(record)
+        return MappingProxyType({cell_id: tuple(records) for cell_id, records in data.items()})
+
+    def get_cell_records(self, child_cell_id):
+        """Return the task records of one cell, oldest first, without decoding the other cells' records."""
+        records = [self.records.record(row) for row in self.records.rows_of("cell_id", child_cell_id)]
+        for record in records:
+            del record["cell_id"]
+        return records
+
+    def _update_aggregates(self, child_cell_id, row, status, timestamp, error_message):
+        """Fold one new task record into the global and per-cell counters and the non-compliance index."""
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+        stats = self.cell_stats.get(child_cell_id)
+        if stats is None:
+            stats = self.cell_stats[child_cell_id] = {"status_counts": {}, "tasks": 0, "last_error": None,
+                                                      "last_update": None}
+        stats["status_counts"][status] = stats["status_counts"].get(status, 0) + 1
+        stats["tasks"] += 1
+        stats["last_update"] = timestamp
+        if error_message:
+            stats["last_error"] = error_message
+
+        if status != COMPLIANT_STATUS:
+            self.non_compliant_cells.setdefault(child_cell_id, []).append(row)
+            self.non_compliant_records += 1
+
+    def is_compliant(self):
+        """Return True if every tracked task was completed (O(1))."""
+        return self.non_compliant_records == 0
+
+    def get_non_compliant_cells(self):
+        """Return the IDs of the cells with at least one task that was not completed."""
+        return list(self.non_compliant_cells)
+
+    def get_cell_compliance(self, child_cell_id):
+        """
+        Return the compliance counters of one cell.
+
+        :return: Dictionary with the task count per status, total tasks, last error and last update,
+            or None for a cell without tracked tasks.
+        """
+        stats = self.cell_stats.get(child_cell_id)
+        if stats is None:
+            return None
+        return dict(stats, status_counts=dict(stats["status_counts"]),
+                    compliant=child_cell_id not in self.non_compliant_cells)
+
+    def get_compliance_summary(self):
+        """Return the global compliance counters."""
+        return {
+            "cells": len(self.cell_stats),
+            "tasks": sum(self.status_counts.values()),
+            "status_counts": dict(self.status_counts),
+            "non_compliant_cells": len(self.non_compliant_cells),
+            "non_compliant_tasks": self.non_compliant_records,
+            "compliant": self.is_compliant()
+        }
+
     def check_compliance(self):
         """
         Check the overall compliance of the system.
         This function can be extended to check different compliance conditions.
+
+        Only the indexed non-compliant task records are visited, not every record.
+
+        :return: True if all child cells are compliant.
         """
         print("Checking compliance across all child cells...")
 
-        for child_cell_id, tasks in self.compliance_data.items():
-            for task_info in tasks:
-                if task_info["status"] != "completed":
-                    print(f"Compliance Warning: Child Cell {child_cell_id} failed to complete task: {task_info['task']}")
-                    if task_info["error_message"]:
-                        print(f"Error Message: {task_info['error_message']}")
+        for child_cell_id, rows in self.non_compliant_cells.items():
+            for row in rows:
+                task_info = self.records.record(row)
+                print(f"Compliance Warning: Child Cell {child_cell_id} failed to complete task: {task_info['task']}")
+                if task_info["error_message"]:
+                    print(f"Error Message: {task_info['error_message']}")
         
         # Example: Return if all tasks were completed successfully
-        all_compliant = all(task["status"] == "completed" for tasks in self.compliance_data.values() for task in tasks)
+        all_compliant = self.is_compliant()
         
         if all_compliant:
             print("All child cells are compliant with the required tasks.")
         else:
             print("Some child cells are not compliant with required tasks.")
+        return all_compliant
     
-    def save_compliance_report(self, file_path):
+    def save_compliance_report(self, file_path, chunk_size=10000):
         """
-        Save the compliance report to a JSON file.
+        Save the compliance report to a JSON-lines file, one task record per line.
+
+        The first save to a file writes every record; later saves to the same file only append
+        the records tracked since, in chunks.
         
         :param file_path: The file path where the report will be saved.
+        :param chunk_size: Number of records written at a time.
+        :return: Number of records written.
         """
-        with open(file_path, "w") as f:
-            json.dump(self.compliance_data, f, indent=4)
+        written = self.records.export_jsonl(file_path, chunk_size)
         
-        print(f"Compliance report saved to {file_path}")
+        print(f"Compliance report saved to {file_path} ({written} new records)")
+        return written
 
 # Example usage to demonstrate the ComplianceMonitor functionality
 if __name__ == "__main__":
@@ -87,6 +166,7 @@ if __name__ == "__main__":
     
     # Check overall compliance status
     monitor.check_compliance()
+    print(monitor.get_non_compliant_cells(), monitor.get_compliance_summary())
     
     # Save the compliance report
-    monitor.save_compliance_report("C:\\pr\\Free_Knowledge_Perfection\\reports\\compliance_report.json")
+    monitor.save_compliance_report("C:\\pr\\Free_Knowledge_Perfection\\reports\\compliance_report.jsonl")
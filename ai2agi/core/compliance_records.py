@@ -0,0 +1,134 @@
+import json
+import numpy as np
+
+_JSON_KEY = object()  # Marks the interning keys built from the JSON of unhashable values
+_NAN_KEY = object()  # Shared by every NaN of a type, since NaN never equals itself
+
+
+def _intern_key(value):
+    """
+    Return the key a value is interned under: (type, value), or (type, canonical JSON) if it is unhashable.
+
+    The type keeps equal values of different types, such as 1, 1.0 and True, under separate codes.
+    """
+    try:
+        hash(value)
+    except TypeError:
+        return (_JSON_KEY, json.dumps(value, sort_keys=True, default=str))
+    if value != value:
+        return (type(value), _NAN_KEY)
+    return (type(value), value)
+
+
+class ComplianceRecords:
+    """
+    Columnar, append-only store of task compliance records.
+
+    Cell IDs, tasks, statuses and error messages are interned into integer codes (unhashable
+    values, such as dictionaries, by their canonical JSON) and kept, with the float
+    timestamps, in NumPy arrays that grow by doubling. A record costs a few bytes per column
+    instead of a dictionary, and reports are exported incrementally: each export to a file
+    only writes the records added since the previous export to it.
+    """
+
+    COLUMNS = ("cell_id", "task", "status", "error_message")
+
+    def __init__(self, capacity=1024):
+        """
+        :param capacity: Initial number of records the arrays can hold.
+        """
+        self.length = 0
+        self.codes = {column: np.zeros(capacity, dtype=np.int32) for column in self.COLUMNS}
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.values = {column: [] for column in self.COLUMNS}  # Code -> string, per column
+        self._value_codes = {column: {} for column in self.COLUMNS}
+        self.exported_rows = {}  # File path -> number of records already written to it
+
+    def __len__(self):
+        return self.length
+
+    def code(self, column, value):
+        """Return the integer code of a value of a column, interning it if it is new."""
+        codes = self._value_codes[column]
+        key = _intern_key(value)
+        code = codes.get(key)
+        if code is None:
+            code = codes[key] = len(self.values[column])
+            self.values[column].append(value)
+        return code
+
+    def _grow(self):
+        capacity = max(1, 2 * len(self.timestamps))
+        for column, array in self.codes.items():
+            self.codes[column] = np.resize(array, capacity)
+        self.timestamps = np.resize(self.timestamps, capacity)
+
+    def append(self, cell_id, task, status, timestamp, error_message=None):
+        """
+        Add one record.
+
+        :return: The row index of the record.
+        """
+        if self.length == len(self.timestamps):
+            self._grow()
+        row = self.length
+        for column, value in zip(self.COLUMNS, (cell_id, task, status, error_message)):
+            self.codes[column][row] = self.code(column, value)
+        self.timestamps[row] = timestamp
+        self.length += 1
+        return row
+
+    def record(self, row):
+        """Return one record as a dictionary."""
+        record = {column: self.values[column][self.codes[column][row]] for column in self.COLUMNS}
+        record["timestamp"] = float(self.timestamps[row])
+        return record
+
+    def records(self, start=0, stop=None):
+        """Yield the records of rows start to stop as dictionaries, decoded column by column."""
+        stop = self.length if stop is None else min(stop, self.length)
+        if start >= stop:
+            return
+        decoded = {column: [self.values[column][code] for code in self.codes[column][start:stop].tolist()]
+                   for column in self.COLUMNS}
+        timestamps = self.timestamps[start:stop].tolist()
+        for i in range(stop - start):
+            record = {column: decoded[column][i] for column in self.COLUMNS}
+            record["timestamp"] = timestamps[i]
+            yield record
+
+    def rows_of(self, column, value):
+        """Return the row indices whose column has the given value (vectorized)."""
+        code = self._value_codes[column].get(_intern_key(value))
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(self.codes[column][:self.length] == code)
+
+    def export_jsonl(self, file_path, chunk_size=10000):
+        """
+        Write the records added since the last export to a file as JSON lines.
+
+        The first export of this store to a file rewrites it; later exports append, so an
+        export costs time proportional to the new records only.
+
+        :param chunk_size: Number of records encoded and written per write call.
+        :return: Number of records written.
+        """
+        start = self.exported_rows.get(file_path)
+        mode = "a" if start is not None else "w"
+        start = start or 0
+        stop = self.length
+        with open(file_path, mode) as f:
+            for chunk_start in range(start, stop, chunk_size):
+                chunk_stop = min(chunk_start + chunk_size, stop)
+                f.write("".join(json.dumps(record) + "\n" for record in self.records(chunk_start, chunk_stop)))
+        self.exported_rows[file_path] = stop
+        return stop - start
+
+# Example of storing and exporting many records
+if __name__ == "__main__":
+    store = ComplianceRecords()
+    for i in range(100000):
+        store.append(f"CHILD_{i % 100}", "Analyze environment", "completed" if i % 10 else "pending", 1.0 * i)
+    print(store.export_jsonl("compliance_report.jsonl"), store.export_jsonl("compliance_report.jsonl"))
+    print(len(store.rows_of("status", "pending")), store.record(10))
@@ -1,19 +1,24 @@
 import time
 import random
+from core.knowledge_store import KnowledgeStore
 
 class AGI:
-    def __init__(self):
+    def __init__(self, knowledge_file=None):
+        """
+        :param knowledge_file: SQLite file persisting the knowledge base across runs. None (the
+            default) keeps it in memory, so separate agents never share or inherit knowledge.
+        """
         # Initialize AGI attributes
         self.self_awareness = False
         self.temporal_awareness = False
-        self.knowledge_base = {}  # Knowledge base for general learning
+        self.knowledge_base = KnowledgeStore(knowledge_file or ":memory:")  # Versioned, searchable knowledge for general learning
         self.social_awareness = False
         self.emotional_awareness = False
         self.environmental_awareness = False
 
     def learn(self, new_information):
-        """Simulate learning process by storing new information in knowledge base."""
-        self.knowledge_base.update(new_information)
+        """Simulate learning process by storing new information in knowledge base (older values are kept as versions)."""
+        self.knowledge_base.learn(new_information)
         print(f"Learned new information: {new_information}")
 
     def achieve_self_awareness(self):
@@ -41,9 +46,18 @@ class AGI:
         self.environmental_awareness = True
         print("🌍 Environmental awareness achieved.")
 
-    def make_decision(self):
-        """Make a decision based on the learned knowledge and current awareness."""
-        if self.self_awareness and self.temporal_awareness:
+    def make_decision(self, topic=None):
+        """
+        Make a decision based on the learned knowledge and current awareness.
+
+        :param topic: Optional terms to look up in the knowledge base; the most recently
+            learned matching fact, if any, drives the decision.
+        """
+        facts = self.knowledge_base.search(topic, limit=1) if topic else []
+        if facts:
+            key, value = facts[0]
+            decision = f"Apply knowledge about {topic}: {key} = {value}"
+        elif self.self_awareness and self.temporal_awareness:
             decision = "Plan for future based on current situation"
         elif self.social_awareness and self.emotional_awareness:
             decision = "Interact empathetically with others"
@@ -83,9 +97,12 @@ if __name__ == "__main__":
     
     # Make a decision based on the awareness and knowledge
     agi.make_decision()
+    agi.make_decision("problems")
 
-    # Interact with the environment
+    # Interact with the environment, keeping the history of the actions
+    agi.interact_with_environment()
     agi.interact_with_environment()
+    print(agi.knowledge_base.history("action"))
 
     # Print the current awareness status
     print(agi.get_awareness_status())
@@ -1,42 +1,37 @@
+import numpy as np
+from core.rule_engine import DecisionTable
+
 class DecisionMaking:
-    def __init__(self):
-        pass
+    def __init__(self, verbose=True, decision_table=None):
+        """
+        :param verbose: Print every processed payload.
+        :param decision_table: Compiled DecisionTable (the "environment_actions" table of
+            settings/decision_rules.json when None).
+        """
+        self.verbose = verbose
+        self.decision_table = decision_table or DecisionTable.from_file("environment_actions")
 
     def process_data(self, data):
         """Process environmental data and prepare it for decision-making."""
-        print(f"Processing data: {data}")
+        if self.verbose:
+            print(f"Processing data: {data}")
         return data
 
     def decide(self, analysis):
-        """Make a decision based on the processed data."""
-        actions = []
-        
-        # Decision based on temperature
-        if "temperature" in analysis:
-            if analysis["temperature"] > 30:
-                actions.append("Activate cooling system.")
-            elif analysis["temperature"] < 15:
-                actions.append("Activate heating system.")
-        
-        # Decision based on light levels
-        if "light" in analysis:
-            if analysis["light"] == "high":
-                actions.append("Optimize energy usage.")
-            elif analysis["light"] == "low":
-                actions.append("Increase lighting.")
-        
-        # Decision based on humidity
-        if "humidity" in analysis:
-            if analysis["humidity"] > 80:
-                actions.append("Activate dehumidifier.")
-            elif analysis["humidity"] < 20:
-                actions.append("Activate humidifier.")
-        
-        # If no actions are decided, return a default message
-        if not actions:
-            actions.append("No action needed.")
-        
-        return actions
+        """Make a decision based on the processed data, using the compiled decision table."""
+        return self.decision_table.evaluate(analysis)
+
+    def decide_batch(self, columns):
+        """
+        Make decisions for many readings at once.
+
+        :param columns: Columnar readings: a dict of arrays/lists or a NumPy structured array,
+            with optional "temperature", "light" and "humidity" columns.
+        :return: One list of actions per row, identical to what decide() returns for that row.
+        """
+        if isinstance(columns, np.ndarray) and columns.dtype.names:
+            columns = {name: columns[name] for name in columns.dtype.names}
+        return self.decision_table.evaluate_batch(columns)
 
 # Example of using decision making with expanded factors
 if __name__ == "__main__":
@@ -51,3 +46,8 @@ if __name__ == "__main__":
     # Output the actions that should be taken
     for action in actions:
         print(f"Action taken: {action}")
+
+    # Example of deciding for many readings at once
+    readings = {"temperature": [35, 10, 22], "light": ["medium", "low", "high"], "humidity": [85, 50, 10]}
+    for row_actions in decision_maker.decide_batch(readings):
+        print(f"Batch actions: {row_actions}")
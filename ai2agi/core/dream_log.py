@@ -0,0 +1,297 @@
+import os
+import gzip
+import json
+import time
+import bisect
+import threading
+
+INDEX_INTERVAL = 64  # Records between two offsets of the active segment's sparse index
+LEGACY_SEPARATOR = "-----------"  # Ends each dream of the text log written by older versions
+
+
+class DreamLog:
+    """
+    Append-only dream log split into rotating, compressed segments.
+
+    Dreams are appended as JSON lines to the active segment (the log file itself). When it
+    grows past `max_segment_bytes` or its first dream is older than `max_segment_age`, it is
+    gzip-compressed into an archived segment. A small index file keeps the first/last
+    timestamp and size of every archived segment, and the active segment has an in-memory
+    sparse timestamp -> byte offset index, so reading recent dreams only touches the segments
+    (and the part of the active segment) that can contain them.
+
+    A log file in the text format of older versions is converted to JSON lines when opened.
+    """
+
+    def __init__(self, file_path="dream_log.txt", max_segment_bytes=1024 * 1024, max_segment_age=86400.0,
+                 max_segments=None):
+        """
+        :param file_path: The active segment; archived segments and the index are stored next to it.
+        :param max_segment_bytes: Size that triggers the rotation of the active segment.
+        :param max_segment_age: Age in seconds of the first dream that triggers a rotation (None to disable).
+        :param max_segments: Number of archived segments kept (None keeps all of them).
+        """
+        self.file_path = file_path
+        self.index_path = file_path + ".index"
+        self.rotating_path = file_path + ".rotating"
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+        self.max_segments = max_segments
+        self.lock = threading.Lock()
+        self.segments = []  # Archived segments, oldest first: {"file", "first", "last", "count"} (min/max timestamps)
+        self.next_segment = 1
+        self.active_offsets = []  # (timestamp, byte offset) every INDEX_INTERVAL dreams of the active segment
+        self.active_first = None
+        self.active_last = None
+        self.active_count = 0
+        self.active_size = 0
+        self._load_index()
+        if os.path.exists(self.rotating_path):
+            self._archive(self.rotating_path)  # Finish a rotation interrupted by a crash
+        self._migrate_legacy()
+        self._scan_active()
+
+    def _load_index(self):
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+            self.segments = index["segments"]
+            self.next_segment = index["next_segment"]
+
+    def _save_index(self):
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"segments": self.segments, "next_segment": self.next_segment}, f)
+        os.replace(temp_path, self.index_path)
+
+    @staticmethod
+    def _parse(line):
+        try:
+            dream = json.loads(line)
+        except ValueError:
+            return None  # Text written by older versions of the log
+        return dream if isinstance(dream, dict) and "timestamp" in dream else None
+
+    def _migrate_legacy(self):
+        """
+        Convert the "Dream:" / "Duration:" text blocks written by older versions to JSON lines.
+
+        Those dreams have no timestamp; they get the time of the first JSON dream after them,
+        or the modification time of the file, and are flagged with "legacy": True. The file
+        is rewritten through a temporary file, so an interrupted migration is simply redone.
+        """
+        if not os.path.exists(self.file_path):
+            return
+        timestamp, legacy = os.path.getmtime(self.file_path), False
+        with open(self.file_path, "rb") as f:
+            for line in f:
+                dream = self._parse(line)
+                if dream is not None:
+                    timestamp = min(timestamp, dream["timestamp"])
+                    break
+                legacy = legacy or line.startswith(b"Dream: ")
+        if not legacy:
+            return
+        temp_path = self.file_path + ".tmp"
+        with open(self.file_path, "rb") as source, open(temp_path, "wb") as target:
+            dream = None
+            for line in source:
+                if self._parse(line) is not None:
+                    target.write(line if line.endswith(b"\n") else line + b"\n")
+                    continue
+                text = line.decode("utf-8", "replace").rstrip("\r\n")
+                if text.startswith("Dream: "):
+                    dream = {"timestamp": timestamp, "content": text[len("Dream: "):], "duration": None, "legacy": True}
+                elif dream is not None and text.startswith("Duration: "):
+                    duration = text[len("Duration: "):].split(" ")[0]
+                    dream["duration"] = int(duration) if duration.isdigit() else duration
+                elif dream is not None and text == LEGACY_SEPARATOR:
+                    target.write((json.dumps(dream) + "\n").encode("utf-8"))
+                    dream = None
+            if dream is not None:
+                target.write((json.dumps(dream) + "\n").encode("utf-8"))
+            target.flush()
+            os.fsync(target.fileno())
+        os.replace(temp_path, self.file_path)
+
+    def _scan_active(self):
+        """Rebuild the sparse index of the active segment (bounded by the segment size)."""
+        self.active_offsets, self.active_first, self.active_last, self.active_count = [], None, None, 0
+        self.active_size = os.path.getsize(self.file_path) if os.path.exists(self.file_path) else 0
+        if not self.active_size:
+            return
+        with open(self.file_path, "rb") as f:
+            offset = 0
+            for line in f:
+                dream = self._parse(line)
+                if dream is not None:
+                    self._index_active(dream["timestamp"], offset)
+                offset += len(line)
+
+    def _index_active(self, timestamp, offset):
+        # Offsets are indexed by the running maximum timestamp, so bisecting them stays correct
+        # even if a writer's clock goes backwards
+        self.active_last = timestamp if self.active_last is None else max(self.active_last, timestamp)
+        self.active_first = timestamp if self.active_first is None else min(self.active_first, timestamp)
+        if self.active_count % INDEX_INTERVAL == 0:
+            self.active_offsets.append((self.active_last, offset))
+        self.active_count += 1
+
+    def append(self, dream):
+        """
+        Append a dream (a dictionary with a "timestamp") to the log, rotating the active segment if needed.
+        """
+        line = (json.dumps(dream) + "\n").encode("utf-8")
+        with self.lock:
+            if self._rotation_due(dream["timestamp"]):
+                self._rotate()
+            with open(self.file_path, "ab") as f:
+                f.write(line)
+            self._index_active(dream["timestamp"], self.active_size)
+            self.active_size += len(line)
+
+    def _rotation_due(self, timestamp):
+        if not self.active_count:
+            return False
+        if self.active_size >= self.max_segment_bytes:
+            return True
+        return self.max_segment_age is not None and timestamp - self.active_first >= self.max_segment_age
+
+    def _rotate(self):
+        os.replace(self.file_path, self.rotating_path)
+        self._archive(self.rotating_path)
+        self.active_offsets, self.active_first, self.active_last = [], None, None
+        self.active_count = self.active_size = 0
+
+    def _archive(self, source_path):
+        """Compress a full segment into the next archived segment and record it in the index."""
+        first = last = None
+        count = 0
+        segment_file = f"{os.path.basename(self.file_path)}.{self.next_segment:06d}.gz"
+        segment_path = os.path.join(os.path.dirname(self.file_path), segment_file)
+        with open(source_path, "rb") as source, gzip.open(segment_path + ".tmp", "wb") as target:
+            for line in source:
+                dream = self._parse(line)
+                if dream is not None:
+                    first = dream["timestamp"] if first is None else min(first, dream["timestamp"])
+                    last = dream["timestamp"] if last is None else max(last, dream["timestamp"])
+                    count += 1
+                target.write(line)
+        os.replace(segment_path + ".tmp", segment_path)
+        self.segments.append({"file": segment_file, "first": first, "last": last, "count": count})
+        self.next_segment += 1
+        while self.max_segments is not None and len(self.segments) > self.max_segments:
+            expired = self.segments.pop(0)
+            expired_path = os.path.join(os.path.dirname(self.file_path), expired["file"])
+            if os.path.exists(expired_path):
+                os.remove(expired_path)
+        self._save_index()
+        os.remove(source_path)
+
+    def _read_segment(self, segment):
+        path = os.path.join(os.path.dirname(self.file_path), segment["file"])
+        try:
+            f = gzip.open(path, "rb")
+        except FileNotFoundError:
+            return  # Expired by max_segments since the snapshot
+        with f:
+            for line in f:
+                dream = self._parse(line)
+                if dream is not None:
+                    yield dream
+
+    def _snapshot(self, since=None):
+        """
+        Return the archived segments and the bytes of the active segment (from the last indexed
+        position before `since`), both taken under the lock.
+
+        Archived segments never change, so only the active segment has to be read while the lock
+        is held: a rotation after the snapshot moves records into a segment the reader does not
+        know about, but the reader already holds them.
+        """
+        with self.lock:
+            segments = list(self.segments)
+            start = 0
+            if since is not None and self.active_offsets:
+                # Last indexed position whose running maximum timestamp is before `since`
+                position = bisect.bisect_left([timestamp for timestamp, _ in self.active_offsets], since) - 1
+                start = self.active_offsets[position][1] if position >= 0 else 0
+            active = b""
+            if self.active_size > start:
+                with open(self.file_path, "rb") as f:
+                    f.seek(start)
+                    active = f.read(self.active_size - start)
+        return segments, active
+
+    def _read_active(self, active):
+        for line in active.splitlines():
+            dream = self._parse(line)
+            if dream is not None:
+                yield dream
+
+    def iter_dreams(self, since=None, limit=None):
+        """
+        Stream the dreams in chronological order.
+
+        The archived segments and the active segment are snapshotted together, so a rotation
+        during the iteration neither hides nor repeats dreams (an archived segment expired by
+        `max_segments` meanwhile is skipped).
+
+        :param since: Only dreams with a timestamp at or after this one; segments whose dreams
+            are all earlier are not read at all.
+        :param limit: Maximum number of dreams returned.
+        """
+        if limit is not None and limit <= 0:
+            return
+        segments, active = self._snapshot(since)
+        returned = 0
+        sources = [self._read_segment(segment) for segment in segments
+                   if since is None or segment["last"] is None or segment["last"] >= since]
+        sources.append(self._read_active(active))
+        for source in sources:
+            for dream in source:
+                if since is not None and dream["timestamp"] < since:
+                    continue
+                yield dream
+                returned += 1
+                if limit is not None and returned >= limit:
+                    return
+
+    def tail(self, count=10):
+        """Return the `count` most recent dreams, oldest first, reading only the newest segments."""
+        if count <= 0:
+            return []
+        segments, active = self._snapshot()
+        dreams = list(self._read_active(active))[-count:]
+        for segment in reversed(segments):
+            if len(dreams) >= count:
+                break
+            dreams = list(self._read_segment(segment))[-(count - len(dreams)):] + dreams
+        return dreams[-count:]
+
+    def __len__(self):
+        with self.lock:
+            return sum(segment["count"] for segment in self.segments) + self.active_count
+
+
+_logs = {}
+_logs_lock = threading.Lock()
+
+
+def open_dream_log(file_path="dream_log.txt", **options):
+    """Return the DreamLog shared by all dream states that write to the given file."""
+    with _logs_lock:
+        key = os.path.abspath(file_path)
+        if key not in _logs:
+            _logs[key] = DreamLog(file_path, **options)
+        return _logs[key]
+
+# Example of a log rotating every thousand dreams
+if __name__ == "__main__":
+    log = DreamLog("dream_log_example.txt", max_segment_bytes=64 * 1024)
+    start = time.time()
+    for i in range(5000):
+        log.append({"timestamp": start + i, "content": f"Dream number {i}", "duration": 10})
+    print(len(log), len(log.segments), "archived segments")
+    print(list(log.iter_dreams(since=start + 4990, limit=3)))
+    print(log.tail(2))
@@ -0,0 +1,125 @@
+import time
+import heapq
+import asyncio
+import itertools
+import threading
+from concurrent.futures import Future
+
+
+class DreamScheduler:
+    """
+    Runs delayed callbacks, such as the end of a dream, without blocking the caller.
+
+    In real-time mode the callbacks run on one asyncio event loop in a background thread, so
+    thousands of cells can dream at the same time without a sleeping thread each. In virtual
+    mode nothing runs in the background: time only moves when advance() or run() is called,
+    which fires the due callbacks in time order at full CPU speed.
+
+    schedule() returns a concurrent.futures.Future resolved with the callback's result; use
+    future.add_done_callback() for completion callbacks, or asyncio.wrap_future() to await it.
+    """
+
+    def __init__(self, virtual=False, start_time=0.0):
+        """
+        :param virtual: Use a simulated clock instead of the wall clock.
+        :param start_time: Initial value of the simulated clock.
+        """
+        self.virtual = virtual
+        self.now = start_time  # Simulated clock (virtual mode)
+        self.queue = []  # Virtual mode: heap of (due time, sequence, future, callback, args)
+        self.sequence = itertools.count()  # Keeps callbacks due at the same time in scheduling order
+        self.loop = None
+        self.thread = None
+        self.lock = threading.Lock()
+        self.scheduled = 0  # Callbacks scheduled and not run yet
+
+    def time(self):
+        """Return the scheduler's current time."""
+        return self.now if self.virtual else time.time()
+
+    def _start_loop(self):
+        with self.lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+                self.thread.start()
+
+    def schedule(self, delay, callback, *args):
+        """
+        Call `callback(*args)` after `delay` seconds.
+
+        :return: A Future resolved with the callback's result (or its exception).
+        """
+        future = Future()
+        with self.lock:
+            self.scheduled += 1
+            if self.virtual:
+                heapq.heappush(self.queue, (self.now + delay, next(self.sequence), future, callback, args))
+                return future
+        self._start_loop()
+        self.loop.call_soon_threadsafe(self.loop.call_later, delay, self._run, future, callback, args)
+        return future
+
+    def _run(self, future, callback, args):
+        with self.lock:
+            self.scheduled -= 1
+        if not future.set_running_or_notify_cancel():
+            return  # Cancelled before it was due
+        try:
+            future.set_result(callback(*args))
+        except Exception as e:
+            future.set_exception(e)
+
+    def run(self, until=None):
+        """
+        Virtual mode: run the due callbacks in time order, moving the clock to each due time.
+
+        :param until: Stop at this time (the clock ends there); None runs until nothing is left.
+        :return: Number of callbacks run.
+        """
+        ran = 0
+        while True:
+            with self.lock:
+                if not self.queue or (until is not None and self.queue[0][0] > until):
+                    break
+                due, _, future, callback, args = heapq.heappop(self.queue)
+                self.now = max(self.now, due)
+            self._run(future, callback, args)  # May schedule more callbacks
+            ran += 1
+        if until is not None:
+            self.now = max(self.now, until)
+        return ran
+
+    def advance(self, seconds):
+        """Virtual mode: move the clock forward by `seconds`, running every callback due meanwhile."""
+        return self.run(until=self.now + seconds)
+
+    def close(self):
+        """Stop the background event loop of the real-time mode."""
+        with self.lock:
+            loop, thread = self.loop, self.thread
+            self.loop = self.thread = None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+
+_default_scheduler = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_default_scheduler():
+    """Return the real-time scheduler shared by the cells that do not get their own."""
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = DreamScheduler()
+        return _default_scheduler
+
+# Example of simulating a day of callbacks in virtual time
+if __name__ == "__main__":
+    scheduler = DreamScheduler(virtual=True)
+    futures = [scheduler.schedule(i * 60, lambda minute=i: minute) for i in range(1440)]
+    started = time.time()
+    print(scheduler.run(), scheduler.time(), futures[-1].result(), f"{time.time() - started:.3f}s")
@@ -1,40 +1,68 @@
 import time
 import random
-import os
+from core.dream_scheduler import get_default_scheduler
+from core.dream_log import open_dream_log
 
 class DreamState:
-    def __init__(self, dream_log_file="dream_log.txt"):
+    def __init__(self, dream_log_file="dream_log.txt", scheduler=None):
         """
         Initialize the DreamState class, which simulates a state of dreaming or altered consciousness.
+
+        :param dream_log_file: File to store dreams (rotated into compressed segments next to it).
+        :param scheduler: DreamScheduler ending the dreams (the shared real-time one when None);
+            pass DreamScheduler(virtual=True) to simulate dreams without waiting.
         """
         self.dream_state = False  # Track if the AI is in a dream state
         self.dream_content = ""  # Placeholder for dream content
         self.dream_duration = 0  # Duration of the dream in seconds
         self.dream_log_file = dream_log_file  # File to store dreams
-        
-        # Ensure the dream log file exists, create it if not
-        if not os.path.exists(self.dream_log_file):
-            with open(self.dream_log_file, 'w') as file:
-                file.write("Dream Log\n")
-                file.write("-----------\n")
+        self.scheduler = scheduler or get_default_scheduler()
+        self.dream_future = None  # Future of the current dream, resolved when it ends
+        self.dream_log = open_dream_log(self.dream_log_file)  # Shared by the dream states using the same file
     
-    def enter_dream_state(self):
+    def enter_dream_state(self, on_complete=None):
         """
         Simulate the AI entering a dream state, where the AI experiences altered consciousness or visions.
+
+        The dream runs in the background on the scheduler; this call returns immediately.
+
+        :param on_complete: Optional function called with the dream (content and duration) when it ends.
+        :return: A Future resolved with the dream when it ends (the current one if already dreaming).
+            Cancelling it ends the dream without logging it.
         """
+        if self.dream_state:
+            return self.dream_future
         self.dream_state = True
         self.dream_content = self.generate_dream_content()  # Generate random dream content
         self.dream_duration = random.randint(5, 15)  # Duration of the dream (random between 5 and 15 seconds)
         print("Entering dream state...")
         print(f"Dream content generated: {self.dream_content}")
         
-        # Simulate the dream duration
-        time.sleep(self.dream_duration)
+        # Schedule the end of the dream instead of sleeping through it
+        self.dream_future = self.scheduler.schedule(self.dream_duration, self._end_dream)
+        self.dream_future.add_done_callback(self._dream_done)
+        if on_complete is not None:
+            self.dream_future.add_done_callback(
+                lambda future: on_complete(future.result())
+                if not future.cancelled() and future.exception() is None else None)
+        return self.dream_future
+
+    def _dream_done(self, future):
+        """Leave the dream state if the dream was cancelled or _end_dream failed before doing so."""
+        if future is not self.dream_future or not self.dream_state:
+            return
+        if future.cancelled() or future.exception() is not None:
+            self.exit_dream_state()
+
+    def _end_dream(self):
+        """Called by the scheduler when the dream duration has elapsed."""
         print("Dream state ended.")
+        dream = {"content": self.dream_content, "duration": self.dream_duration}
         
         # Save dream after it ends
         self.save_dream_to_log()
         self.exit_dream_state()
+        return dream
 
     def exit_dream_state(self):
         """
@@ -59,11 +87,18 @@ class DreamState:
     def save_dream_to_log(self):
         """
         Save the dream content to the log file.
+
+        The log is shared by every dream state writing to the same file, so its timestamps
+        always come from the wall clock; a virtual scheduler's time is kept as "virtual_time".
         """
-        with open(self.dream_log_file, "a") as file:
-            file.write(f"Dream: {self.dream_content}\n")
-            file.write(f"Duration: {self.dream_duration} seconds\n")
-            file.write("-----------\n")
+        dream = {
+            "timestamp": time.time(),
+            "content": self.dream_content,
+            "duration": self.dream_duration
+        }
+        if self.scheduler.virtual:
+            dream["virtual_time"] = self.scheduler.time()
+        self.dream_log.append(dream)
         
         print(f"Dream saved to log: {self.dream_log_file}")
     
@@ -76,21 +111,36 @@ class DreamState:
         else:
             return "Not in a dream state."
 
-    def get_dream_log(self):
+    def get_dream_log(self, limit=None):
         """
-        Retrieve the entire dream log content.
+        Retrieve the dream log content.
+
+        :param limit: Only the `limit` most recent dreams (the entire log when None).
         """
-        with open(self.dream_log_file, "r") as file:
-            log_contents = file.read()
+        dreams = self.dream_log.iter_dreams() if limit is None else self.dream_log.tail(limit)
+        log_contents = "Dream Log\n-----------\n"
+        for dream in dreams:
+            log_contents += f"Dream: {dream['content']}\n"
+            log_contents += f"Duration: {dream['duration']} seconds\n"
+            log_contents += "-----------\n"
         return log_contents
 
+    def iter_dreams(self, since=None, limit=None):
+        """
+        Stream the logged dreams (dictionaries with timestamp, content and duration) in chronological order.
+
+        :param since: Only dreams logged at or after this time.
+        :param limit: Maximum number of dreams returned.
+        """
+        return self.dream_log.iter_dreams(since=since, limit=limit)
+
 # Example usage
 if __name__ == "__main__":
     dream_machine = DreamState()
     
-    # Simulate AI entering a dream state
-    dream_machine.enter_dream_state()
+    # Simulate AI entering a dream state, then wait for the dream to end
+    dream_machine.enter_dream_state().result()
     
     # Retrieve and print the dream log content
     print("\nDream Log:\n")
-    print(dream_machine.get_dream_log())
+    print(dream_machine.get_dream_log(limit=10))
@@ -0,0 +1,138 @@
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import numpy as np
+
+TAG_PATTERN = re.compile(r"<script.*?</script>|<style.*?</style>|<[^>]+>", re.S | re.I)
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def _hash64(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+
+
+def simhash(html, shingle_size=3, min_words=50):
+    """
+    Return the 64-bit SimHash fingerprint of a page's visible text.
+
+    Pages whose text is nearly the same get fingerprints that differ in only a few bits.
+
+    :param html: The HTML (or plain text) of the page.
+    :param shingle_size: Number of consecutive words hashed together.
+    :param min_words: Texts with fewer words are too short for a reliable fingerprint.
+    :return: The fingerprint, or None for a text shorter than min_words.
+    """
+    tokens = TOKEN_PATTERN.findall(TAG_PATTERN.sub(" ", html).lower())
+    if len(tokens) < min_words:
+        return None
+    shingles = [" ".join(tokens[i:i + shingle_size]) for i in range(max(1, len(tokens) - shingle_size + 1))]
+    digests = np.frombuffer(b"".join(_hash64(shingle) for shingle in shingles), dtype=np.uint8)
+    bits = np.unpackbits(digests).reshape(len(shingles), 64)
+    votes = 2 * bits.sum(axis=0, dtype=np.int64) - len(shingles)
+    return int.from_bytes(np.packbits(votes > 0).tobytes(), "big")
+
+
+class SimHashIndex:
+    """
+    Index of SimHash fingerprints answering "is there one within `max_distance` bits?".
+
+    Fingerprints are split into max_distance + 1 blocks; two fingerprints that differ in at
+    most max_distance bits share at least one whole block, so only the fingerprints filed
+    under one of the blocks of the query are compared.
+    """
+
+    def __init__(self, max_distance=3):
+        self.max_distance = max_distance
+        edges = np.linspace(0, 64, max_distance + 2).astype(int)
+        self.blocks = [((1 << int(stop - start)) - 1, int(start)) for start, stop in zip(edges[:-1], edges[1:])]
+        self.tables = [{} for _ in self.blocks]
+        self.size = 0
+
+    def find(self, fingerprint):
+        """Return a stored fingerprint within max_distance bits of the given one, or None."""
+        for (mask, shift), table in zip(self.blocks, self.tables):
+            for candidate in table.get((fingerprint >> shift) & mask, ()):
+                if bin(candidate ^ fingerprint).count("1") <= self.max_distance:
+                    return candidate
+        return None
+
+    def add(self, fingerprint):
+        """
+        Store a fingerprint unless a near-duplicate is already stored.
+
+        :return: True if the fingerprint was added, False if it is a near-duplicate.
+        """
+        if self.find(fingerprint) is not None:
+            return False
+        for (mask, shift), table in zip(self.blocks, self.tables):
+            table.setdefault((fingerprint >> shift) & mask, []).append(fingerprint)
+        self.size += 1
+        return True
+
+
+class FetchCache:
+    """
+    On-disk cache of fetched pages for conditional requests.
+
+    Keeps, per URL, the ETag and Last-Modified validators returned by the server together with
+    the record and links parsed from the page, so a page answered with 304 Not Modified is
+    neither downloaded nor parsed again. Stored in SQLite and safe to use from several threads.
+    """
+
+    def __init__(self, file_path="fetch_cache.db"):
+        self.file_path = file_path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(file_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, "
+            "record TEXT, links TEXT, fingerprint TEXT, fetched_at REAL)")
+        self.connection.commit()
+
+    def get(self, url):
+        """Return the cached entry of a URL as a dictionary, or None."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT etag, last_modified, record, links, fingerprint FROM pages WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "record": json.loads(row[2]), "links": json.loads(row[3]),
+                "fingerprint": int(row[4], 16) if row[4] else None}
+
+    def put(self, url, etag, last_modified, record, links, fingerprint=None):
+        """Store the validators, parsed content and content fingerprint of a page."""
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, json.dumps(record), json.dumps(links),
+                 f"{fingerprint:016x}" if fingerprint is not None else None, time.time()))
+            self.connection.commit()
+
+    def conditional_headers(self, entry):
+        """Return the If-None-Match / If-Modified-Since headers for a cached entry."""
+        headers = {}
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def __len__(self):
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+# Example of detecting a near-duplicate page
+if __name__ == "__main__":
+    index = SimHashIndex(max_distance=3)
+    text = " ".join(f"word{i}" for i in range(300))
+    print(index.add(simhash(f"<html><body>{text}</body></html>")))
+    print(index.add(simhash(f"<html><body>{text} footer</body></html>")))
+    print(index.add(simhash(" ".join(f"other{i}" for i in range(300)))))
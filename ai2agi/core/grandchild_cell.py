@@ -1,11 +1,13 @@
 import time
 import random
-import json
+from core.cell_registry import default_allocator
+from core.performance_log import get_performance_log
 
 class GrandchildCell:
-    def __init__(self, parent_id):
+    def __init__(self, parent_id, registry=None):
         # تعريف الخلية مع معرف فريد، الوالد، والخصائص الأساسية
-        self.id = f"GRANDCHILD_{random.randint(1000, 9999)}"
+        allocator = registry.allocator if registry else default_allocator
+        self.id = allocator.allocate("GRANDCHILD")
         self.parent_id = parent_id
         self.status = "active"
         self.tasks = []
@@ -14,6 +16,8 @@ class GrandchildCell:
         self.completed_tasks = 0
         self.chromosomes = self.initialize_chromosomes()
         self.layers = self.initialize_layers()
+        if registry:
+            registry.register(self, parent_id=parent_id)
 
     def initialize_chromosomes(self):
         """تهيئة الجينات الخاصة بالأداء، التطور، والتعلم."""
@@ -96,7 +100,7 @@ class GrandchildCell:
         print(f"ℹ️ حالة الخلية {self.id}: {self.status}. الطاقة: {self.energy_level}")
 
     def log_performance(self, task, status):
-        """حفظ سجل أداء الخلية في ملف JSON."""
+        """حفظ سجل أداء الخلية في ملف JSON عبر الكاتب المشترك الذي يجمع السجلات في دفعات."""
         log_entry = {
             "cell_id": self.id,
             "task": task,
@@ -104,12 +108,7 @@ class GrandchildCell:
             "energy_level": self.energy_level,
             "timestamp": time.time()
         }
-        try:
-            with open("cell_performance.json", "a") as file:
-                json.dump(log_entry, file)
-                file.write("\n")
-        except Exception as e:
-            print(f"⚠️ خطأ في حفظ السجل: {e}")
+        get_performance_log("cell_performance.json").log(log_entry)
 
 # 🔥 **تجربة النظام المحسن**
 if __name__ == "__main__":
@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+
+
+class JsonlWriter:
+    """
+    Thread-safe, append-only JSON-lines writer with group commits.
+
+    Records are buffered in memory and written as one batch when the buffer reaches
+    `max_batch_size` records or when `flush_interval` seconds have passed since the last
+    flush. The file is fsynced only at batch boundaries, and pending records are flushed
+    when the writer is closed or the process exits. A record that cannot be serialized is
+    dropped and logged on its own, without losing the rest of its batch.
+    """
+
+    def __init__(self, file_path, max_batch_size=1000, flush_interval=1.0, fsync=True):
+        """
+        :param file_path: The JSON-lines file the records are appended to.
+        :param max_batch_size: Number of buffered records that triggers a flush.
+        :param flush_interval: Maximum time in seconds a record stays in the buffer.
+        :param fsync: Whether to fsync the file after each batch.
+        """
+        self.file_path = file_path
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.buffer = []
+        self.file = None
+        self.last_flush = time.monotonic()
+        self.batches_written = 0
+        self.entries_written = 0
+        self.entries_dropped = 0  # Records that could not be serialized or written
+        self.lock = threading.Lock()  # Protects the buffer
+        self.flush_lock = threading.Lock()  # Keeps batches in order on disk
+        self.closed = threading.Event()
+        self.flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+        self.flusher.start()
+        atexit.register(self.close)
+
+    def log(self, entry):
+        """
+        Buffer a record and flush the batch if it is full or old enough.
+
+        :param entry: A JSON-serializable dictionary.
+        :raises ValueError: If the writer is closed.
+        """
+        with self.lock:
+            if self.closed.is_set():
+                raise ValueError(f"Log writer for {self.file_path} is closed")
+            self.buffer.append(entry)
+            due = (len(self.buffer) >= self.max_batch_size
+                   or time.monotonic() - self.last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered records in one batch."""
+        with self.flush_lock:
+            with self.lock:
+                batch, self.buffer = self.buffer, []
+                self.last_flush = time.monotonic()
+            if not batch:
+                return
+            lines = []
+            for entry in batch:
+                try:
+                    lines.append(json.dumps(entry) + "\n")
+                except (TypeError, ValueError) as e:
+                    self.entries_dropped += 1
+                    logging.error(f"Dropped a record that cannot be written to {self.file_path}: {e}")
+            if not lines:
+                return
+            try:
+                if self.file is None:
+                    self.file = open(self.file_path, "a")
+                self.file.write("".join(lines))
+                self.file.flush()
+                if self.fsync:
+                    os.fsync(self.file.fileno())
+                self.batches_written += 1
+                self.entries_written += len(lines)
+            except OSError:
+                self.entries_dropped += len(lines)
+                logging.exception(f"Failed to write {len(lines)} records to {self.file_path}")
+
+    def _flush_periodically(self):
+        """Background loop that commits batches that are older than the flush interval."""
+        while not self.closed.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        """Flush the pending records and close the file."""
+        with self.lock:  # Records logged before this point are flushed below, later ones are refused
+            if self.closed.is_set():
+                return
+            self.closed.set()
+        self.flush()
+        with self.flush_lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+        atexit.unregister(self.close)
+
+# Example of appending records from many threads through one writer
+if __name__ == "__main__":
+    from concurrent.futures import ThreadPoolExecutor
+
+    writer = JsonlWriter("records.jsonl", max_batch_size=500, flush_interval=0.5, fsync=False)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        executor.map(lambda i: writer.log({"record": i, "timestamp": time.time()}), range(2000))
+    writer.close()
+    print(f"{writer.entries_written} records written in {writer.batches_written} batches.")
@@ -0,0 +1,295 @@
+import re
+import json
+import time
+import heapq
+import bisect
+import sqlite3
+import threading
+from collections.abc import Mapping, MutableMapping
+
+TERM_PATTERN = re.compile(r"[^\W_]+")
+TERM_MERGE_THRESHOLD = 8192  # New terms kept in a small sorted list before being merged into the main one
+
+
+def extract_terms(text):
+    """Return the set of lowercase terms (runs of letters and digits) of a text."""
+    return set(TERM_PATTERN.findall(str(text).lower()))
+
+
+class KnowledgeStore(MutableMapping):
+    """
+    Versioned, searchable knowledge base persisted in SQLite.
+
+    Learning a fact never overwrites the previous one: every value of a key is stored as a new
+    version, so the history of a key stays available while get() returns its latest value.
+    The latest values are kept in memory with an inverted index from the terms of the keys and
+    values to the keys. Each posting list is ordered by when its keys were last learned, so a
+    search walks the rarest query term's list from the newest key and stops after `limit`
+    matches: its cost depends on how many keys it has to look at, not on the number of facts.
+    Prefix queries bisect a sorted term list; new terms go to a small sorted list first,
+    merged into the main one every TERM_MERGE_THRESHOLD terms.
+
+    New versions are written to SQLite (WAL mode) in batches of `batch_size` facts, one
+    transaction per batch; flush() or close() writes the remaining ones.
+
+    The store is a mutable mapping of the keys to their latest values, so it can replace a
+    plain dict: `store[key] = value` learns a new version, `del store[key]` forgets a fact
+    with its history, and iteration, keys(), values(), items() and update() work as usual.
+    It is not a dict instance though; use dict(store) where one is required (e.g. json.dumps).
+    """
+
+    def __init__(self, file_path="knowledge.db", batch_size=1000):
+        """
+        :param file_path: SQLite database file (":memory:" for a store that is not persisted).
+        :param batch_size: Number of new facts written per transaction.
+        """
+        self.file_path = file_path
+        self.batch_size = batch_size
+        self.lock = threading.RLock()
+        self.facts = {}  # Key -> (value, version, learned_at, sequence) of the latest version
+        self.postings = {}  # Term -> keys whose latest fact contains the term (dict, least recently learned first)
+        self.terms = []  # Sorted terms, for prefix queries (may hold terms removed since the last merge)
+        self.recent_terms = []  # Sorted terms added since the last merge
+        self.removed_terms = 0  # Terms removed from self.postings since the last merge
+        self.pending = []  # Versions not written to the database yet
+        self.sequence = 0  # Order in which the latest versions were learned
+        self.connection = sqlite3.connect(file_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS facts (key TEXT, version INTEGER, value TEXT, learned_at REAL, "
+            "PRIMARY KEY (key, version))")
+        self.connection.commit()
+        self._load()
+
+    def _load(self):
+        """Rebuild the latest facts and the index from the database."""
+        rows = self.connection.execute(
+            "SELECT key, MAX(version), value, learned_at FROM facts GROUP BY key ORDER BY learned_at")
+        for key, version, value, learned_at in rows:
+            self._set_latest(key, json.loads(value), version, learned_at)
+
+    def _set_latest(self, key, value, version, learned_at):
+        old = self.facts.get(key)
+        new_terms = extract_terms(f"{key} {value}")
+        if old is not None:
+            for term in extract_terms(f"{key} {old[0]}"):
+                if term not in new_terms:
+                    self._unindex(term, key)
+        for term in new_terms:
+            keys = self.postings.get(term)
+            if keys is None:
+                keys = self.postings[term] = {}
+                bisect.insort(self.recent_terms, term)
+                if len(self.recent_terms) >= TERM_MERGE_THRESHOLD:
+                    self._merge_terms()
+            keys.pop(key, None)
+            keys[key] = None  # Most recently learned last
+        self.sequence += 1
+        self.facts[key] = (value, version, learned_at, self.sequence)
+
+    def _unindex(self, term, key):
+        keys = self.postings[term]
+        keys.pop(key, None)
+        if not keys:
+            del self.postings[term]
+            self.removed_terms += 1
+
+    def _merge_terms(self):
+        terms = self.terms + self.recent_terms
+        terms.sort()  # Two sorted runs: merged in linear time
+        if self.removed_terms:
+            terms = [term for i, term in enumerate(terms)
+                     if term in self.postings and (i == 0 or terms[i - 1] != term)]
+        self.terms, self.recent_terms, self.removed_terms = terms, [], 0
+
+    def put(self, key, value, learned_at=None):
+        """
+        Learn a new version of a fact.
+
+        :param key: Name of the fact.
+        :param value: JSON-serializable value of the fact.
+        :param learned_at: Time the fact was learned (now when None).
+        :return: The version number of the fact.
+        """
+        learned_at = time.time() if learned_at is None else learned_at
+        encoded = json.dumps(value)  # Before any change, so a value that cannot be stored is not learned
+        with self.lock:
+            old = self.facts.get(key)
+            version = 1 if old is None else old[1] + 1
+            self._set_latest(key, value, version, learned_at)
+            self.pending.append((key, version, encoded, learned_at))
+            if len(self.pending) >= self.batch_size:
+                self.flush()
+        return version
+
+    def learn(self, new_information, learned_at=None):
+        """Learn every key/value pair of a dictionary as a new version."""
+        with self.lock:
+            for key, value in new_information.items():
+                self.put(key, value, learned_at)
+
+    def flush(self):
+        """Write the pending versions to the database in one transaction."""
+        with self.lock:
+            if not self.pending:
+                return
+            with self.connection:
+                self.connection.executemany("INSERT OR REPLACE INTO facts VALUES (?, ?, ?, ?)", self.pending)
+            self.pending = []
+
+    def get(self, key, default=None):
+        """Return the latest value of a fact."""
+        fact = self.facts.get(key)
+        return default if fact is None else fact[0]
+
+    def __getitem__(self, key):
+        return self.facts[key][0]
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def __delitem__(self, key):
+        self.forget(key)
+
+    def __iter__(self):
+        with self.lock:
+            return iter(list(self.facts))
+
+    def __contains__(self, key):
+        return key in self.facts
+
+    def __len__(self):
+        return len(self.facts)
+
+    def items(self):
+        """Return the (key, latest value) pairs."""
+        with self.lock:
+            return [(key, fact[0]) for key, fact in self.facts.items()]
+
+    def values(self):
+        """Return the latest values."""
+        with self.lock:
+            return [fact[0] for fact in self.facts.values()]
+
+    def update(self, other=(), **kwargs):
+        """Learn the key/value pairs of a mapping, an iterable of pairs and/or keyword arguments."""
+        with self.lock:
+            pairs = other.items() if isinstance(other, Mapping) else other
+            for key, value in pairs:
+                self.put(key, value)
+            for key, value in kwargs.items():
+                self.put(key, value)
+
+    def forget(self, key):
+        """
+        Forget a fact and all its versions.
+
+        :raises KeyError: If the fact was never learned.
+        """
+        with self.lock:
+            value = self.facts.pop(key)[0]
+            for term in extract_terms(f"{key} {value}"):
+                self._unindex(term, key)
+            self.pending = [row for row in self.pending if row[0] != key]
+            with self.connection:
+                self.connection.execute("DELETE FROM facts WHERE key = ?", (key,))
+
+    def version(self, key):
+        """Return the number of versions of a fact (0 if it was never learned)."""
+        fact = self.facts.get(key)
+        return 0 if fact is None else fact[1]
+
+    def history(self, key, limit=None):
+        """
+        Return the versions of a fact, newest first, as dictionaries with version, value and learned_at.
+
+        :param limit: Maximum number of versions returned.
+        """
+        with self.lock:
+            self.flush()
+            rows = self.connection.execute(
+                "SELECT version, value, learned_at FROM facts WHERE key = ? ORDER BY version DESC LIMIT ?",
+                (key, -1 if limit is None else limit)).fetchall()
+        return [{"version": version, "value": json.loads(value), "learned_at": learned_at}
+                for version, value, learned_at in rows]
+
+    def _query(self, text=None, prefix=None):
+        """Return the posting lists of the terms of `text`, and the set of keys with a term matching `prefix`."""
+        postings = [self.postings.get(term, {}) for term in extract_terms(text or "")]
+        prefix_keys = None
+        if prefix is not None:
+            prefix = prefix.lower()
+            prefix_keys = set()
+            for terms in (self.terms, self.recent_terms):
+                start = bisect.bisect_left(terms, prefix)
+                end = bisect.bisect_left(terms, prefix + "\U0010ffff")
+                for term in terms[start:end]:
+                    prefix_keys.update(self.postings.get(term, ()))
+        return postings, prefix_keys
+
+    def search(self, text=None, prefix=None, limit=10):
+        """
+        Find the facts whose key or latest value contains every term of `text`.
+
+        The rarest term's posting list is walked from the most recently learned key, checking
+        the other terms, until `limit` facts match; a search for common terms that match each
+        other often therefore stays cheap. A search with only a prefix (or limit=None) ranks
+        all the matching keys, which costs time proportional to their number.
+
+        :param text: Terms that must all appear in the fact.
+        :param prefix: Also require a term starting with this prefix.
+        :param limit: Maximum number of facts returned (None for all of them).
+        :return: (key, value) pairs, most recently learned first.
+        """
+        with self.lock:
+            postings, prefix_keys = self._query(text, prefix)
+            if not postings and prefix_keys is None:
+                return []
+            if postings and limit is not None:
+                postings.sort(key=len)
+                others = postings[1:] + ([prefix_keys] if prefix_keys is not None else [])
+                keys = []
+                for key in reversed(postings[0]):
+                    if all(key in other for other in others):
+                        keys.append(key)
+                        if len(keys) >= limit:
+                            break
+            else:
+                order = lambda key: self.facts[key][3]
+                keys = self._intersect(postings, prefix_keys)
+                keys = sorted(keys, key=order, reverse=True) if limit is None else heapq.nlargest(limit, keys, key=order)
+            return [(key, self.facts[key][0]) for key in keys]
+
+    @staticmethod
+    def _intersect(postings, prefix_keys):
+        collections = sorted(postings + ([prefix_keys] if prefix_keys is not None else []), key=len)
+        smallest, others = collections[0], collections[1:]
+        return {key for key in smallest if all(key in other for other in others)}
+
+    def count(self, text=None, prefix=None):
+        """Return the number of facts matching a search."""
+        with self.lock:
+            postings, prefix_keys = self._query(text, prefix)
+            if not postings and prefix_keys is None:
+                return 0
+            return len(self._intersect(postings, prefix_keys))
+
+    def close(self):
+        with self.lock:
+            self.flush()
+            self.connection.close()
+
+# Example of learning and searching a million facts
+if __name__ == "__main__":
+    store = KnowledgeStore(":memory:", batch_size=10000)
+    started = time.time()
+    for i in range(1000000):
+        store.put(f"observation_{i}", f"sensor {i % 100} reported state {i % 7}")
+    store.flush()
+    print(len(store), f"learned in {time.time() - started:.1f}s")
+    store.put("observation_42", "sensor 42 reported failure")
+    started = time.time()
+    print(store.search("failure"), store.search("sensor 42", prefix="fail"))
+    print(f"searched in {(time.time() - started) * 1000:.3f}ms")
+    print(store.history("observation_42"))
@@ -3,6 +3,11 @@ import time
 import random
 import logging
 from ada_network.ada_bridge import AdaBridge  # ADA neural integration
+from core.cell_registry import CellRegistry
+from core.child_cell import ChildCell
+from core.state_journal import StateJournal
+from core.ring_memory import RingMemoryChannel, NumericRingChannel
+from core.analysis_cache import AnalysisCache, normalize_environment
 
 logging.basicConfig(level=logging.INFO)
 
@@ -12,7 +17,9 @@ class MotherCell:
         self.layers = self.initialize_layers()
         self.chromosomes = self.initialize_chromosomes()
         self.memory = self.initialize_memory()
-        self.children = []
+        self.children = []  # IDs of the child cells, in creation order
+        self.registry = CellRegistry()  # O(1) lookups of cells and their lineage
+        self.registry.register(self)
         self.energy_level = 1.0
         self.evolution_score = 0.5
         self.task_history = []
@@ -22,6 +29,10 @@ class MotherCell:
         self.self_awareness = {"knowledge_evaluation": 0.5, "confidence": 0.5}  # Self-reflection capabilities
         self.world_model = {}  # Internal simulation model
         self.ethical_framework = {"avoid_harm": True, "prioritize_cooperation": True}
+        self.state_journal = None  # Set by enable_journal() for delta-based persistence
+        self.journal_marks = None  # Sizes of the growing parts of the state at the last journaled save
+        self.analysis_cache = AnalysisCache(max_size=1024)  # Results of the ADA analysis chain
+        self.analysis_context = None  # Chromosomes and ethics the cached results were computed with
 
     def initialize_layers(self):
         return {
@@ -44,17 +55,46 @@ class MotherCell:
             "self_modification": random.uniform(0.5, 1.0)  # Ability to optimize code
         }
 
-    def initialize_memory(self):
+    def initialize_memory(self, capacity=1000):
+        """Create the memory; history channels are bounded and roll old entries up into summaries."""
         return {
-            "environmental_history": [],
-            "decision_log": [],
+            "environmental_history": RingMemoryChannel(capacity),
+            "decision_log": RingMemoryChannel(capacity),
             "task_performance": {},
-            "evolution_record": [],
+            "evolution_record": NumericRingChannel(capacity, numeric_fields=("new_score",)),
             "child_performance": {},
             "long_term_knowledge": {},  # Long-term learning storage
-            "collaborative_interactions": []  # Memory of interactions with other AIs
+            "collaborative_interactions": RingMemoryChannel(capacity)  # Memory of interactions with other AIs
         }
 
+    def create_child(self):
+        """Create a new child cell and index it in the registry."""
+        child = ChildCell(self.id, registry=self.registry)
+        self.children.append(child.id)
+        logging.info(f"Child cell created: {child.id}")
+        return child
+
+    def get_child(self, child_id):
+        """Return one of the children by ID without scanning the children list."""
+        if self.registry.get_parent(child_id) is self:
+            return self.registry.get(child_id)
+
+    def _restore_children(self):
+        """
+        Make the registry match the restored list of child IDs.
+
+        Only the IDs are saved, so missing children are re-created under their ID with the initial
+        ChildCell state; registered children that are not in the list are removed.
+        """
+        restored = set(self.children)
+        for child_id in self.registry.children_ids(self.id):
+            if child_id not in restored:
+                self.registry.unregister(child_id)
+        for child_id in self.children:
+            if self.registry.get_parent(child_id) is not self:
+                ChildCell(self.id, registry=self.registry, cell_id=child_id)
+        return None
+
     def simulate_future_scenarios(self, action):
         """Simulate the consequences of an action before executing it."""
         if action == "explore":
@@ -77,13 +117,32 @@ class MotherCell:
         self.self_awareness["knowledge_evaluation"] = (self.self_awareness["knowledge_evaluation"] + performance_score) / 2
         logging.info(f"Self-awareness adjusted: Knowledge Eval = {self.self_awareness['knowledge_evaluation']}")
 
+    def invalidate_analysis_cache(self, reason=None):
+        """Forget cached environment analyses, e.g. after changing the chromosomes or the ethical framework."""
+        self.analysis_cache.invalidate(reason)
+        self.analysis_context = None
+
     def analyze_environment_using_ada(self, environment_data):
         """Analyze the environment using logical inference and ADA analysis."""
+        # Cached results are only valid for the chromosomes and ethics they were computed with
+        context = (tuple(sorted(self.chromosomes.items())), tuple(sorted(self.ethical_framework.items())))
+        if context != self.analysis_context:
+            if self.analysis_context is not None:
+                self.invalidate_analysis_cache("chromosomes or ethical framework changed")
+            self.analysis_context = context
+
+        key = normalize_environment(environment_data)
+        action = self.analysis_cache.get(key)
+        if action is not None:
+            logging.debug(f"Environmental analysis served from cache: {key} -> {action}")
+            return action
+
         analysis = self.ada_bridge.analyze_environment(environment_data)
         inferred_knowledge = self.infer_knowledge(analysis)
         action = self.ada_bridge.decide_based_on_analysis(inferred_knowledge)
         simulated_outcome = self.simulate_future_scenarios(action)
         logging.info(f"Environmental analysis: {analysis} -> Inferred Decision: {action} -> Simulated Outcome: {simulated_outcome}")
+        self.analysis_cache.put(key, action)
         return action
 
     def infer_knowledge(self, analysis):
@@ -122,22 +181,92 @@ class MotherCell:
             return "Action encouraged based on ethical framework."
         return "Action allowed."
 
-    def save_state(self):
-        """Save the cell's memory and learned experiences."""
-        state = {
+    def get_state(self, memory_keys=None):
+        """
+        Collect the persistent part of the cell's state.
+
+        :param memory_keys: Only include these memory channels (all of them when None).
+        """
+        return {
             "layers": self.layers,
             "chromosomes": self.chromosomes,
-            "memory": self.memory,
+            "memory": {key: value.to_dict() if isinstance(value, RingMemoryChannel) else value
+                       for key, value in self.memory.items() if memory_keys is None or key in memory_keys},
             "children": self.children,
             "energy_level": self.energy_level,
             "evolution_score": self.evolution_score,
             "self_awareness": self.self_awareness,
             "ethical_framework": self.ethical_framework
         }
-        with open("mother_cell_state.json", "w") as f:
-            json.dump(state, f)
+
+    def enable_journal(self, base_path="mother_cell_state.json", journal_path="mother_cell_state.journal",
+                       compact_threshold=1000):
+        """Switch to journaled persistence: each save appends only the changes since the last one."""
+        self.state_journal = StateJournal(base_path, journal_path, compact_threshold)
+        self.journal_marks = None
+
+    def _journal_marks(self):
+        """Sizes of the parts of the state that only grow: the children and the memory channels."""
+        marks = {("children",): len(self.children)}
+        for key, channel in self.memory.items():
+            if isinstance(channel, RingMemoryChannel):
+                marks[("memory", key)] = channel.total_appended
+        return marks
+
+    def _journal_dirty_paths(self, marks):
+        """
+        Return the paths of the state that may have changed since the last journaled save, or
+        None when the whole state has to be compared (first save, or after load_state).
+
+        The small, fixed-size parts are always compared; the children and the memory channels
+        only when they grew, so a save does not serialize or compare the unchanged history.
+        """
+        if self.journal_marks is None:
+            return None
+        paths = [["layers"], ["chromosomes"], ["energy_level"], ["evolution_score"],
+                 ["self_awareness"], ["ethical_framework"]]
+        paths += [["memory", key] for key, value in self.memory.items() if not isinstance(value, RingMemoryChannel)]
+        paths += [list(path) for path, mark in marks.items() if self.journal_marks.get(path) != mark]
+        return paths
+
+    def save_state(self):
+        """Save the cell's memory and learned experiences."""
+        if self.state_journal:
+            marks = self._journal_marks()
+            dirty = self._journal_dirty_paths(marks)
+            memory_keys = None if dirty is None else {path[1] for path in dirty if path[0] == "memory"}
+            self.state_journal.save(self.get_state(memory_keys), dirty)
+            self.journal_marks = marks
+        else:
+            state = self.get_state()
+            with open("mother_cell_state.json", "w") as f:
+                json.dump(state, f)
         logging.info("Mother cell state saved.")
 
+    def load_state(self):
+        """Restore the cell's memory and learned experiences saved by save_state."""
+        if self.state_journal:
+            state = self.state_journal.load()
+        else:
+            try:
+                with open("mother_cell_state.json", "r") as f:
+                    state = json.load(f)
+            except FileNotFoundError:
+                state = None
+        if not state:
+            logging.warning("No saved mother cell state found.")
+            return False
+        for key, value in state.items():
+            setattr(self, key, value)
+        self._restore_children()
+        for key, channel in self.initialize_memory().items():
+            if isinstance(channel, RingMemoryChannel) and isinstance(self.memory.get(key), dict):
+                self.memory[key] = type(channel).from_dict(self.memory[key])
+        self.journal_marks = None
+        self.invalidate_analysis_cache("state restored")
+        logging.info("Mother cell state restored.")
+        return True
+
 # Execute the system
 if __name__ == "__main__":
     mother = MotherCell()
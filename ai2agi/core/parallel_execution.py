@@ -0,0 +1,194 @@
+import os
+import time
+import logging
+import multiprocessing as mp
+import numpy as np
+
+# Arrays synchronized between a population and the shards resident in the workers
+SYNCED_ARRAYS = ("energy_level", "status", "completed_tasks", "performance_genes", "evolution_genes",
+                 "learning_genes", "_queue", "_queue_head", "pending_tasks")
+
+
+def array_changes(before, after):
+    """
+    Return the changes between two versions of an array: (flat indices, new values), or
+    (None, new array) when the shape changed.
+    """
+    if before.shape != after.shape:
+        return None, after
+    changed = np.flatnonzero(before != after)
+    return changed, after.ravel()[changed]
+
+
+def apply_changes(array, changes):
+    """Apply changes from array_changes() to an array and return the (possibly new) array."""
+    indices, values = changes
+    if indices is None:
+        return values.copy()
+    array.ravel()[indices] = values  # The arrays are contiguous, so ravel() is a view
+    return array
+
+
+def run_shard(shard, steps, energy_amount):
+    """
+    Run task batches for one shard of a CellPopulation inside a worker process.
+
+    :param shard: The CellPopulation shard.
+    :param steps: Number of ticks to run.
+    :param energy_amount: Energy given to every cell at the end of each tick, or None for no energy.
+    :return: (delta arrays of the shard, number of completions per task code)
+    """
+    task_counts = np.zeros(len(shard.task_names), dtype=np.int64)
+    for _ in range(steps):
+        _, codes = shard.perform_task()
+        if codes.size:
+            task_counts += np.bincount(codes, minlength=len(task_counts))
+        shard.self_evolve()
+        if energy_amount is not None:
+            shard.receive_energy(energy_amount)
+    return shard.shard_delta(), task_counts
+
+
+def shard_worker(connection):
+    """
+    Worker process owning one shard of a population across batches.
+
+    Receives either ("load", shard, steps, energy_amount) or ("update", (changes, task_names),
+    steps, energy_amount), runs the batch and answers with (changes, task counts), where the
+    changes only hold the array entries modified by the batch. None stops the worker.
+    """
+    shard = None
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        kind, payload, steps, energy_amount = message
+        if kind == "load":
+            shard = payload
+        else:
+            changes, task_names = payload
+            for name, array_change in changes.items():
+                setattr(shard, name, apply_changes(getattr(shard, name), array_change))
+            for task in task_names:
+                shard.task_code(task)
+        before = {name: getattr(shard, name).copy() for name in SYNCED_ARRAYS}
+        _, task_counts = run_shard(shard, steps, energy_amount)
+        changes = {name: array_changes(before[name], getattr(shard, name)) for name in SYNCED_ARRAYS}
+        connection.send(({name: change for name, change in changes.items()
+                          if change[0] is None or change[0].size}, task_counts))
+
+
+class ParallelCellExecutor:
+    """
+    Runs the tasks of a CellPopulation on several cores.
+
+    The population is split into contiguous shards, each owned by a long-lived worker
+    process that keeps its shard between batches. Only the first batch sends the shards;
+    afterwards a batch sends the array entries changed in the population since the last one
+    (e.g. newly assigned tasks or energy given) and the worker answers with the entries its
+    ticks changed plus per-task completion counts, which are merged into the population.
+    A population that fits in one shard runs in the calling process without any copy.
+    """
+
+    def __init__(self, workers=None, min_shard_size=10000):
+        """
+        :param workers: Number of worker processes (number of cores when None).
+        :param min_shard_size: Populations smaller than this per worker use fewer shards.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.min_shard_size = min_shard_size
+        self.processes = []  # (process, connection) per shard
+        self.population = None  # Population whose shards the workers hold
+        self.bounds = None
+        self.mirrors = []  # Per shard: the arrays as the worker last saw them
+        self.task_names = 0  # Number of task names the workers know
+
+    def shard_bounds(self, size):
+        """Return the (start, stop) bounds of the shards for a population of the given size."""
+        shards = max(1, min(self.workers, size // self.min_shard_size))
+        edges = np.linspace(0, size, shards + 1).astype(int)
+        return list(zip(edges[:-1], edges[1:]))
+
+    def run(self, population, steps=1, energy_amount=None):
+        """
+        Run a batch of ticks over the whole population in parallel, with the same result as
+        calling population.tick(energy_amount) steps times.
+
+        :param population: The CellPopulation to run.
+        :param steps: Number of ticks each worker runs before sending its delta back.
+        :param energy_amount: Energy given to every cell at the end of each tick, or None for no energy.
+        :return: A dict with the number of completed tasks per task name.
+        """
+        start_time = time.time()
+        bounds = self.shard_bounds(population.size)
+        if len(bounds) == 1:
+            _, task_counts = run_shard(population, steps, energy_amount)
+        else:
+            task_counts = self._run_shards(population, bounds, steps, energy_amount)
+        completed = int(task_counts.sum())
+        logging.info(f"Parallel batch: {completed} tasks completed by {len(bounds)} shards "
+                     f"in {time.time() - start_time:.2f} seconds.")
+        return {population.task_names[code]: int(count) for code, count in enumerate(task_counts) if count}
+
+    def _run_shards(self, population, bounds, steps, energy_amount):
+        """Run a batch on the worker processes, sending each one its shard or only the changes."""
+        if population is not self.population or bounds != self.bounds:
+            self.close()
+            self.population, self.bounds = population, bounds
+            self.task_names = len(population.task_names)
+            self.mirrors = []
+            for start, stop in bounds:
+                parent_connection, child_connection = mp.Pipe()
+                process = mp.Process(target=shard_worker, args=(child_connection,), daemon=True)
+                process.start()
+                self.processes.append((process, parent_connection))
+                shard = population.shard(start, stop)
+                self.mirrors.append({name: getattr(shard, name).copy() for name in SYNCED_ARRAYS})
+                parent_connection.send(("load", shard, steps, energy_amount))
+        else:
+            new_task_names = population.task_names[self.task_names:]
+            self.task_names = len(population.task_names)
+            for (start, stop), (_, connection), mirror in zip(bounds, self.processes, self.mirrors):
+                changes = {}
+                for name in SYNCED_ARRAYS:
+                    change = array_changes(mirror[name], getattr(population, name)[start:stop])
+                    if change[0] is None or change[0].size:
+                        changes[name] = change
+                        mirror[name] = apply_changes(mirror[name], change)
+                connection.send(("update", (changes, new_task_names), steps, energy_amount))
+
+        task_counts = np.zeros(len(population.task_names), dtype=np.int64)
+        for (start, stop), (_, connection), mirror in zip(bounds, self.processes, self.mirrors):
+            changes, counts = connection.recv()
+            for name, change in changes.items():  # Workers never reshape arrays, only change entries
+                mirror[name] = apply_changes(mirror[name], change)
+                apply_changes(getattr(population, name)[start:stop], change)
+            task_counts[:len(counts)] += counts
+        return task_counts
+
+    def close(self):
+        """Shut the worker processes down."""
+        for process, connection in self.processes:
+            connection.send(None)
+            process.join()
+            connection.close()
+        self.processes = []
+        self.population = self.bounds = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# Example of running a large population on all cores
+if __name__ == "__main__":
+    from core.cell_population import CellPopulation
+
+    population = CellPopulation(1000000, parent_id="CHILD_1001", seed=7)
+    for task in ("Analyze environment", "Run adaptation protocol", "Collect data"):
+        population.assign_task(task)
+
+    with ParallelCellExecutor() as executor:
+        print(executor.run(population, steps=3, energy_amount=0.05))
+    print(population.status_counts())
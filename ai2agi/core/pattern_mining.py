@@ -0,0 +1,162 @@
+from collections import deque
+
+
+class SpaceSaving:
+    """
+    Space-Saving sketch of the most frequent items of a stream, in bounded memory.
+
+    At most `capacity` items are monitored. A new item replaces one with the smallest count and
+    inherits that count as its overestimation error, so every item seen more than
+    total / capacity times is guaranteed to be monitored. Items are grouped in buckets by
+    count, so each update is O(1).
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = {}  # Item -> estimated count
+        self.errors = {}  # Item -> maximum overestimation of its count
+        self.buckets = {}  # Count -> items with that count
+        self.min_count = 0
+        self.total = 0
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __contains__(self, item):
+        return item in self.counts
+
+    def _move(self, item, old_count, new_count):
+        if old_count:
+            bucket = self.buckets[old_count]
+            bucket.discard(item)
+            if not bucket:
+                del self.buckets[old_count]
+        self.buckets.setdefault(new_count, set()).add(item)
+        self.counts[item] = new_count
+
+    def add(self, item):
+        """Count one occurrence of an item."""
+        self.total += 1
+        count = self.counts.get(item)
+        if count is None:
+            if len(self.counts) < self.capacity:
+                self.errors[item] = 0
+                self._move(item, 0, 1)
+                self.min_count = 1 if len(self.counts) == 1 else min(self.min_count, 1)
+                return
+            # Replace an item with the smallest count
+            evicted = self.buckets[self.min_count].pop()
+            if not self.buckets[self.min_count]:
+                del self.buckets[self.min_count]
+            del self.counts[evicted], self.errors[evicted]
+            count = self.min_count
+            self.errors[item] = count
+            self._move(item, 0, count + 1)
+        else:
+            self._move(item, count, count + 1)
+        if self.min_count not in self.buckets:
+            self.min_count += 1  # Counts only grow by one, so the next smallest is one higher
+
+    def count(self, item):
+        """Return the estimated count of an item (0 if it is not monitored)."""
+        return self.counts.get(item, 0)
+
+    def guaranteed_count(self, item):
+        """Return a lower bound of the true count of an item."""
+        return self.counts.get(item, 0) - self.errors.get(item, 0)
+
+    def top(self, k=10):
+        """Return the k most frequent items as (item, estimated count) pairs."""
+        return sorted(self.counts.items(), key=lambda pair: pair[1], reverse=True)[:k]
+
+    def items(self):
+        return self.counts.items()
+
+
+class FrequentPatternMiner:
+    """
+    Online miner of frequent trigger -> behavior pairs and short behavior sequences.
+
+    Every event updates Space-Saving sketches of triggers, (trigger, behavior) pairs and the
+    behavior sequences ending at the event (lengths 2 to `sequence_length`), in O(1) per
+    sketch. Memory is bounded by the sketch capacities whatever the length of the stream, and
+    queries only read the sketches.
+    """
+
+    def __init__(self, capacity=1000, sequence_length=3):
+        """
+        :param capacity: Number of items monitored by each sketch.
+        :param sequence_length: Longest behavior sequence mined.
+        """
+        self.sequence_length = sequence_length
+        self.triggers = SpaceSaving(capacity)
+        self.pairs = SpaceSaving(capacity)
+        self.sequences = SpaceSaving(capacity)
+        self.recent = deque(maxlen=sequence_length)  # Latest behaviors, oldest first
+
+    def observe(self, behavior, trigger=None):
+        """Update the sketches with one (behavior, trigger) event."""
+        if trigger is not None:
+            self.triggers.add(trigger)
+            self.pairs.add((trigger, behavior))
+        self.recent.append(behavior)
+        recent = tuple(self.recent)
+        for length in range(2, len(recent) + 1):
+            self.sequences.add(recent[-length:])
+
+    def top_pairs(self, k=10):
+        """Return the k most frequent (trigger, behavior) pairs with their estimated counts."""
+        return self.pairs.top(k)
+
+    def top_sequences(self, k=10, length=None):
+        """Return the k most frequent behavior sequences (of the given length, or any length)."""
+        sequences = self.sequences.items() if length is None else (
+            (sequence, count) for sequence, count in self.sequences.items() if len(sequence) == length)
+        return sorted(sequences, key=lambda pair: pair[1], reverse=True)[:k]
+
+    def behaviors_for(self, trigger, k=3):
+        """
+        Return the behaviors most associated with a trigger.
+
+        :return: (behavior, estimated count, confidence) tuples, confidence being the share of
+            the trigger's occurrences followed by that behavior.
+        """
+        trigger_count = self.triggers.count(trigger)
+        if not trigger_count:
+            return []
+        matches = [(behavior, count) for (pair_trigger, behavior), count in self.pairs.items()
+                   if pair_trigger == trigger]
+        matches.sort(key=lambda pair: pair[1], reverse=True)
+        return [(behavior, count, min(1.0, count / trigger_count)) for behavior, count in matches[:k]]
+
+    def predict_next(self, recent=None, k=3):
+        """
+        Return the behaviors most likely to follow the latest behaviors, from the mined sequences.
+
+        :param recent: Behaviors to continue, oldest first (the latest observed ones by default).
+        :return: (behavior, estimated count) pairs.
+        """
+        recent = tuple(self.recent if recent is None else recent)[-(self.sequence_length - 1):]
+        for start in range(len(recent)):  # Longest matching context first
+            context = recent[start:]
+            matches = [(sequence[-1], count) for sequence, count in self.sequences.items()
+                       if len(sequence) == len(context) + 1 and sequence[:-1] == context]
+            if matches:
+                return sorted(matches, key=lambda pair: pair[1], reverse=True)[:k]
+        return []
+
+# Example of mining a stream of behaviors
+if __name__ == "__main__":
+    import random
+
+    miner = FrequentPatternMiner(capacity=50)
+    cycle = ["stress", "coping", "calmness"]
+    for i in range(100000):
+        if random.random() < 0.8:
+            miner.observe(cycle[i % 3], trigger={"stress": "deadline", "coping": "breathing", "calmness": "rest"}[cycle[i % 3]])
+        else:
+            miner.observe(f"noise_{random.randrange(1000)}", trigger=f"random_{random.randrange(1000)}")
+    print(miner.top_pairs(3))
+    print(miner.top_sequences(3, length=3))
+    print(miner.behaviors_for("deadline"))
+    print(miner.predict_next(["stress"]))
@@ -0,0 +1,43 @@
+import time
+import threading
+from core.jsonl_writer import JsonlWriter
+
+
+class PerformanceLogWriter(JsonlWriter):
+    """
+    Shared, thread-safe writer for cell performance logs with group commits.
+
+    A JsonlWriter whose entries are the performance records of the cells; see JsonlWriter
+    for the batching and fsync behaviour.
+    """
+
+    def __init__(self, file_path="cell_performance.json", max_batch_size=1000, flush_interval=1.0, fsync=True):
+        """
+        :param file_path: The JSON-lines file the entries are appended to.
+        :param max_batch_size: Number of buffered entries that triggers a flush.
+        :param flush_interval: Maximum time in seconds an entry stays in the buffer.
+        :param fsync: Whether to fsync the file after each batch.
+        """
+        super().__init__(file_path, max_batch_size, flush_interval, fsync)
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_performance_log(file_path="cell_performance.json"):
+    """Return the writer shared by all cells that log to the given file."""
+    with _writers_lock:
+        writer = _writers.get(file_path)
+        if writer is None or writer.closed.is_set():
+            writer = _writers[file_path] = PerformanceLogWriter(file_path)
+        return writer
+
+# Example of many cells logging through one writer
+if __name__ == "__main__":
+    writer = PerformanceLogWriter("cell_performance.json", max_batch_size=500, flush_interval=0.5)
+    for i in range(2000):
+        writer.log({"cell_id": f"GRANDCHILD_{i}", "task": "Analyze environment", "status": "completed",
+                    "energy_level": 0.9, "timestamp": time.time()})
+    writer.close()
+    print(f"{writer.entries_written} entries written in {writer.batches_written} batches.")
@@ -0,0 +1,279 @@
+import time
+from collections import deque
+import numpy as np
+
+# (bucket length in seconds, number of buckets kept) for each rollup tier, finest first
+DEFAULT_TIERS = ((60, 1440), (3600, 720))  # One day of minutes, thirty days of hours
+
+
+def _new_bucket(start, fields):
+    return {"start": start, "count": 0, "fields": {field: [0.0, None, None] for field in fields}}
+
+
+def _merge_into(bucket, count, values):
+    """Add `count` entries with the given {field: (sum, min, max)} to an aggregate bucket."""
+    bucket["count"] += count
+    for field, (total, low, high) in values.items():
+        stats = bucket["fields"][field]
+        stats[0] += total
+        stats[1] = low if stats[1] is None else min(stats[1], low)
+        stats[2] = high if stats[2] is None else max(stats[2], high)
+
+
+class RingMemoryChannel:
+    """
+    Fixed-capacity memory channel with downsampled retention.
+
+    The most recent `capacity` entries are kept as they are. Older entries are not dropped
+    but rolled up into coarser aggregates (per-minute, then per-hour buckets by default) that
+    keep the count and the sum/min/max of each numeric field, so trend queries over the whole
+    history keep working while memory stays bounded.
+    """
+
+    def __init__(self, capacity=1000, numeric_fields=(), tiers=DEFAULT_TIERS):
+        """
+        :param capacity: Number of raw entries kept.
+        :param numeric_fields: Entry fields aggregated in the rollups.
+        :param tiers: (bucket length in seconds, number of buckets) per rollup tier, finest first.
+        """
+        self.capacity = capacity
+        self.numeric_fields = tuple(numeric_fields)
+        self.tiers = tuple(tuple(tier) for tier in tiers)
+        self.rollups = [deque(maxlen=buckets) for _, buckets in self.tiers]
+        self.entries = deque(maxlen=capacity)  # (timestamp, entry) pairs
+        self.total_appended = 0
+
+    @staticmethod
+    def _timestamp_of(entry):
+        if isinstance(entry, dict) and isinstance(entry.get("timestamp"), (int, float)):
+            return entry["timestamp"]
+        return time.time()
+
+    def append(self, entry):
+        """Add an entry, rolling the oldest one up when the channel is full."""
+        timestamp = self._timestamp_of(entry)
+        if len(self.entries) == self.capacity:
+            old_timestamp, old_entry = self.entries[0]
+            self._roll_up(0, old_timestamp, 1, self._field_stats(old_entry))
+        self.entries.append((timestamp, entry))
+        self.total_appended += 1
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def _field_stats(self, entry):
+        """Return {field: (sum, min, max)} for the numeric fields of one entry."""
+        stats = {}
+        for field in self.numeric_fields:
+            value = entry.get(field) if isinstance(entry, dict) else None
+            if isinstance(value, (int, float)) and value == value:  # NaN marks a missing value
+                stats[field] = (value, value, value)
+        return stats
+
+    def _roll_up(self, tier, timestamp, count, values):
+        """Merge evicted data into the bucket of the given tier, cascading to coarser tiers."""
+        if tier >= len(self.tiers):
+            return  # Older than the coarsest tier: finally dropped
+        length, buckets = self.tiers[tier]
+        rollup = self.rollups[tier]
+        start = timestamp - timestamp % length
+        if not rollup or rollup[-1]["start"] != start:
+            if len(rollup) == buckets:
+                oldest = rollup[0]
+                self._roll_up(tier + 1, oldest["start"], oldest["count"],
+                              {field: tuple(stats) for field, stats in oldest["fields"].items()
+                               if stats[1] is not None})
+            rollup.append(_new_bucket(start, self.numeric_fields))
+        _merge_into(rollup[-1], count, values)
+
+    def _raw_items(self):
+        """Return the raw entries as (timestamp, entry) pairs, oldest first."""
+        return self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return (entry for _, entry in self.entries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        return self.entries[index][1]
+
+    def __bool__(self):
+        return bool(self.entries)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(len={len(self)}, total_appended={self.total_appended})"
+
+    def timestamps(self):
+        """Return the timestamps of the raw entries as an array."""
+        return np.fromiter((timestamp for timestamp, _ in self.entries), dtype=np.float64, count=len(self.entries))
+
+    def field_values(self, field):
+        """Return the values of a numeric field for the raw entries that have it."""
+        return np.array([entry[field] for entry in self if isinstance(entry, dict) and field in entry],
+                        dtype=np.float64)
+
+    def series(self, field=None, resolution=None, since=None):
+        """
+        Return the history of the channel as (bucket start, count, mean of field) tuples.
+
+        Raw entries and all rollup tiers are merged, oldest first. Buckets are at least
+        `resolution` seconds long (the finest tier length by default); tiers that are
+        coarser than the requested resolution keep their own bucket length.
+
+        :param field: Numeric field to average, or None to only count entries.
+        :param resolution: Bucket length in seconds.
+        :param since: Only include buckets starting at or after this timestamp.
+        """
+        resolution = resolution or (self.tiers[0][0] if self.tiers else 60)
+        merged = {}
+
+        def add(start, count, total):
+            start = start - start % resolution
+            if since is not None and start < since - since % resolution:
+                return
+            bucket = merged.setdefault(start, [0, 0.0, 0])
+            bucket[0] += count
+            if total is not None:
+                bucket[1] += total[0]
+                bucket[2] += total[1]
+
+        for rollup in reversed(self.rollups):
+            for bucket in rollup:
+                stats = bucket["fields"].get(field) if field else None
+                with_values = stats is not None and stats[1] is not None
+                add(bucket["start"], bucket["count"], (stats[0], bucket["count"]) if with_values else None)
+        for timestamp, entry in self._raw_items():
+            value = self._field_stats(entry).get(field) if field else None
+            add(timestamp, 1, (value[0], 1) if value else None)
+
+        return [(start, count, total / valued if valued else None)
+                for start, (count, total, valued) in sorted(merged.items())]
+
+    def count_since(self, since):
+        """Return the number of entries recorded at or after a timestamp (at bucket granularity)."""
+        return sum(count for _, count, _ in self.series(since=since))
+
+    def to_dict(self):
+        """Return a JSON-serializable representation of the channel."""
+        return {
+            "capacity": self.capacity,
+            "numeric_fields": list(self.numeric_fields),
+            "tiers": [list(tier) for tier in self.tiers],
+            "total_appended": self.total_appended,
+            "entries": [[timestamp, entry] for timestamp, entry in self._raw_items()],
+            "rollups": [list(rollup) for rollup in self.rollups]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a channel saved with to_dict."""
+        channel = cls(data["capacity"], data["numeric_fields"], data["tiers"])
+        channel._load(data)
+        return channel
+
+    def _load(self, data):
+        self.total_appended = data["total_appended"]
+        self.entries.extend((timestamp, entry) for timestamp, entry in data["entries"])
+        for rollup, buckets in zip(self.rollups, data["rollups"]):
+            rollup.extend(buckets)
+
+
+class NumericRingChannel(RingMemoryChannel):
+    """
+    Ring memory channel for purely numeric records, backed by NumPy arrays.
+
+    Each entry is a dictionary with a timestamp and the channel's numeric fields; the raw
+    entries live in preallocated arrays instead of Python objects. Fields that are missing
+    or not numeric are stored as NaN and left out of the records, the rollups and
+    field_values, as RingMemoryChannel does; other keys of an entry are not kept.
+    """
+
+    def __init__(self, capacity=1000, numeric_fields=(), tiers=DEFAULT_TIERS):
+        super().__init__(capacity, numeric_fields, tiers)
+        self.entries = None
+        self.timestamp_array = np.zeros(capacity, dtype=np.float64)
+        self.value_array = np.zeros((capacity, len(self.numeric_fields)), dtype=np.float64)
+        self.head = 0  # Index of the oldest entry
+        self.length = 0
+
+    def append(self, entry):
+        timestamp = self._timestamp_of(entry)
+        if self.length == self.capacity:
+            oldest = self._record(self.head)
+            self._roll_up(0, oldest["timestamp"], 1, self._field_stats(oldest))
+            position = self.head
+            self.head = (self.head + 1) % self.capacity
+        else:
+            position = (self.head + self.length) % self.capacity
+            self.length += 1
+        self.timestamp_array[position] = timestamp
+        self.value_array[position] = [self._numeric_value(entry, field) for field in self.numeric_fields]
+        self.total_appended += 1
+
+    @staticmethod
+    def _numeric_value(entry, field):
+        """Return the value of a field of an entry, or NaN when it is missing or not numeric."""
+        value = entry.get(field) if isinstance(entry, dict) else None
+        return value if isinstance(value, (int, float)) else np.nan
+
+    def _positions(self):
+        return (self.head + np.arange(self.length)) % self.capacity
+
+    def _record(self, position):
+        record = {"timestamp": float(self.timestamp_array[position])}
+        record.update((field, value) for field, value in zip(self.numeric_fields, self.value_array[position].tolist())
+                      if value == value)
+        return record
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return (self._record(position) for position in self._positions())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("channel index out of range")
+        return self._record((self.head + index) % self.capacity)
+
+    def __bool__(self):
+        return self.length > 0
+
+    def timestamps(self):
+        return self.timestamp_array[self._positions()]
+
+    def field_values(self, field):
+        if field not in self.numeric_fields:
+            return np.empty(0, dtype=np.float64)
+        values = self.value_array[self._positions(), self.numeric_fields.index(field)]
+        return values[~np.isnan(values)]
+
+    def _raw_items(self):
+        return [(record["timestamp"], record) for record in self]
+
+    def _load(self, data):
+        for rollup, buckets in zip(self.rollups, data["rollups"]):
+            rollup.extend(buckets)
+        for _, entry in data["entries"]:
+            self.append(entry)
+        self.total_appended = data["total_appended"]
+
+# Example of a bounded channel keeping long-term trends
+if __name__ == "__main__":
+    channel = NumericRingChannel(capacity=100, numeric_fields=("new_score",))
+    start = time.time() - 3 * 3600
+    for i in range(10000):
+        channel.append({"timestamp": start + i, "new_score": (i % 600) / 600})
+
+    print(f"Raw entries kept: {len(channel)} of {channel.total_appended}")
+    for bucket_start, count, mean in channel.series("new_score", resolution=3600):
+        print(f"{time.ctime(bucket_start)}: {count} entries, mean score {mean:.3f}")
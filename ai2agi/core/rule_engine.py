@@ -0,0 +1,250 @@
+import os
+import json
+import math
+import bisect
+import numbers
+import threading
+import numpy as np
+
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "settings", "decision_rules.json")
+
+NUMERIC_OPERATORS = {
+    "gt": lambda value, bound: value > bound,
+    "gte": lambda value, bound: value >= bound,
+    "lt": lambda value, bound: value < bound,
+    "lte": lambda value, bound: value <= bound
+}
+CATEGORICAL_OPERATORS = ("eq", "in")
+
+_compiled_tables = {}  # (rules file, table name) -> (file modification stamp, DecisionTable)
+_compiled_tables_lock = threading.Lock()
+
+
+class _NumericField:
+    """Sorted boundaries of one numeric field, with the bitset of matching rules per interval."""
+
+    def __init__(self, name, conditions, unconditioned):
+        """
+        :param conditions: {rule index: {operator: bound}} for the rules that test this field.
+        :param unconditioned: Bitset of the rules that do not test this field.
+        """
+        self.name = name
+        self.points = sorted({bound for condition in conditions.values() for bound in condition.values()})
+        # Regions: (-inf, p0), [p0], (p0, p1), [p1], ..., (pk, +inf), then "missing"
+        samples = []
+        for i, point in enumerate(self.points):
+            lower = self.points[i - 1] if i else point - 1
+            samples.extend([(lower + point) / 2, point])
+        samples.append(self.points[-1] + 1 if self.points else 0)
+        self.bitsets = []
+        for sample in samples:
+            bits = unconditioned
+            for rule, condition in conditions.items():
+                if all(NUMERIC_OPERATORS[op](sample, bound) for op, bound in condition.items()):
+                    bits |= 1 << rule
+            self.bitsets.append(bits)
+        self.bitsets.append(unconditioned)  # Missing value
+
+    def region(self, value):
+        if not isinstance(value, numbers.Real) or math.isnan(value):
+            return len(self.bitsets) - 1
+        i = bisect.bisect_left(self.points, value)
+        return 2 * i + 1 if i < len(self.points) and self.points[i] == value else 2 * i
+
+    def lookup(self, value):
+        return self.bitsets[self.region(value)]
+
+    def regions(self, values):
+        """Vectorized region lookup for an array of values."""
+        values = np.asarray(values, dtype=np.float64)
+        points = np.asarray(self.points, dtype=np.float64)
+        i = np.searchsorted(points, values, side="left")
+        exact = np.zeros(len(values), dtype=bool)
+        inside = i < len(points)
+        exact[inside] = points[i[inside]] == values[inside]
+        regions = 2 * i + exact
+        regions[np.isnan(values)] = len(self.bitsets) - 1
+        return regions
+
+
+class _CategoricalField:
+    """Hash lookup from the values of one categorical field to the bitset of matching rules."""
+
+    def __init__(self, name, conditions, unconditioned):
+        self.name = name
+        self.values = {}
+        for rule, condition in conditions.items():
+            accepted = [condition["eq"]] if "eq" in condition else condition["in"]
+            for value in accepted:
+                self.values[value] = self.values.get(value, unconditioned) | 1 << rule
+        self.keys = list(self.values)
+        self.bitsets = [self.values[key] for key in self.keys] + [unconditioned]  # Last: any other value
+
+    def lookup(self, value):
+        try:
+            return self.values.get(value, self.bitsets[-1])
+        except TypeError:  # Unhashable value
+            return self.bitsets[-1]
+
+    def regions(self, values):
+        index = {key: i for i, key in enumerate(self.keys)}
+        other = len(self.keys)
+
+        def region(value):
+            try:
+                return index.get(value, other)
+            except TypeError:  # Unhashable value
+                return other
+
+        values = values.tolist() if isinstance(values, np.ndarray) else values
+        return np.fromiter(map(region, values), dtype=np.int64, count=len(values))
+
+
+class DecisionTable:
+    """
+    Declarative decision table compiled into a fast evaluator.
+
+    Each rule has an action, an optional group and conditions on fields of a reading
+    (numeric operators gt/gte/lt/lte, categorical operators eq/in). Conditions are compiled
+    once: numeric fields into sorted boundaries and categorical fields into hash maps, both
+    pointing to the bitset of rules that match in that interval or for that value. A
+    reading is evaluated by intersecting one bitset per field, so the cost depends on the
+    number of fields and not on the number of rules. Within a group only the first matching
+    rule fires (like an if/elif chain); groups are reported in the order they appear.
+    Turning the matched bitset into actions only visits the matching rules.
+
+    A compiled table is never modified, so one instance can be shared; from_file() returns
+    the same instance until the rules file changes.
+    """
+
+    def __init__(self, rules, default=None):
+        """
+        :param rules: List of {"action": ..., "group": ..., "when": {field: {operator: value}}}.
+        :param default: Actions returned when no rule matches.
+        """
+        self.rules = rules
+        self.default = list(default or [])
+        self.actions = [rule["action"] for rule in rules]
+        self.groups = []
+        group_masks = {}
+        for index, rule in enumerate(rules):
+            group = rule.get("group", f"rule_{index}")
+            if group not in group_masks:
+                self.groups.append(group)
+                group_masks[group] = 0
+            group_masks[group] |= 1 << index
+        self.group_masks = [group_masks[group] for group in self.groups]
+        group_index = {group: i for i, group in enumerate(self.groups)}
+        self.rule_groups = [group_index[rule.get("group", f"rule_{index}")] for index, rule in enumerate(rules)]
+        self.all_rules = (1 << len(rules)) - 1
+        self.fields = self._compile_fields()
+        # Same bitsets as arrays of 64-bit words, for batch evaluation
+        self.words = max(1, (len(rules) + 63) // 64)
+        self.all_rules_words = self._word_table([self.all_rules])[0]
+        self.field_tables = [self._word_table(field.bitsets) for field in self.fields]
+
+    def _compile_fields(self):
+        conditions = {}
+        for index, rule in enumerate(self.rules):
+            for field, condition in rule.get("when", {}).items():
+                conditions.setdefault(field, {})[index] = condition
+        fields = []
+        for field, by_rule in conditions.items():
+            operators = {op for condition in by_rule.values() for op in condition}
+            unconditioned = self.all_rules & ~sum(1 << rule for rule in by_rule)
+            if operators <= set(NUMERIC_OPERATORS):
+                fields.append(_NumericField(field, by_rule, unconditioned))
+            elif operators <= set(CATEGORICAL_OPERATORS):
+                fields.append(_CategoricalField(field, by_rule, unconditioned))
+            else:
+                raise ValueError(f"Field '{field}' mixes or uses unknown operators: {sorted(operators)}")
+        return fields
+
+    @classmethod
+    def from_file(cls, table_name, file_path=DEFAULT_RULES_FILE):
+        """
+        Load one named table from a JSON rules file.
+
+        Compiled tables are cached per file and table name, and recompiled only when the
+        file's modification time or size changes.
+        """
+        key = (os.path.abspath(file_path), table_name)
+        status = os.stat(file_path)
+        stamp = (status.st_mtime_ns, status.st_size)
+        with _compiled_tables_lock:
+            cached = _compiled_tables.get(key)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+        with open(file_path, "r", encoding="utf-8") as f:
+            table = json.load(f)[table_name]
+        compiled = cls(table["rules"], table.get("default"))
+        with _compiled_tables_lock:
+            _compiled_tables[key] = (stamp, compiled)
+        return compiled
+
+    def actions_for(self, matched):
+        """
+        Turn a bitset of matching rules into the list of actions (first rule per group).
+
+        Only the matching rules are visited, lowest first, so the cost depends on the number
+        of matches and not on the number of rules or groups.
+        """
+        fired = {}  # Group index -> action of its first matching rule
+        while matched:
+            lowest = matched & -matched
+            rule = lowest.bit_length() - 1
+            group = self.rule_groups[rule]
+            fired[group] = self.actions[rule]
+            matched &= ~self.group_masks[group]  # Later rules of a group that fired are skipped
+        if not fired:
+            return list(self.default)
+        return [fired[group] for group in sorted(fired)]
+
+    def match(self, reading):
+        """Return the bitset of rules matching a reading."""
+        matched = self.all_rules
+        for field in self.fields:
+            matched &= field.lookup(reading[field.name]) if field.name in reading else field.bitsets[-1]
+        return matched
+
+    def evaluate(self, reading):
+        """
+        Evaluate one reading.
+
+        :param reading: Dictionary of field values; missing fields match no condition.
+        :return: The list of actions.
+        """
+        return self.actions_for(self.match(reading))
+
+    def _word_table(self, bitsets):
+        """Split Python-int bitsets into an array of 64-bit words."""
+        table = np.zeros((len(bitsets), self.words), dtype=np.uint64)
+        for row, bits in enumerate(bitsets):
+            for word in range(self.words):
+                table[row, word] = (bits >> (64 * word)) & 0xFFFFFFFFFFFFFFFF
+        return table
+
+    def evaluate_batch(self, columns):
+        """
+        Evaluate many readings given as columns.
+
+        :param columns: Dict of equally long arrays/lists; missing columns match no condition.
+        :return: One list of actions per row.
+        """
+        size = len(next(iter(columns.values()))) if columns else 0
+        matched = np.tile(self.all_rules_words, (size, 1))
+        for field, table in zip(self.fields, self.field_tables):
+            if field.name in columns:
+                matched &= table[field.regions(columns[field.name])]
+            else:
+                matched &= table[-1]
+        patterns, inverse = np.unique(matched, axis=0, return_inverse=True)
+        decoded = [self.actions_for(sum(int(word) << (64 * i) for i, word in enumerate(pattern)))
+                   for pattern in patterns]
+        return [list(decoded[code]) for code in inverse.reshape(-1).tolist()]
+
+# Example of evaluating readings against the shipped decision tables
+if __name__ == "__main__":
+    table = DecisionTable.from_file("environment_actions")
+    print(table.evaluate({"temperature": 35, "light": "medium", "humidity": 85}))
+    print(table.evaluate_batch({"temperature": [10, 22], "light": ["low", "high"], "humidity": [50, 10]}))
@@ -0,0 +1,202 @@
+import os
+import time
+import queue
+import asyncio
+import hashlib
+import multiprocessing
+from urllib.parse import urlsplit
+from core.web_spiders import WebSpider
+from core.url_index import canonicalize_url
+
+
+def shard_for_url(url, shards):
+    """Return the shard owning a URL; all URLs of one host belong to the same shard."""
+    host = urlsplit(url).netloc.encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(host, digest_size=8).digest(), "little") % shards
+
+
+def _shard_path(file_path, index):
+    if file_path is None:
+        return None
+    root, extension = os.path.splitext(file_path)
+    return f"{root}.{index}{extension}"
+
+
+class ShardSpider(WebSpider):
+    """
+    WebSpider owning one shard of a host-partitioned crawl.
+
+    Links to hosts owned by other shards are batched and sent to the owner's inbox, and links
+    received from other shards join the local frontier, so each host is fetched (and kept
+    polite) by one process only. A counter shared by all shards holds the number of URLs
+    queued, in transit or being fetched anywhere; the crawl ends when it drops to zero.
+    """
+
+    def __init__(self, base_url, index, inboxes, outstanding, poll_interval=0.02, **options):
+        """
+        :param index: Index of the shard owned by this spider.
+        :param inboxes: One multiprocessing queue of (url, depth) batches per shard.
+        :param outstanding: Shared multiprocessing.Value counting the outstanding URLs.
+        :param poll_interval: Seconds between two looks at the inbox while idle.
+        """
+        super().__init__(base_url, **options)
+        self.index = index
+        self.inboxes = inboxes
+        self.outstanding = outstanding
+        self.poll_interval = poll_interval
+        self.outbox = [[] for _ in inboxes]
+        self.outstanding_delta = 0  # Change of the outstanding count not yet applied to the shared counter
+        self.links_sent = 0
+        self.links_received = 0
+
+    def enqueue(self, url, depth):
+        owner = shard_for_url(url, len(self.inboxes))
+        if owner != self.index:
+            self.outbox[owner].append((url, depth))
+            self.outstanding_delta += 1
+        elif self.visited_urls.add(url):
+            self._push(url, depth)
+            self.outstanding_delta += 1
+
+    async def _visit(self, url, depth, executor):
+        await super()._visit(url, depth, executor)
+        self.outstanding_delta -= 1  # Applied together with the links of the page
+
+    def exchange_links(self):
+        # The shared counter is raised before a batch is sent, so it cannot reach zero while
+        # the batch is in transit
+        if self.outstanding_delta:
+            with self.outstanding.get_lock():
+                self.outstanding.value += self.outstanding_delta
+            self.outstanding_delta = 0
+        for owner, batch in enumerate(self.outbox):
+            if batch:
+                self.inboxes[owner].put(batch)
+                self.links_sent += len(batch)
+                self.outbox[owner] = []
+
+        inbox = self.inboxes[self.index]
+        while True:
+            try:
+                batch = inbox.get_nowait()
+            except queue.Empty:
+                break
+            self.links_received += len(batch)
+            for url, depth in batch:
+                if self.visited_urls.add(url):
+                    self._push(url, depth)
+                else:
+                    self.outstanding_delta -= 1  # Already seen by this shard
+
+    async def wait_for_links(self):
+        while True:
+            self.exchange_links()
+            if self.frontier:
+                return True
+            if not self.outstanding_delta and self.outstanding.value == 0:
+                return False
+            await asyncio.sleep(self.poll_interval)
+
+
+def run_crawl_shard(base_url, index, inboxes, outstanding, results, depth, options):
+    """
+    Crawl one shard inside a worker process and report its results.
+
+    :param results: Queue receiving (shard index, statistics, records kept in memory).
+    """
+    spider = ShardSpider(base_url, index, inboxes, outstanding, **options)
+    try:
+        spider.crawl(None, depth)
+    finally:
+        spider.close()
+    stats = {
+        "pages_fetched": spider.pages_fetched,
+        "pages_not_modified": spider.pages_not_modified,
+        "pages_duplicate": spider.pages_duplicate,
+        "links_sent": spider.links_sent,
+        "links_received": spider.links_received
+    }
+    results.put((index, stats, spider.data))
+
+
+class ShardedCrawler:
+    """
+    Crawls with several WebSpider processes, URLs being hash-partitioned by host.
+
+    Each worker process owns the frontier, visited index, politeness state (and, when
+    configured, output file and fetch cache) of its hosts, so HTML parsing scales with the
+    number of cores while every host is still crawled by a single owner. Output, cache and
+    other file options get the shard index inserted before their extension.
+    """
+
+    def __init__(self, base_url, workers=None, **spider_options):
+        """
+        :param base_url: The URL to begin scraping data from.
+        :param workers: Number of worker processes (number of cores when None).
+        :param spider_options: Options passed to every shard's WebSpider.
+        """
+        if spider_options.get("checkpoint_path"):
+            raise ValueError("Checkpoints are not supported by the sharded crawl")
+        self.base_url = base_url
+        self.workers = workers or os.cpu_count() or 1
+        self.spider_options = spider_options
+        self.data = []  # Records of all shards (when no output file is used)
+        self.shard_stats = {}
+
+    def _options_for(self, index):
+        options = dict(self.spider_options)
+        for key in ("output_path", "cache_path"):
+            options[key] = _shard_path(options.get(key), index)
+        return options
+
+    def crawl(self, url, depth=2):
+        """
+        Crawl from the given URL with all worker processes and wait for the end of the crawl.
+
+        :param url: The URL to start scraping.
+        :param depth: The depth of the crawl (how many levels deep you want to go).
+        :return: Number of pages fetched.
+        """
+        start_time = time.time()
+        url = canonicalize_url(url, self.base_url)
+        if url is None or depth <= 0:
+            return 0
+        inboxes = [multiprocessing.Queue() for _ in range(self.workers)]
+        results = multiprocessing.Queue()
+        outstanding = multiprocessing.Value("q", 1)  # The seed
+        inboxes[shard_for_url(url, self.workers)].put([(url, depth)])
+
+        processes = [multiprocessing.Process(target=run_crawl_shard, daemon=True,
+                                             args=(self.base_url, index, inboxes, outstanding, results,
+                                                   depth, self._options_for(index)))
+                     for index in range(self.workers)]
+        for process in processes:
+            process.start()
+        reported = 0
+        while reported < len(processes):
+            try:
+                index, stats, data = results.get(timeout=1.0)
+            except queue.Empty:
+                failed = [process for process in processes if process.exitcode not in (None, 0)]
+                if failed or all(process.exitcode is not None for process in processes):
+                    for process in processes:
+                        process.terminate()
+                    raise RuntimeError(f"{len(processes) - reported} crawl shard(s) exited without results")
+                continue
+            self.shard_stats[index] = stats
+            self.data.extend(data)
+            reported += 1
+        for process in processes:
+            process.join()
+
+        fetched = sum(stats["pages_fetched"] for stats in self.shard_stats.values())
+        elapsed = time.time() - start_time
+        print(f"Sharded crawl: {fetched} pages by {self.workers} shards in {elapsed:.2f} seconds "
+              f"({fetched / max(elapsed, 1e-9):.1f} pages/s).")
+        return fetched
+
+# Example of a crawl spread over all cores
+if __name__ == "__main__":
+    base_url = "https://example.com"  # Replace this with the URL you want to scrape
+    crawler = ShardedCrawler(base_url, verbose=False, output_path="scraped_data.jsonl")
+    crawler.crawl(base_url, depth=2)
@@ -0,0 +1,262 @@
+import os
+import copy
+import json
+import time
+import threading
+
+
+def apply_delta(state, op):
+    """
+    Apply one delta operation to a state and return the new state.
+
+    Operations are lists of the form [kind, path, value] where kind is "set", "append",
+    "delete" or "shift" (drop the first `value` items of a list) and path is the list of keys
+    leading to the changed value ([] is the whole state).
+    """
+    kind, path, value = op
+    if not path:
+        return copy.deepcopy(value)
+    parent = state
+    for key in path[:-1]:
+        parent = parent[key]
+    key = path[-1]
+    if kind == "set":
+        parent[key] = copy.deepcopy(value)
+    elif kind == "append":
+        parent[key].extend(copy.deepcopy(value))
+    elif kind == "delete":
+        del parent[key]
+    elif kind == "shift":
+        del parent[key][:value]
+    return state
+
+
+def diff_state(old, new, path=None, ops=None):
+    """
+    Compute the delta operations that turn `old` into `new`.
+
+    Dictionaries are compared key by key. Lists are aligned on their first common item, so a
+    list that grew at the end produces an "append" with the new items and a bounded list that
+    also dropped old items produces a "shift" first; an update costs roughly the size of what
+    changed.
+
+    :return: The list of delta operations.
+    """
+    path = path or []
+    ops = [] if ops is None else ops
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append(["delete", path + [key], None])
+        for key, value in new.items():
+            if key in old:
+                diff_state(old[key], value, path + [key], ops)
+            else:
+                ops.append(["set", path + [key], value])
+    elif isinstance(old, list) and isinstance(new, list):
+        shift = _list_shift(old, new)
+        if shift is None:
+            ops.append(["set", path, new])
+        else:
+            if shift:
+                ops.append(["shift", path, shift])
+            overlap = len(old) - shift
+            for index in range(overlap):
+                diff_state(old[shift + index], new[index], path + [index], ops)
+            if len(new) > overlap:
+                ops.append(["append", path, new[overlap:]])
+    elif type(old) is not type(new) or old != new:
+        ops.append(["set", path, new])
+    return ops
+
+
+def _list_shift(old, new):
+    """
+    Return how many items were dropped from the front of `old` to get the start of `new`,
+    or None when the lists cannot be aligned that way. Lists that did not shrink fall back
+    to an item-by-item comparison (shift 0).
+    """
+    for shift in range(len(old)):
+        if len(old) - shift <= len(new) and old[shift] == new[0]:
+            return shift
+    return 0 if len(old) <= len(new) else None
+
+
+class StateJournal:
+    """
+    Journaled persistence for cell state.
+
+    Each save appends a small delta record (the changes since the previous save) to an
+    append-only journal instead of rewriting the whole state. When the journal grows past
+    `compact_threshold` records, a background thread folds it into the base snapshot.
+    Restoring reads the base snapshot and replays the journal on top of it; a new journal
+    does so when it is opened, so its first save continues the existing sequence.
+    """
+
+    def __init__(self, base_path="mother_cell_state.json", journal_path="mother_cell_state.journal",
+                 compact_threshold=1000, fsync=False):
+        """
+        :param base_path: File holding the compacted base snapshot.
+        :param journal_path: Append-only file holding the delta records.
+        :param compact_threshold: Number of journal records that triggers a background compaction.
+        :param fsync: Whether to fsync the journal after each record.
+        """
+        self.base_path = base_path
+        self.journal_path = journal_path
+        self.pending_path = journal_path + ".compacting"  # Journal segment being folded into the base
+        self.compact_threshold = compact_threshold
+        self.fsync = fsync
+        self.shadow = None  # Copy of the last saved state, used to compute deltas
+        self.seq = 0
+        self.records_since_compaction = 0
+        self.journal_file = None
+        self.compactor = None
+        self.lock = threading.Lock()
+        self.compact_lock = threading.Lock()
+        self.load()  # Recover the sequence number and the last saved state
+
+    def _read_base(self):
+        """Return (sequence number, state) of the base snapshot."""
+        if not os.path.exists(self.base_path):
+            return 0, None
+        with open(self.base_path, "r") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and "journal_seq" in data:
+            return data["journal_seq"], data["state"]
+        return 0, data  # Plain snapshot written without a journal
+
+    def _read_records(self, path):
+        """Yield the delta records of a journal file, ignoring a torn last line."""
+        if not os.path.exists(path):
+            return
+        with open(path, "r") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    break
+
+    def _replay(self, seq, state, paths):
+        """Apply the records of the given journal files that are newer than `seq`."""
+        for path in paths:
+            for record in self._read_records(path):
+                if record["seq"] <= seq:
+                    continue
+                for op in record["ops"]:
+                    state = apply_delta(state, op)
+                seq = record["seq"]
+        return seq, state
+
+    def load(self):
+        """
+        Restore the state from the base snapshot and the journal.
+
+        :return: The restored state, or None if nothing was saved yet.
+        """
+        with self.compact_lock, self.lock:
+            seq, state = self._read_base()
+            seq, state = self._replay(seq, state, [self.pending_path, self.journal_path])
+            self.seq = seq
+            self.shadow = copy.deepcopy(state)
+            return state
+
+    def save(self, state, dirty=None):
+        """
+        Append the changes since the previous save to the journal.
+
+        :param state: The JSON-serializable state.
+        :param dirty: Paths (lists of keys) of the only parts of the state that may have changed
+            since the previous save, or None to compare the whole state. Only these parts of
+            `state` are read, so a save costs the size of the dirty parts and `state` may omit
+            the others. Ignored for the first save, which writes the whole state.
+        :return: The number of delta operations written.
+        """
+        with self.lock:
+            if self.shadow is None:
+                ops = [["set", [], state]]
+            elif dirty is None:
+                ops = diff_state(self.shadow, state)
+            else:
+                ops = []
+                for path in dirty:
+                    self._diff_path(state, list(path), ops)
+            if not ops:
+                return 0
+            self.seq += 1
+            record = {"seq": self.seq, "timestamp": time.time(), "ops": ops}
+            if self.journal_file is None:
+                self.journal_file = open(self.journal_path, "a")
+            self.journal_file.write(json.dumps(record) + "\n")
+            self.journal_file.flush()
+            if self.fsync:
+                os.fsync(self.journal_file.fileno())
+            for op in ops:
+                self.shadow = apply_delta(self.shadow, op)
+            self.records_since_compaction += 1
+            due = self.records_since_compaction >= self.compact_threshold
+        if due and (self.compactor is None or not self.compactor.is_alive()):
+            self.compactor = threading.Thread(target=self.compact, daemon=True)
+            self.compactor.start()
+        return len(ops)
+
+    def _diff_path(self, state, path, ops):
+        """Append the delta operations of the part of the state at `path` to `ops`."""
+        old, new = self.shadow, state
+        for key in path[:-1]:
+            old, new = old[key], new[key]
+        key = path[-1]
+        if key not in new:
+            if key in old:
+                ops.append(["delete", path, None])
+        elif key not in old:
+            ops.append(["set", path, new[key]])
+        else:
+            diff_state(old[key], new[key], path, ops)
+
+    def compact(self):
+        """Fold the journal into a new base snapshot."""
+        if not self.compact_lock.acquire(blocking=False):
+            return  # Another compaction is already running
+        try:
+            with self.lock:
+                if not os.path.exists(self.pending_path) and os.path.exists(self.journal_path):
+                    if self.journal_file is not None:
+                        self.journal_file.close()
+                        self.journal_file = None
+                    os.replace(self.journal_path, self.pending_path)
+                self.records_since_compaction = 0
+
+            seq, state = self._read_base()
+            seq, state = self._replay(seq, state, [self.pending_path])
+            temp_path = self.base_path + ".tmp"
+            with open(temp_path, "w") as f:
+                json.dump({"journal_seq": seq, "state": state}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.base_path)
+            if os.path.exists(self.pending_path):
+                os.remove(self.pending_path)
+        finally:
+            self.compact_lock.release()
+
+    def close(self):
+        """Wait for a running compaction and close the journal file."""
+        if self.compactor is not None:
+            self.compactor.join()
+        with self.lock:
+            if self.journal_file is not None:
+                self.journal_file.close()
+                self.journal_file = None
+
+# Example of journaling a growing state
+if __name__ == "__main__":
+    journal = StateJournal("example_state.json", "example_state.journal", compact_threshold=50)
+    state = {"energy_level": 1.0, "memory": {"evolution_record": []}}
+    for step in range(120):
+        state["energy_level"] = round(1.0 - step * 0.001, 3)
+        state["memory"]["evolution_record"].append({"timestamp": time.time(), "new_score": step})
+        journal.save(state)
+    journal.close()
+
+    restored = StateJournal("example_state.json", "example_state.journal").load()
+    print(f"Restored state matches: {restored == state}")
@@ -1,15 +1,32 @@
 import random
 import time
 import json
+from core.ring_memory import RingMemoryChannel
+from core.trend_counters import BehaviorTrend
+from core.pattern_mining import FrequentPatternMiner
 
 class Subconscious:
-    def __init__(self):
+    def __init__(self, retention=1000, trend_window=3600, positive_threshold=5, pattern_capacity=1000):
         """
         Initialize the Subconscious mind layer which governs the hidden or unconscious processes.
+
+        Each tracked behavior costs at most `retention` raw entries plus a BehaviorTrend of about
+        24 KB (1500 int64 slot/count pairs: one minute of seconds and one day of minutes); older
+        entries are dropped, since the trend counters already hold their counts.
+
+        :param retention: Number of raw entries kept per behavior.
+        :param trend_window: Seconds of history a behavior trend is judged on.
+        :param positive_threshold: A behavior seen more often than this within the window is "Positive".
+        :param pattern_capacity: Number of trigger/behavior pairs and sequences the pattern miner monitors.
         """
         self.underlying_patterns = {}  # Hidden patterns and behaviors tracked by subconscious
         self.emotional_triggers = {}  # Emotional triggers that influence subconscious actions
-        self.subconscious_data = {}  # Data that represents subconscious activities
+        self.subconscious_data = {}  # Behavior -> bounded channel of its most recent entries
+        self.behavior_trends = {}  # Behavior -> constant-size window counters and decayed rates
+        self.retention = retention
+        self.trend_window = trend_window
+        self.positive_threshold = positive_threshold
+        self.pattern_miner = FrequentPatternMiner(capacity=pattern_capacity)  # Frequent pairs and sequences
     
     def record_subconscious_behavior(self, behavior, trigger=None):
         """
@@ -23,37 +40,85 @@ class Subconscious:
         }
         
         if behavior not in self.subconscious_data:
-            self.subconscious_data[behavior] = []
+            self.subconscious_data[behavior] = RingMemoryChannel(capacity=self.retention, tiers=())
+            self.behavior_trends[behavior] = BehaviorTrend()
         
         self.subconscious_data[behavior].append(subconscious_entry)
+        self.behavior_trends[behavior].add(timestamp)
+        self.pattern_miner.observe(behavior, trigger)
         
         print(f"Subconscious behavior recorded: {behavior} (Triggered by: {trigger})")
     
     def process_hidden_patterns(self):
         """
         Process the hidden patterns or behaviors that have been recorded and identify any unconscious trends.
+        The cost depends on the number of behaviors, not on how many entries were recorded.
         """
         print("Processing hidden patterns and behaviors...")
         
-        for behavior, entries in self.subconscious_data.items():
+        now = time.time()
+        for behavior, trend_counters in self.behavior_trends.items():
             # Analyze trends in behaviors or unconscious decisions
-            trend = self.analyze_behavior_trend(entries)
-            print(f"Pattern for behavior '{behavior}': {trend}")
+            trend = self.analyze_behavior_trend(behavior, now)
+            print(f"Pattern for behavior '{behavior}': {trend} ({trend_counters.direction(now)})")
+        for (trigger, behavior), count in self.pattern_miner.top_pairs(5):
+            print(f"Frequent association: '{trigger}' -> '{behavior}' (~{count} times)")
+        for sequence, count in self.pattern_miner.top_sequences(5):
+            print(f"Frequent sequence: {' -> '.join(sequence)} (~{count} times)")
     
-    def analyze_behavior_trend(self, entries):
+    def analyze_behavior_trend(self, behavior, now=None):
         """
-        Analyze the trend of a specific subconscious behavior based on historical entries.
+        Analyze the trend of a specific subconscious behavior from its window counters.
         This can be expanded to more complex trend analysis.
+
+        :param behavior: Name of a recorded behavior (use analyze_entries_trend for a list of entries).
+        :param now: Time the window ends at (now when None).
         """
-        # For simplicity, we just count the occurrences of the behavior
-        count = len(entries)
-        trend = "Positive" if count > 5 else "Neutral"
+        trend_counters = self.behavior_trends.get(behavior)
+        if trend_counters is None:
+            return "Neutral"
+        # Count the occurrences of the behavior within the trend window
+        count = trend_counters.count_since(self.trend_window, now)
+        trend = "Positive" if count > self.positive_threshold else "Neutral"
         return trend
+
+    def analyze_entries_trend(self, entries):
+        """
+        Analyze the trend of a list (or channel) of behavior entries by counting all of them, as
+        analyze_behavior_trend did before the window counters existed.
+
+        :param entries: The entries of one behavior, e.g. subconscious_data[behavior].
+        """
+        return "Positive" if len(entries) > self.positive_threshold else "Neutral"
+
+    def get_behavior_trend(self, behavior, now=None):
+        """
+        Return the trend statistics of a behavior: occurrences in the last minute/hour/day,
+        short- and long-term decayed rates (per second) and their direction.
+        """
+        trend_counters = self.behavior_trends.get(behavior)
+        if trend_counters is None:
+            return None
+        return dict(trend_counters.summary(now), trend=self.analyze_behavior_trend(behavior, now))
+
+    def count_behavior_since(self, behavior, seconds, now=None):
+        """Return how many times a behavior was recorded in the last `seconds` seconds (up to one day)."""
+        trend_counters = self.behavior_trends.get(behavior)
+        return trend_counters.count_since(seconds, now) if trend_counters is not None else 0
     
-    def trigger_subconscious_action(self, behavior):
+    def trigger_subconscious_action(self, behavior=None, trigger=None):
         """
         Trigger a subconscious action based on a certain behavior or emotional pattern.
+
+        :param behavior: The behavior to act on.
+        :param trigger: When no behavior is given, act on the behavior most associated with this
+            trigger by the pattern miner (no history is rescanned).
         """
+        if behavior is None and trigger is not None:
+            associations = self.pattern_miner.behaviors_for(trigger, k=1)
+            if associations:
+                behavior, count, confidence = associations[0]
+                print(f"Trigger '{trigger}' is associated with behavior '{behavior}' (confidence {confidence:.2f})")
         if behavior in self.subconscious_data:
             print(f"Triggering subconscious action for behavior: {behavior}")
             # Simulate an action triggered by the subconscious
@@ -82,7 +147,7 @@ class Subconscious:
         Save the state of subconscious behaviors and patterns to a JSON file.
         """
         with open(file_path, "w") as file:
-            json.dump(self.subconscious_data, file, indent=4)
+            json.dump({behavior: list(entries) for behavior, entries in self.subconscious_data.items()}, file, indent=4)
         
         print(f"Subconscious state saved to {file_path}")
 
@@ -97,9 +162,11 @@ if __name__ == "__main__":
     
     # Process hidden patterns of behavior
     subconscious.process_hidden_patterns()
+    print(subconscious.get_behavior_trend("stress"))
     
     # Trigger a subconscious action
     subconscious.trigger_subconscious_action("stress")
+    subconscious.trigger_subconscious_action(trigger="meditation")
     
     # Save the subconscious state to a JSON file
     subconscious.save_subconscious_state("C:\\pr\\Free_Knowledge_Perfection\\reports\\subconscious_state.json")
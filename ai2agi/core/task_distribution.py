@@ -1,21 +1,219 @@
+import time
+import heapq
+import itertools
+from collections import deque
+
+
 class TaskDistribution:
-    def __init__(self):
-        self.task_queue = []
+    """
+    Energy- and priority-aware task scheduler for a population of cells.
+
+    Tasks wait in a priority queue (lower number = more urgent). A task only moves to a cell
+    when the cell can take it: each cell holds at most `max_queue_depth` queued tasks, so the
+    rest stay in the priority queue and an urgent task submitted later still overtakes them.
+    Free slots go to the cells with the best score, which grows with the cell's energy level
+    and performance genes and shrinks with its queue depth. Resting or inactive cells and
+    cells without energy get no work, and idle cells steal queued tasks from unavailable or
+    overloaded ones. Throughput and queue latency are tracked for the whole population.
+    """
+
+    def __init__(self, max_queue_depth=1):
+        """
+        :param max_queue_depth: Number of tasks a cell can have queued before it gets more.
+        """
+        self.max_queue_depth = max_queue_depth
+        self.task_queue = []  # Heap of (priority, sequence, task, submit time)
+        self.cell_queues = {}  # cell ID -> deque of (task, submit time)
+        self.cells = {}  # cell ID -> cell
+        self.sequence = itertools.count()
+        self.completed = 0
+        self.stolen = 0
+        self.latencies = deque(maxlen=10000)  # Recent queue latencies in seconds
+        self.start_time = time.monotonic()
+
+    @staticmethod
+    def is_available(cell):
+        """Return True if a cell can currently receive work."""
+        return getattr(cell, "status", "active") == "active" and cell.energy_level > 0
+
+    @staticmethod
+    def performance_of(cell):
+        chromosomes = getattr(cell, "chromosomes", None)
+        return chromosomes["performance_genes"] if chromosomes else 1.0
+
+    def score(self, cell):
+        """Score of a cell for new work: energy and performance, divided by the queue depth."""
+        depth = len(self.cell_queues.get(cell.id, ()))
+        return cell.energy_level * self.performance_of(cell) / (1 + depth)
+
+    def submit_task(self, task, priority=1):
+        """
+        Add a task to the global priority queue.
+
+        :param task: The task to schedule.
+        :param priority: Lower values are scheduled first.
+        """
+        heapq.heappush(self.task_queue, (priority, next(self.sequence), task, time.monotonic()))
+
+    def add_cells(self, cells):
+        for cell in cells:
+            self.cells[cell.id] = cell
+            self.cell_queues.setdefault(cell.id, deque())
 
     def assign_task_to_cell(self, cell, task):
-        """Assign a task to a specific cell."""
-        cell.assign_task(task)
+        """Assign a task to a specific cell right away, bypassing the scheduler queues."""
+        self.add_cells([cell])
+        if hasattr(cell, "assign_task"):
+            cell.assign_task(task)
+        else:
+            cell.execute_task(task)
         print(f"Task '{task}' assigned to {cell.id}.")
 
-    def distribute_tasks(self, cells, tasks):
-        """Distribute tasks to a list of cells."""
-        for i, cell in enumerate(cells):
-            task = tasks[i % len(tasks)]  # Distribute tasks cyclically
-            self.assign_task_to_cell(cell, task)
+    def queue_task_for_cell(self, cell, task, submit_time=None):
+        """Queue a task for a specific cell; it reaches the cell when run_step() executes it."""
+        self.add_cells([cell])
+        self.cell_queues[cell.id].append((task, time.monotonic() if submit_time is None else submit_time))
+
+    def _free_cells(self, cells=None):
+        """Heap of (-score, cell ID) of the available cells that can take another task."""
+        cells = self.cells.values() if cells is None else cells
+        candidates = [(-self.score(cell), cell.id) for cell in cells
+                      if self.is_available(cell) and len(self.cell_queues[cell.id]) < self.max_queue_depth]
+        heapq.heapify(candidates)
+        return candidates
+
+    def schedule(self):
+        """
+        Move the most urgent tasks into the free queue slots of the best-scoring available
+        cells; tasks beyond the free slots stay in the priority queue.
+
+        :return: Number of tasks assigned.
+        """
+        candidates = self._free_cells()
+        assigned = 0
+        while self.task_queue and candidates:
+            _, cell_id = heapq.heappop(candidates)
+            _, _, task, submit_time = heapq.heappop(self.task_queue)
+            cell = self.cells[cell_id]
+            self.queue_task_for_cell(cell, task, submit_time)
+            if len(self.cell_queues[cell_id]) < self.max_queue_depth:
+                heapq.heappush(candidates, (-self.score(cell), cell_id))
+            assigned += 1
+        return assigned
+
+    def distribute_tasks(self, cells, tasks, priority=1):
+        """
+        Distribute tasks to a list of cells according to their energy, genes and load.
+
+        Every available cell with a free queue slot, best score first, is handed the most
+        urgent pending task right away (as assign_task_to_cell() does); the remaining tasks
+        wait in the priority queue for run_step().
+
+        :param cells: The cells that can receive the tasks.
+        :param tasks: The tasks to distribute.
+        :param priority: Priority of the tasks (lower values first).
+        :return: Number of tasks handed to cells.
+        """
+        self.add_cells(cells)
+        for task in tasks:
+            self.submit_task(task, priority)
+        candidates = self._free_cells(cells)
+        delivered = 0
+        while self.task_queue and candidates:
+            _, cell_id = heapq.heappop(candidates)
+            _, _, task, submit_time = heapq.heappop(self.task_queue)
+            self.latencies.append(time.monotonic() - submit_time)
+            self.assign_task_to_cell(self.cells[cell_id], task)
+            delivered += 1
+        return delivered
+
+    def steal_work(self):
+        """
+        Let idle available cells take queued tasks from the tail of the longest queues.
+        Tasks queued on cells that became unavailable are stolen first.
+
+        :return: Number of tasks stolen.
+        """
+        idle = [cell for cell_id, cell in self.cells.items()
+                if self.is_available(cell) and not self.cell_queues[cell_id]]
+        if not idle:
+            return 0
+        # Unavailable cells are robbed first, then the longest queues
+        victims = [(self.is_available(self.cells[cell_id]), -len(queue), cell_id)
+                   for cell_id, queue in self.cell_queues.items() if queue]
+        heapq.heapify(victims)
+        stolen = 0
+        for thief in sorted(idle, key=self.score, reverse=True):
+            while victims:
+                victim_available, _, victim_id = heapq.heappop(victims)
+                queue = self.cell_queues[victim_id]
+                spare = len(queue) - (1 if victim_available else 0)
+                if spare > 0:
+                    self.cell_queues[thief.id].append(queue.pop())
+                    stolen += 1
+                    if spare > 1:
+                        heapq.heappush(victims, (victim_available, -len(queue), victim_id))
+                    break
+        self.stolen += stolen
+        return stolen
+
+    def execute(self, cell, task):
+        """Run one task on a cell."""
+        if hasattr(cell, "perform_task"):
+            cell.assign_task(task)
+            cell.perform_task()
+        else:
+            cell.execute_task(task)
+
+    def run_step(self):
+        """
+        One scheduling round: assign pending tasks, balance queues, and let every available
+        cell execute the task at the head of its queue.
+
+        :return: Number of tasks executed.
+        """
+        self.schedule()
+        self.steal_work()
+        executed = 0
+        now = time.monotonic()
+        for cell_id, queue in self.cell_queues.items():
+            cell = self.cells[cell_id]
+            if queue and self.is_available(cell):
+                task, submit_time = queue.popleft()
+                self.latencies.append(now - submit_time)
+                self.execute(cell, task)
+                executed += 1
+        self.completed += executed
+        return executed
+
+    def pending_tasks(self):
+        """Return the number of tasks waiting in the priority queue and in the cell queues."""
+        return len(self.task_queue) + sum(len(queue) for queue in self.cell_queues.values())
+
+    def get_metrics(self):
+        """Return throughput and queue-latency metrics for the whole population."""
+        elapsed = max(time.monotonic() - self.start_time, 1e-9)
+        latencies = sorted(self.latencies)
+        return {
+            "completed_tasks": self.completed,
+            "throughput_per_second": self.completed / elapsed,
+            "pending_tasks": self.pending_tasks(),
+            "stolen_tasks": self.stolen,
+            "average_queue_latency": sum(latencies) / len(latencies) if latencies else 0.0,
+            "p95_queue_latency": latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+            "max_queue_latency": latencies[-1] if latencies else 0.0
+        }
 
 # Example of distributing tasks among cells
 if __name__ == "__main__":
+    from core.child_cell import ChildCell
+    from core.grandchild_cell import GrandchildCell
+
     task_dist = TaskDistribution()
-    cells = [ChildCell(parent_id="MOTHER_CELL_1"), GrandchildCell(parent_id="CHILD_1001")]
+    cells = [ChildCell(mother_cell_id="MOTHER_CELL_1"), GrandchildCell(parent_id="CHILD_1001")]
     tasks = ["Task 1: Environmental Analysis", "Task 2: Self-Evolution"]
     task_dist.distribute_tasks(cells, tasks)
+    task_dist.submit_task("Task 0: Emergency repair", priority=0)
+    while task_dist.pending_tasks() and task_dist.run_step():
+        pass
+    print(task_dist.get_metrics())
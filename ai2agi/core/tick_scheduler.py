@@ -0,0 +1,58 @@
+import asyncio
+import inspect
+
+
+class TickScheduler:
+    """
+    Runs periodic callbacks as asyncio tasks on one event loop.
+
+    Ticks are scheduled against the loop clock, so a slow callback does not make the
+    following ticks drift. Any number of periodic jobs (controllers, sensor readers, ...)
+    can share the same scheduler and loop.
+    """
+
+    def __init__(self):
+        self.tasks = set()
+
+    def every(self, interval, callback, *args):
+        """
+        Call `callback(*args)` every `interval` seconds until the returned task is cancelled
+        or the callback returns False.
+
+        :param interval: Seconds between ticks, or a function returning it (read at every tick).
+        :param callback: A function or coroutine function.
+        :return: The asyncio task running the periodic job.
+        """
+        task = asyncio.get_running_loop().create_task(self._run_periodic(interval, callback, args))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    async def _run_periodic(self, interval, callback, args):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            result = callback(*args)
+            if inspect.isawaitable(result):
+                result = await result
+            if result is False:
+                return
+            next_tick += interval() if callable(interval) else interval
+            next_tick = max(next_tick, loop.time())  # Skip missed ticks instead of bursting
+            await asyncio.sleep(next_tick - loop.time())
+
+    def cancel_all(self):
+        """Cancel every periodic job of this scheduler."""
+        for task in list(self.tasks):
+            task.cancel()
+
+# Example of two periodic jobs sharing one loop
+if __name__ == "__main__":
+    async def main():
+        scheduler = TickScheduler()
+        scheduler.every(0.5, lambda: print("Fast tick"))
+        scheduler.every(1.0, lambda: print("Slow tick"))
+        await asyncio.sleep(2.1)
+        scheduler.cancel_all()
+
+    asyncio.run(main())
@@ -0,0 +1,138 @@
+import math
+import time
+import numpy as np
+
+
+class SlidingWindowCounter:
+    """
+    Event counts over a sliding time window, kept in a ring of fixed-length time slots.
+
+    Adding an event is O(1); counting the events of the last N seconds sums at most `slots`
+    slots, at slot granularity. Events older than the window are overwritten in place, so
+    memory does not depend on how many events were ever added.
+    """
+
+    def __init__(self, resolution=1.0, slots=60):
+        """
+        :param resolution: Length of a slot in seconds.
+        :param slots: Number of slots (the window covers resolution * slots seconds).
+        """
+        self.resolution = resolution
+        self.slots = slots
+        self.counts = np.zeros(slots, dtype=np.int64)
+        self.slot_ids = np.full(slots, -1, dtype=np.int64)  # Absolute slot number held by each position
+
+    @property
+    def span(self):
+        return self.resolution * self.slots
+
+    def add(self, timestamp, count=1):
+        slot = int(timestamp // self.resolution)
+        position = slot % self.slots
+        if self.slot_ids[position] != slot:
+            if self.slot_ids[position] > slot:
+                return  # Older than the window
+            self.slot_ids[position] = slot
+            self.counts[position] = 0
+        self.counts[position] += count
+
+    def count(self, seconds, now=None):
+        """Return the number of events in the last `seconds` seconds (capped to the window span)."""
+        now_slot = int((time.time() if now is None else now) // self.resolution)
+        slots = min(self.slots, max(1, math.ceil(seconds / self.resolution)))
+        in_window = (self.slot_ids > now_slot - slots) & (self.slot_ids <= now_slot)
+        return int(self.counts[in_window].sum())
+
+
+class DecayedRate:
+    """Exponentially decayed event rate, updated in O(1) per event."""
+
+    def __init__(self, half_life):
+        """
+        :param half_life: Seconds after which the weight of an event is halved.
+        """
+        self.half_life = half_life
+        self.decay = math.log(2) / half_life
+        self.value = 0.0  # Decayed event count at time self.last
+        self.last = None
+
+    def add(self, timestamp, count=1):
+        if self.last is None:
+            self.last = timestamp
+        elif timestamp >= self.last:
+            self.value *= math.exp(-self.decay * (timestamp - self.last))
+            self.last = timestamp
+        else:
+            count *= math.exp(-self.decay * (self.last - timestamp))  # Late event
+        self.value += count
+
+    def rate(self, now=None):
+        """Return the decayed rate in events per second."""
+        if self.last is None:
+            return 0.0
+        now = time.time() if now is None else now
+        return self.value * math.exp(-self.decay * max(0.0, now - self.last)) * self.decay
+
+
+class BehaviorTrend:
+    """
+    Constant-size trend statistics of one behavior.
+
+    Keeps the total count, per-second counts for the last minute, per-minute counts for the
+    last day, and a short- and a long-term decayed rate whose ratio tells whether the behavior
+    is becoming more or less frequent.
+    """
+
+    def __init__(self, short_half_life=60.0, long_half_life=3600.0):
+        self.total = 0
+        self.first_seen = None
+        self.last_seen = None
+        self.seconds = SlidingWindowCounter(resolution=1.0, slots=60)
+        self.minutes = SlidingWindowCounter(resolution=60.0, slots=1440)
+        self.short_rate = DecayedRate(short_half_life)
+        self.long_rate = DecayedRate(long_half_life)
+
+    def add(self, timestamp, count=1):
+        self.total += count
+        self.first_seen = timestamp if self.first_seen is None else min(self.first_seen, timestamp)
+        self.last_seen = timestamp if self.last_seen is None else max(self.last_seen, timestamp)
+        for counter in (self.seconds, self.minutes, self.short_rate, self.long_rate):
+            counter.add(timestamp, count)
+
+    def count_since(self, seconds, now=None):
+        """Return the number of occurrences in the last `seconds` seconds (at most one day back)."""
+        counter = self.seconds if seconds <= self.seconds.span else self.minutes
+        return counter.count(seconds, now)
+
+    def direction(self, now=None, tolerance=1.5):
+        """Return "Rising", "Falling" or "Steady" from the ratio of the short- and long-term rates."""
+        short_rate, long_rate = self.short_rate.rate(now), self.long_rate.rate(now)
+        if short_rate > long_rate * tolerance:
+            return "Rising"
+        if short_rate * tolerance < long_rate:
+            return "Falling"
+        return "Steady"
+
+    def summary(self, now=None):
+        now = time.time() if now is None else now
+        return {
+            "total": self.total,
+            "last_minute": self.count_since(60, now),
+            "last_hour": self.count_since(3600, now),
+            "last_day": self.count_since(86400, now),
+            "short_rate": self.short_rate.rate(now),
+            "long_rate": self.long_rate.rate(now),
+            "direction": self.direction(now),
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen
+        }
+
+# Example of a burst of events on top of a slow background rate
+if __name__ == "__main__":
+    trend = BehaviorTrend()
+    start = time.time() - 7200
+    for i in range(120):
+        trend.add(start + 60 * i)  # One event per minute for two hours
+    for i in range(30):
+        trend.add(start + 7200 - 30 + i)  # Then a burst in the last 30 seconds
+    print(trend.summary(now=start + 7200))
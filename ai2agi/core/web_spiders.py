@@ -1,92 +1,424 @@
+import os
+import json
+import time
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
-import json
+from core.jsonl_writer import JsonlWriter
+from core.url_index import VisitedIndex, canonicalize_url
+from core.fetch_cache import FetchCache, SimHashIndex, simhash
 
 class WebSpider:
-    def __init__(self, base_url):
+    def __init__(self, base_url, concurrency=16, per_host_concurrency=2, politeness_delay=0.5,
+                 timeout=(3.05, 10), verbose=True, output_path=None, checkpoint_path=None,
+                 checkpoint_interval=1000, cache_path=None, dedup_distance=None):
         """
         Initialize the WebSpider with a base URL to start the scraping process.
 
         :param base_url: The URL to begin scraping data from.
+        :param concurrency: Maximum number of pages fetched and parsed at the same time.
+        :param per_host_concurrency: Maximum number of requests in flight to one host.
+        :param politeness_delay: Minimum number of seconds between two requests to the same host.
+        :param timeout: (connect, read) timeout in seconds for every request.
+        :param verbose: Print every fetched page when True.
+        :param output_path: JSON-lines file the records are appended to as they are parsed.
+            When set, records are not kept in memory (self.data stays empty).
+        :param checkpoint_path: File where the crawl state is saved, so an interrupted crawl can resume.
+            Checkpoints append the changes since the previous one to `checkpoint_path + ".journal"`;
+            the full state is only rewritten once that journal holds as many URLs as the snapshot.
+        :param checkpoint_interval: Number of fetched pages between two checkpoints.
+        :param cache_path: SQLite file caching validators and parsed content for conditional GETs.
+        :param dedup_distance: Pages whose SimHash is within this many bits of an already seen page
+            are near-duplicates: they are neither parsed nor followed, and their record is reduced
+            to {"url": ..., "duplicate": True}. None (the default) disables the check, so the
+            records of a crawl only change when it is asked for.
         """
         self.base_url = base_url  # The base URL to start scraping
-        self.visited_urls = set()  # Set to store URLs that have been visited to avoid repetition
-        self.data = []  # List to store scraped data
+        self.visited_urls = VisitedIndex()  # Hashes of canonical URLs already fetched or queued, to avoid repetition
+        self.data = []  # List to store scraped data (when no output file is used)
+        self.frontier = deque()  # (url, remaining depth) pairs waiting to be fetched, in BFS order
+        self.in_flight = {}  # URL -> remaining depth of the pages being fetched
+        self.depth = None  # Depth of the current crawl
+        self.pages_fetched = 0
+        self.output_path = output_path
+        self.output = None  # Append-only record sink, opened on first use
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.pages_since_checkpoint = 0
+        self.checkpoint_task = None  # Background write of the latest checkpoint
+        self.checkpoint_snapshot_size = None  # URLs in the last full snapshot (None until one is written)
+        self.checkpoint_journal_size = 0  # URLs appended to the checkpoint journal since that snapshot
+        self.enqueued_since_checkpoint = []  # [url, depth] added to the frontier since the last checkpoint
+        self.completed_since_checkpoint = []  # URLs fetched since the last checkpoint
+        self.fetch_cache = FetchCache(cache_path) if cache_path else None
+        self.content_index = SimHashIndex(dedup_distance) if dedup_distance is not None else None
+        self.pages_not_modified = 0
+        self.pages_duplicate = 0
+        self.lock = threading.Lock()  # Protects the content index and counters used by worker threads
+        self.concurrency = concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.politeness_delay = politeness_delay
+        self.timeout = timeout
+        self.verbose = verbose
+        self.host_slots = {}  # Host -> semaphore limiting the requests in flight to it
+        self.host_next_request = {}  # Host -> loop time before which no new request is sent to it
 
-    def fetch_page(self, url):
-        """
-        Fetch the HTML content of a webpage using requests.
+        # One pooled session: connections to a host are reused instead of opening one per page
+        adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=max(concurrency, per_host_concurrency))
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
-        :param url: The URL of the page to fetch.
-        :return: The HTML content of the page or None if the page couldn't be fetched.
-        """
+    def _get(self, url, headers=None):
+        """Send a GET through the pooled session; None on errors and unexpected status codes."""
         try:
-            print(f"Fetching page: {url}")
-            response = requests.get(url)
-            if response.status_code == 200:
-                return response.text
-            else:
+            if self.verbose:
+                print(f"Fetching page: {url}")
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code not in (200, 304):
                 print(f"Failed to fetch page: {url}, Status code: {response.status_code}")
                 return None
+            return response
         except requests.RequestException as e:
             print(f"Error fetching page {url}: {e}")
             return None
 
-    def parse_html(self, html):
+    @staticmethod
+    def _is_html(response):
+        return "html" in response.headers.get("Content-Type", "text/html")
+
+    def fetch_page(self, url):
         """
-        Parse the HTML content using BeautifulSoup to extract relevant information.
+        Fetch the HTML content of a webpage using the pooled session.
+
+        :param url: The URL of the page to fetch.
+        :return: The HTML content of the page or None if the page couldn't be fetched.
+        """
+        response = self._get(url)
+        if response is None or response.status_code != 200 or not self._is_html(response):
+            return None  # Not a document to parse for links
+        return response.text
+
+    def parse_page(self, html, url=None):
+        """
+        Parse a page once with BeautifulSoup, extracting both its data and its links.
 
         :param html: The HTML content of the page.
-        :return: A dictionary containing the parsed data.
+        :param url: The URL of the page, used to resolve relative links.
+        :return: (dictionary containing the parsed data, list of absolute http(s) link URLs)
         """
+        url = url or self.base_url
         soup = BeautifulSoup(html, 'html.parser')
         # Example of extracting title and description, you can customize this to your needs
-        title = soup.title.string if soup.title else "No title"
+        title = soup.title.get_text() if soup.title else "No title"  # Plain string, not a node of the tree
         description = soup.find('meta', attrs={'name': 'description'})
-        description_content = description['content'] if description else "No description"
+        description_content = description.get('content', "No description") if description else "No description"
+        page_base = urljoin(url, soup.base['href']) if soup.base and soup.base.get('href') else url  # Get the base URL from the page
 
         parsed_data = {
             "title": title,
             "description": description_content,
-            "url": soup.base.get('href', self.base_url)  # Get the base URL from the page
+            "url": page_base
         }
-        
-        return parsed_data
 
-    def crawl(self, url, depth=2):
+        links = []
+        for link in soup.find_all('a', href=True):
+            next_url = canonicalize_url(link['href'], page_base)
+            if next_url is not None:
+                links.append(next_url)
+        return parsed_data, links
+
+    def parse_html(self, html):
         """
-        Crawl through the pages starting from the given URL.
+        Parse the HTML content using BeautifulSoup to extract relevant information.
 
-        :param url: The URL to start scraping.
-        :param depth: The depth of the crawl (how many levels deep you want to go).
+        :param html: The HTML content of the page.
+        :return: A dictionary containing the parsed data.
+        """
+        return self.parse_page(html)[0]
+
+    def fetch_and_parse(self, url):
+        """
+        Fetch and parse one page (runs in a worker thread).
+
+        With a fetch cache the request is conditional, and a 304 answer reuses the record and
+        links cached from the last crawl without downloading or parsing the page again.
+
+        :return: (record, links), or None if the page couldn't be fetched. A near-duplicate page
+            is not parsed: it gives {"url": url, "duplicate": True} and no links.
+        """
+        entry = self.fetch_cache.get(url) if self.fetch_cache is not None else None
+        response = self._get(url, self.fetch_cache.conditional_headers(entry) if entry else None)
+        if response is None:
+            return None
+        if response.status_code == 304:
+            if entry is None:
+                return None
+            with self.lock:
+                self.pages_not_modified += 1
+                if self.content_index is not None and entry["fingerprint"] is not None:
+                    self.content_index.add(entry["fingerprint"])
+            return entry["record"], entry["links"]
+        if response.status_code != 200 or not self._is_html(response):
+            return None
+
+        html = response.text
+        fingerprint = None
+        if self.content_index is not None:
+            fingerprint = simhash(html)
+        duplicate = False
+        if fingerprint is not None:
+            with self.lock:
+                if not self.content_index.add(fingerprint):
+                    self.pages_duplicate += 1
+                    duplicate = True
+        if duplicate:
+            record, links = {"url": url, "duplicate": True}, []  # Cached as such, so a 304 keeps the flag
+        else:
+            record, links = self.parse_page(html, url)
+        etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        if self.fetch_cache is not None and (etag or last_modified):
+            self.fetch_cache.put(url, etag, last_modified, record, links, fingerprint)
+        return record, links
+
+    async def _wait_for_host(self, host):
+        """Sleep until the politeness delay since the last request to a host has passed."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        send_at = max(now, self.host_next_request.get(host, now))
+        self.host_next_request[host] = send_at + self.politeness_delay  # Reserve the slot before sleeping
+        if send_at > now:
+            await asyncio.sleep(send_at - now)
+
+    async def _visit(self, url, depth, executor):
+        host = urlsplit(url).netloc
+        slot = self.host_slots.setdefault(host, asyncio.Semaphore(self.per_host_concurrency))
+        async with slot:
+            await self._wait_for_host(host)
+            page = await asyncio.get_running_loop().run_in_executor(executor, self.fetch_and_parse, url)
+        if page is not None:
+            data, links = page
+            self.store_record(data)
+            if depth > 1:
+                for next_url in links:
+                    self.enqueue(next_url, depth - 1)
+        # Only forget the page once its links are in the frontier, so a checkpoint never loses them
+        del self.in_flight[url]
+        if self.checkpoint_path is not None:
+            self.completed_since_checkpoint.append(url)
+        self.pages_fetched += 1
+        self.pages_since_checkpoint += 1
+
+    def enqueue(self, url, depth):
+        """Add a discovered URL to the frontier unless it was already seen."""
+        if self.visited_urls.add(url):
+            self._push(url, depth)
+
+    def _push(self, url, depth):
+        """Append a newly seen URL to the frontier and to the next checkpoint delta."""
+        self.frontier.append((url, depth))
+        if self.checkpoint_path is not None:
+            self.enqueued_since_checkpoint.append([url, depth])
+
+    def exchange_links(self):
+        """Called at every step of the crawl loop; a sharded crawl sends and receives links here."""
+
+    async def wait_for_links(self):
+        """
+        Called when the frontier is empty and no page is in flight.
+
+        :return: True if new URLs were added to the frontier, False to end the crawl.
         """
-        if depth == 0 or url in self.visited_urls:
-            return  # Stop if depth is 0 or URL has already been visited
-        
-        print(f"Visiting: {url}")
-        self.visited_urls.add(url)  # Mark this URL as visited
+        return False
 
-        html = self.fetch_page(url)
-        if html:
-            data = self.parse_html(html)
+    def store_record(self, data):
+        """Append a record to the output file, or keep it in self.data when no output file is set."""
+        if self.output_path is None:
             self.data.append(data)  # Store the extracted data
+            return
+        if self.output is None:
+            self.output = JsonlWriter(self.output_path, fsync=False)
+        self.output.log(data)
+
+    def checkpoint(self):
+        """
+        Save the crawl state to the checkpoint files in the background.
+
+        A checkpoint appends the URLs added to the frontier and the pages fetched since the
+        previous one to the checkpoint journal; pages still being fetched are not marked as
+        fetched, so a resumed crawl fetches them again. Once the journal holds as many URLs as
+        the last full snapshot, the full frontier and visited index are written instead and the
+        journal starts over, so the checkpoint cost stays proportional to the pages crawled.
+
+        Each checkpoint records the size of the output file once all buffered records are
+        flushed, so a resumed crawl drops any record written after it.
+        """
+        if self.checkpoint_path is None or (self.checkpoint_task is not None and not self.checkpoint_task.done()):
+            return
+        if self.output is not None:
+            self.output.flush()
+        progress = {
+            "depth": self.depth,
+            "pages_fetched": self.pages_fetched,
+            "output_size": os.path.getsize(self.output_path) if self.output_path and os.path.exists(self.output_path) else 0,
+            "timestamp": time.time()
+        }
+        delta = dict(progress, enqueued=self.enqueued_since_checkpoint, completed=self.completed_since_checkpoint)
+        self.enqueued_since_checkpoint, self.completed_since_checkpoint = [], []
+        self.checkpoint_journal_size += len(delta["enqueued"]) + len(delta["completed"])
+        self.pages_since_checkpoint = 0
+        loop = asyncio.get_running_loop()
+        if self.checkpoint_snapshot_size is None or self.checkpoint_journal_size > self.checkpoint_snapshot_size:
+            state = dict(progress, base_url=self.base_url,
+                         frontier=[[url, depth] for url, depth in self.in_flight.items()] + [list(item) for item in self.frontier],
+                         visited=self.visited_urls.to_string())
+            self.checkpoint_snapshot_size = len(self.visited_urls)
+            self.checkpoint_journal_size = 0
+            self.checkpoint_task = loop.run_in_executor(None, self._write_checkpoint, state)
+        else:
+            self.checkpoint_task = loop.run_in_executor(None, self._append_checkpoint, delta)
+
+    def _write_checkpoint(self, state):
+        # Empty the journal first: if the snapshot write is interrupted, the previous snapshot
+        # alone is still a consistent (older) state
+        journal_path = self.checkpoint_path + ".journal"
+        if os.path.exists(journal_path):
+            with open(journal_path, "w") as f:
+                os.fsync(f.fileno())
+        temp_path = self.checkpoint_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.checkpoint_path)
+
+    def _append_checkpoint(self, delta):
+        with open(self.checkpoint_path + ".journal", "a") as f:
+            f.write(json.dumps(delta) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
 
-            # Find all the links in the page and recursively visit them
-            soup = BeautifulSoup(html, 'html.parser')
-            links = soup.find_all('a', href=True)
+    def _read_checkpoint_journal(self):
+        """Yield the deltas appended since the last full snapshot, stopping at a torn last line."""
+        journal_path = self.checkpoint_path + ".journal"
+        if not os.path.exists(journal_path):
+            return
+        with open(journal_path, "r") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    return
 
-            for link in links:
-                next_url = link['href']
-                # If the link is an absolute URL, visit it directly
-                if next_url.startswith('http'):
-                    self.crawl(next_url, depth-1)
-                else:
-                    # Otherwise, join the base URL with the relative URL
-                    self.crawl(self.base_url + next_url, depth-1)
+    def load_checkpoint(self):
+        """
+        Restore the frontier, visited set and depth saved by the last checkpoint.
+
+        :return: True if a checkpoint was loaded.
+        """
+        if self.checkpoint_path is None or not os.path.exists(self.checkpoint_path):
+            return False
+        with open(self.checkpoint_path, "r") as f:
+            state = json.load(f)
+        visited_urls = VisitedIndex.from_string(state["visited"])
+        frontier = [(url, depth) for url, depth in state["frontier"]]
+        completed = set()
+        for delta in self._read_checkpoint_journal():
+            for url, depth in delta["enqueued"]:
+                visited_urls.add(url)
+                frontier.append((url, depth))
+            completed.update(delta["completed"])
+            state.update(depth=delta["depth"], pages_fetched=delta["pages_fetched"], output_size=delta["output_size"])
+        self.depth = state["depth"]
+        self.pages_fetched = state["pages_fetched"]
+        self.visited_urls = visited_urls
+        self.frontier = deque(item for item in frontier if item[0] not in completed)
+        self.checkpoint_snapshot_size = None  # The next checkpoint writes a full snapshot
+        self.checkpoint_journal_size = 0
+        self.enqueued_since_checkpoint, self.completed_since_checkpoint = [], []
+        if self.output_path and os.path.exists(self.output_path):
+            if self.output is not None:
+                self.output.close()
+                self.output = None
+            with open(self.output_path, "r+b") as f:
+                f.truncate(state["output_size"])  # Drop records of pages that will be fetched again
+        print(f"Resuming crawl: {self.pages_fetched} pages fetched, {len(self.frontier)} in the frontier.")
+        return True
+
+    async def crawl_async(self, url, depth=2):
+        """
+        Crawl breadth-first from the given URL, fetching up to `concurrency` pages at a time.
+
+        :param url: The URL to start scraping (None to continue from the current frontier).
+        :param depth: The depth of the crawl (how many levels deep you want to go).
+        :return: Number of pages fetched.
+        """
+        self.depth = depth
+        url = canonicalize_url(url, self.base_url) if url is not None else None
+        if depth > 0 and url is not None:
+            self.enqueue(url, depth)
+
+        start_time = time.time()
+        fetched = 0
+        pending = set()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while True:
+                self.exchange_links()
+                while self.frontier and len(pending) < self.concurrency:
+                    next_url, remaining = self.frontier.popleft()
+                    self.in_flight[next_url] = remaining
+                    pending.add(asyncio.create_task(self._visit(next_url, remaining, executor)))
+                if not pending:
+                    if await self.wait_for_links():
+                        continue
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+                fetched += len(done)
+                if self.pages_since_checkpoint >= self.checkpoint_interval:
+                    self.checkpoint()
+            if self.checkpoint_task is not None:
+                await self.checkpoint_task
+            self.checkpoint()  # Final state: empty frontier
+            if self.checkpoint_task is not None:
+                await self.checkpoint_task
+            if self.output is not None:
+                self.output.flush()
+        elapsed = time.time() - start_time
+        print(f"Crawled {fetched} pages in {elapsed:.2f} seconds ({fetched / max(elapsed, 1e-9):.1f} pages/s); "
+              f"{self.pages_not_modified} not modified, {self.pages_duplicate} near-duplicates not followed.")
+        return fetched
+
+    def crawl(self, url, depth=2, resume=False):
+        """
+        Crawl through the pages starting from the given URL (blocking; use crawl_async inside an event loop).
+
+        :param url: The URL to start scraping.
+        :param depth: The depth of the crawl (how many levels deep you want to go).
+        :param resume: Continue from the last checkpoint, if there is one.
+        """
+        if resume and self.load_checkpoint():
+            depth = self.depth
+        return asyncio.run(self.crawl_async(url, depth))
+
+    def close(self):
+        """Flush the pending records and close the output file, the fetch cache and the session."""
+        if self.output is not None:
+            self.output.close()
+            self.output = None
+        if self.fetch_cache is not None:
+            self.fetch_cache.close()
+        self.session.close()
 
     def save_data(self, filename='scraped_data.json'):
         """
-        Save the scraped data to a JSON file.
+        Save the scraped data kept in memory to a JSON file (records streamed to output_path are already saved).
 
         :param filename: The name of the file where the data will be saved.
         """
@@ -97,10 +429,9 @@ class WebSpider:
 # Example usage of WebSpider
 if __name__ == "__main__":
     base_url = "https://example.com"  # Replace this with the URL you want to scrape
-    spider = WebSpider(base_url)
-    
-    # Start crawling from the base URL, set depth to 2 (you can increase/decrease this)
-    spider.crawl(base_url, depth=2)
-    
-    # Save the scraped data to a JSON file
-    spider.save_data("scraped_data.json")
+    spider = WebSpider(base_url, output_path="scraped_data.jsonl", checkpoint_path="crawl_checkpoint.json")
+
+    # Start crawling from the base URL, set depth to 2 (you can increase/decrease this);
+    # an interrupted crawl continues from its last checkpoint
+    spider.crawl(base_url, depth=2, resume=True)
+    spider.close()
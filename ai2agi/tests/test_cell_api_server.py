@@ -0,0 +1,140 @@
+import json
+import socket
+import pytest
+from core import cell_api_server
+from core.cell_api_server import CellAPIServer
+
+
+def request(method, path, body=None, connection=None):
+    payload = b"" if body is None else json.dumps(body).encode("utf-8")
+    head = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(payload)}\r\n"
+    if connection:
+        head += f"Connection: {connection}\r\n"
+    return head.encode("latin-1") + b"\r\n" + payload
+
+
+def read_response(stream):
+    """Read one response; return (status, headers, body), with chunked bodies reassembled."""
+    status = int(stream.readline().split()[1])
+    headers = {}
+    while True:
+        line = stream.readline().decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding") == "chunked":
+        body = b""
+        while True:
+            size = int(stream.readline().strip(), 16)
+            chunk = stream.read(size + 2)[:size]
+            if not size:
+                break
+            body += chunk
+    else:
+        body = stream.read(int(headers["content-length"]))
+    return status, headers, body
+
+
+@pytest.fixture
+def server():
+    server = CellAPIServer().start()  # Ephemeral port
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def connection(server):
+    sock = socket.create_connection((server.host, server.port), timeout=5)
+    stream = sock.makefile("rb")
+    yield sock, stream
+    stream.close()
+    sock.close()
+
+
+def exchange(connection, *requests):
+    sock, stream = connection
+    sock.sendall(b"".join(requests))
+    return [read_response(stream) for _ in requests]
+
+
+def test_routes(connection):
+    (status, _, body), = exchange(connection, request("POST", "/create_cell", {"status": "active"}))
+    cell = json.loads(body)
+    assert status == 201 and cell["status"] == "active"
+    responses = exchange(connection,
+                         request("PUT", f"/cells/{cell['id']}/update", {"status": "resting"}),
+                         request("GET", f"/cells/{cell['id']}"),
+                         request("POST", "/cells/bulk_status", [cell["id"], "CELL_0"]),
+                         request("PATCH", f"/cells/{cell['id']}"),
+                         request("GET", "/unknown"),
+                         request("DELETE", f"/cells/{cell['id']}/delete"),
+                         request("GET", f"/cells/{cell['id']}"))
+    assert [status for status, _, _ in responses] == [200, 200, 200, 405, 404, 200, 404]
+    assert json.loads(responses[1][2])["status"] == "resting"
+    assert json.loads(responses[2][2]) == [dict(cell, status="resting"), None]
+
+
+def test_pipelined_requests_are_answered_in_order(connection):
+    requests = [request("POST", "/create_cell", {"index": i}) for i in range(500)]
+    responses = exchange(connection, *requests)
+    assert [json.loads(body)["index"] for _, _, body in responses] == list(range(500))
+
+
+def test_bulk_endpoints(server, connection):
+    (_, _, body), = exchange(connection, request("POST", "/create_cells", [{"status": "active"}] * 3))
+    cells = json.loads(body)
+    ids = [cell["id"] for cell in cells]
+    responses = exchange(connection,
+                         request("PUT", "/cells/bulk_update", [{"id": ids[0], "status": "inactive"}]),
+                         request("POST", "/cells/bulk_delete", [ids[1], "CELL_0"]))
+    assert json.loads(responses[0][2])[0]["status"] == "inactive"
+    assert json.loads(responses[1][2]) == [True, False]
+    assert sorted(server.store.cells) == sorted([ids[0], ids[2]])
+
+
+@pytest.mark.parametrize("path, payload", [
+    ("/create_cells", {"status": "active"}),
+    ("/create_cells", [1, 2]),
+    ("/cells/bulk_update", ["CELL_1"]),
+    ("/cells/bulk_update", [{"id": {"a": 1}}]),
+    ("/cells/bulk_update", [{"id": [1]}]),
+    ("/cells/bulk_update", [{"status": "active"}]),
+    ("/cells/bulk_status", [["CELL_1"]]),
+    ("/cells/bulk_delete", {"id": "CELL_1"}),
+    ("/create_cell", [{"status": "active"}]),
+])
+def test_malformed_bulk_bodies_get_400(connection, path, payload):
+    method = "PUT" if path == "/cells/bulk_update" else "POST"
+    responses = exchange(connection, request(method, path, payload), request("GET", "/cells/CELL_0"))
+    assert [status for status, _, _ in responses] == [400, 404]  # The connection stays usable
+
+
+def test_malformed_request_line_closes_the_connection(connection):
+    sock, stream = connection
+    sock.sendall(b"NOT A REQUEST\r\nContent-Length: x\r\n\r\n")
+    status, headers, _ = read_response(stream)
+    assert status == 400 and headers["connection"] == "close"
+    assert stream.read() == b""
+
+
+def test_streamed_listing(server, connection, monkeypatch):
+    monkeypatch.setattr(cell_api_server, "STREAM_CHUNK_SIZE", 7)
+    for i in range(50):
+        server.store.create({"index": i, "status": "active" if i % 2 else "resting"})
+    responses = exchange(connection, request("GET", "/cells"), request("GET", "/cells?status=active"),
+                         request("GET", "/cells/CELL_0"))
+    status, headers, body = responses[0]
+    assert status == 200 and headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["index"] for line in body.splitlines()] == list(range(50))
+    assert [json.loads(line)["index"] for line in responses[1][2].splitlines()] == list(range(1, 50, 2))
+    assert responses[2][0] == 404  # Pipelined behind the streams
+
+
+def test_streamed_listing_with_connection_close(server, connection):
+    server.store.create({"status": "active"})
+    sock, stream = connection
+    sock.sendall(request("GET", "/cells", connection="close"))
+    status, headers, body = read_response(stream)
+    assert status == 200 and len(body.splitlines()) == 1
+    assert stream.read() == b""
@@ -0,0 +1,141 @@
+import numpy as np
+import pytest
+import core.cell_population as cell_population
+from core.cell_population import CellPopulation
+from core.cell_registry import IdAllocator
+
+
+def make_population(size=4, **options):
+    options.setdefault("seed", 1)
+    return CellPopulation(size, parent_id="CHILD_1", allocator=IdAllocator(), **options)
+
+
+@pytest.fixture
+def performance_log(monkeypatch):
+    entries = []
+
+    class Log:
+        def log(self, entry):
+            entries.append(entry)
+
+    monkeypatch.setattr(cell_population, "get_performance_log", lambda file_path: Log())
+    return entries
+
+
+def test_tasks_run_in_order_and_queues_grow():
+    population = make_population(task_capacity=1)
+    population.performance_genes[:] = 1.0
+    for task in ("a", "b", "c"):
+        population.assign_task(task, indices=[0, 0, 1])  # Repeated indices get the task once
+
+    assert population.tasks_of(0) == ["a", "b", "c"] and population.tasks_of(2) == []
+    performed, codes = population.perform_task()
+    assert list(performed) == [0, 1] and [population.task_names[code] for code in codes] == ["a", "a"]
+    population.assign_task("d", indices=[0])
+    assert population.tasks_of(0) == ["b", "c", "d"]
+    assert list(population.completed_tasks) == [1, 1, 0, 0]
+    assert population.energy_level[0] == pytest.approx(0.9)
+
+
+def test_cells_rest_at_the_energy_threshold():
+    population = make_population(initial_energy=0.35)
+    population.performance_genes[:] = 1.0
+    population.assign_task("a", indices=[0])
+    population.energy_level[3] = 0.0
+
+    population.perform_task()
+
+    assert population.status_counts() == {"active": 2, "resting": 2, "inactive": 0}
+    assert population.cell(0).status == "resting" and population.cell(3).status == "resting"
+
+
+def test_tick_accepts_scalar_and_per_cell_energy():
+    population = make_population(initial_energy=0.5, cell_type="child")
+
+    population.tick()
+    assert list(population.energy_level) == [0.5] * 4
+    population.tick(energy_amount=np.array([0.0, 0.1, 0.2, 0.6]))
+    assert population.energy_level == pytest.approx([0.5, 0.6, 0.7, 1.1])  # Not capped for child cells
+    population.tick(energy_amount=0)
+    assert population.energy_level == pytest.approx([0.5, 0.6, 0.7, 0.99])  # Evolved above 0.8
+
+    grandchildren = make_population(initial_energy=0.5)
+    grandchildren.tick(energy_amount=[0.2, 0.9, 0.0, 0.0])
+    assert grandchildren.energy_level == pytest.approx([0.7, 1.0, 0.5, 0.5])
+
+
+def test_evolution_follows_the_cell_type_rules():
+    population = make_population()
+    population.evolution_genes[:] = [0.9, 0.6, 0.9, 0.9]
+    population.energy_level[2] = 0.7
+    genes = population.performance_genes.copy()
+
+    assert list(population.self_evolve()) == [0, 3]
+    assert population.performance_genes - genes == pytest.approx([0.05, 0, 0, 0.05])
+
+    children = make_population(cell_type="child", initial_energy=0.9)
+    children.energy_level[1] = 0.8
+    assert list(children.self_evolve()) == [0, 2, 3]
+
+
+def test_child_populations_record_tasks_while_active():
+    children = make_population(cell_type="child")
+    children.status[1] = cell_population.STATUS_RESTING
+    children.assign_task("a")
+
+    assert list(children.completed_tasks) == [1, 0, 1, 1] and children.tasks_of(1) == []
+    assert children.perform_task()[0].size == 0 and children.tasks_of(0) == ["a"]
+
+
+def test_shards_merge_back_into_the_population():
+    population = make_population(size=10)
+    population.assign_task("a")
+    serial = make_population(size=10)
+    serial.__dict__.update({name: getattr(population, name).copy() for name in population._shard_arrays})
+    serial._queue = population._queue.copy()
+
+    for start, stop in ((0, 4), (4, 10)):
+        shard = population.shard(start, stop)
+        assert shard.cell_id(0) == population.cell_id(start)
+        shard.tick(energy_amount=0.05)
+        population.merge_shard(start, shard.shard_delta())
+    serial.tick(energy_amount=0.05)
+
+    for name in population._shard_arrays:
+        assert np.array_equal(getattr(population, name), getattr(serial, name))
+
+
+def test_cell_view_has_the_grandchild_cell_interface(performance_log):
+    population = make_population()
+    cell, other = population.cell(1), population.cell(2)
+    cell.chromosomes["performance_genes"] = 1.0
+
+    assert population.index_of(cell.id) == 1 and population.index_of("CHILD_1") is None
+    assert cell.layers["energy_layer"] == {"current_energy": 1.0, "energy_threshold": 0.3}
+    assert cell.layers["genetic_layer"]["performance_genes"] == 1.0
+    with pytest.raises(AttributeError):
+        cell.mother_cell_id
+
+    cell.assign_task("Collect data")
+    cell.perform_task()
+    cell.perform_task()  # No task left: nothing logged
+    assert [(entry["cell_id"], entry["task"], entry["status"]) for entry in performance_log] == [
+        (cell.id, "Collect data", "completed")]
+    assert performance_log[0]["energy_level"] == pytest.approx(0.9)
+
+    other.energy_level = 0.4
+    cell.collaborate_with(other)
+    assert other.energy_level == pytest.approx(0.58) and cell.energy_level == pytest.approx(0.72)
+
+    cell.receive_energy(0.5)
+    assert cell.energy_level == 1.0
+
+
+def test_child_cell_view_has_a_mother_cell(performance_log):
+    cell = make_population(cell_type="child").cell(0)
+    cell.receive_energy(0.7)
+    cell.assign_task("a")
+    cell.perform_task()
+
+    assert cell.mother_cell_id == "CHILD_1" and cell.energy_level == pytest.approx(1.2)
+    assert cell.completed_tasks == 1 and performance_log == []
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import pytest
+from core import cell_api_server
+from core.cell_api_server import CellAPIProtocol, start_server
+from core.cell_requests import CellRequestHandler, AsyncCellRequestHandler
+
+CELL = {"type": "daughter", "parent_cell_id": "MOTHER_CELL_1", "status": "active"}
+
+
+class FlakyProtocol(CellAPIProtocol):
+    """Answers 503 to the first request of each path listed in `failures`, and 404 to `missing` paths."""
+
+    failures = set()
+    missing = set()
+
+    def route(self, method, target, payload, keep_alive):
+        if target in FlakyProtocol.failures:
+            FlakyProtocol.failures.discard(target)
+            self.transport.write(b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\n\r\n")
+            return
+        if target in FlakyProtocol.missing:
+            self.respond(404, {"error": "Not found"}, keep_alive)
+            return
+        super().route(method, target, payload, keep_alive)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(cell_api_server, "CellAPIProtocol", FlakyProtocol)
+    FlakyProtocol.failures, FlakyProtocol.missing = set(), set()
+    server, api_url = start_server()  # Ephemeral port
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def handler(server):
+    handler = CellRequestHandler(server.url, backoff_factor=0, batch_size=100)
+    yield handler
+    handler.close()
+
+
+def test_create_update_get_delete(handler):
+    cell = handler.create_cell(CELL)
+    assert cell["id"].startswith("CELL_") and cell["status"] == "active"
+    assert handler.update_cell(cell["id"], {"status": "inactive"})["status"] == "inactive"
+    assert handler.get_cell_status(cell["id"])["status"] == "inactive"
+    assert handler.delete_cell(cell["id"])
+    assert handler.get_cell_status(cell["id"]) is None
+    assert handler.update_cell("CELL_0", {"status": "resting"}) is None
+
+
+def test_idempotent_requests_are_retried(server, handler):
+    cell = handler.create_cell(CELL)
+    FlakyProtocol.failures = {f"/cells/{cell['id']}", f"/cells/{cell['id']}/update"}
+    assert handler.get_cell_status(cell["id"])["id"] == cell["id"]
+    assert handler.update_cell(cell["id"], {"status": "resting"})["status"] == "resting"
+    assert not FlakyProtocol.failures
+
+
+def test_bulk_requests_keep_order(server, handler):
+    created = handler.create_cells([dict(CELL, index=i) for i in range(250)])
+    assert [cell["index"] for cell in created] == list(range(250))
+    assert len({cell["id"] for cell in created}) == 250
+    updated = handler.update_cells({cell["id"]: {"status": "resting"} for cell in created})
+    assert [cell["id"] for cell in updated] == [cell["id"] for cell in created]
+    assert all(server.store.get(cell["id"])["status"] == "resting" for cell in created)
+
+
+def test_bulk_requests_fall_back_to_single_requests(server, handler):
+    FlakyProtocol.missing = {"/create_cells", "/cells/bulk_update"}
+    created = handler.create_cells([dict(CELL, index=i) for i in range(5)])
+    assert [cell["index"] for cell in created] == list(range(5))
+    updated = handler.update_cells([{"id": created[0]["id"], "status": "inactive"}, {"id": "CELL_0"}])
+    assert updated[0]["status"] == "inactive" and updated[1] is None
+
+
+def test_async_handler_runs_max_concurrency_requests_at_once(server):
+    handler = AsyncCellRequestHandler(server.url, max_concurrency=16)
+    barrier = threading.Barrier(16, timeout=5)  # Broken unless 16 requests are in flight together
+
+    def get_cell_status(cell_id):
+        barrier.wait()
+        return cell_id
+
+    handler.handler.get_cell_status = get_cell_status
+
+    async def main():
+        return await asyncio.gather(*(handler.get_cell_status(f"CELL_{i}") for i in range(32)))
+
+    try:
+        assert asyncio.run(main()) == [f"CELL_{i}" for i in range(32)]
+    finally:
+        handler.close()
+
+
+def test_async_bulk_create(server):
+    handler = AsyncCellRequestHandler(server.url, max_concurrency=4, batch_size=50)
+
+    async def main():
+        return await handler.create_cells([dict(CELL, index=i) for i in range(120)])
+
+    try:
+        assert [cell["index"] for cell in asyncio.run(main())] == list(range(120))
+    finally:
+        handler.close()
@@ -0,0 +1,71 @@
+import json
+import pytest
+from core.compliance_monitor import ComplianceMonitor
+
+
+def make_monitor():
+    monitor = ComplianceMonitor({"id": "MOTHER_CELL_1"})
+    monitor.track_task_compliance("CHILD_1", "Analyze environment", "completed")
+    monitor.track_task_compliance("CHILD_2", "Self-evolve", "pending", error_message="Insufficient energy")
+    monitor.track_task_compliance("CHILD_1", "Collect data", "failed", error_message="Timeout")
+    monitor.track_task_compliance("CHILD_3", "Collect data", "completed")
+    monitor.track_task_compliance("CHILD_2", "Self-evolve", "completed")
+    return monitor
+
+
+def test_counters_follow_the_tracked_tasks():
+    monitor = make_monitor()
+
+    assert monitor.get_compliance_summary() == {
+        "cells": 3, "tasks": 5, "status_counts": {"completed": 3, "pending": 1, "failed": 1},
+        "non_compliant_cells": 2, "non_compliant_tasks": 2, "compliant": False}
+    cell = monitor.get_cell_compliance("CHILD_2")
+    assert cell["status_counts"] == {"pending": 1, "completed": 1} and cell["tasks"] == 2
+    assert cell["last_error"] == "Insufficient energy" and not cell["compliant"]
+    assert monitor.get_cell_compliance("CHILD_3")["compliant"] and monitor.get_cell_compliance("CHILD_9") is None
+
+    cell["status_counts"]["pending"] = 0  # Copies: the counters are not affected
+    assert monitor.get_cell_compliance("CHILD_2")["status_counts"]["pending"] == 1
+
+
+def test_non_compliance_index_points_at_the_failed_records(capsys):
+    monitor = make_monitor()
+
+    assert monitor.get_non_compliant_cells() == ["CHILD_2", "CHILD_1"]
+    assert [monitor.records.record(row)["task"] for row in monitor.non_compliant_cells["CHILD_1"]] == ["Collect data"]
+    assert not monitor.check_compliance()
+    output = capsys.readouterr().out
+    assert "Child Cell CHILD_2 failed to complete task: Self-evolve" in output and "Error Message: Timeout" in output
+    assert "CHILD_3 failed" not in output
+
+    compliant = ComplianceMonitor(None)
+    compliant.track_task_compliance("CHILD_1", "Analyze environment", "completed")
+    assert compliant.is_compliant() and compliant.check_compliance()
+
+
+def test_compliance_data_is_a_read_only_snapshot():
+    monitor = make_monitor()
+    data = monitor.compliance_data
+
+    assert [record["task"] for record in data["CHILD_1"]] == ["Analyze environment", "Collect data"]
+    assert [record["status"] for record in monitor.get_cell_records("CHILD_2")] == ["pending", "completed"]
+    assert monitor.get_cell_records("CHILD_2") == list(data["CHILD_2"]) and monitor.get_cell_records("CHILD_9") == []
+    with pytest.raises(AttributeError):
+        data["CHILD_1"].append({"task": "Lost", "status": "completed"})
+    with pytest.raises(TypeError):
+        data["CHILD_4"] = ()
+
+
+def test_reports_only_append_new_records(tmp_path):
+    monitor = make_monitor()
+    report = str(tmp_path / "report.jsonl")
+
+    assert monitor.save_compliance_report(report, chunk_size=2) == 5
+    monitor.track_task_compliance("CHILD_4", "Analyze environment", "completed")
+    assert monitor.save_compliance_report(report) == 1
+    assert monitor.save_compliance_report(report) == 0
+
+    with open(report) as f:
+        records = [json.loads(line) for line in f]
+    assert [record["cell_id"] for record in records] == ["CHILD_1", "CHILD_2", "CHILD_1", "CHILD_3", "CHILD_2", "CHILD_4"]
+    assert records[1]["error_message"] == "Insufficient energy" and records[0]["error_message"] is None
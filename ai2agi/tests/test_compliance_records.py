@@ -0,0 +1,53 @@
+import json
+import math
+from core.compliance_records import ComplianceRecords
+
+
+def test_values_keep_their_type():
+    store = ComplianceRecords()
+    tasks = [1, True, 1.0, "1", None, float("nan"), float("nan"), {"step": 1}, {"step": 1}, ["a"]]
+    for i, task in enumerate(tasks):
+        store.append("CHILD_1", task, "completed", float(i))
+
+    decoded = [record["task"] for record in store.records()]
+    assert [type(task) for task in decoded] == [type(task) for task in tasks]
+    assert decoded[:5] == [1, True, 1.0, "1", None] and decoded[7:] == [{"step": 1}, {"step": 1}, ["a"]]
+    assert math.isnan(decoded[5]) and math.isnan(decoded[6])
+    assert len(store.values["task"]) == 8  # One code for both NaNs and for both equal dictionaries
+    assert list(store.rows_of("task", True)) == [1] and list(store.rows_of("task", 1.0)) == [2]
+    assert list(store.rows_of("task", float("nan"))) == [5, 6] and list(store.rows_of("task", {"step": 1})) == [7, 8]
+    assert list(store.rows_of("task", "missing")) == []
+
+
+def test_arrays_grow_and_records_decode_by_row():
+    store = ComplianceRecords(capacity=1)
+    for i in range(100):
+        store.append(f"CHILD_{i % 3}", "Analyze environment", "completed" if i % 4 else "pending", float(i),
+                     None if i % 4 else "Insufficient energy")
+
+    assert len(store) == 100 and len(store.timestamps) == 128
+    assert store.record(4) == {"cell_id": "CHILD_1", "task": "Analyze environment", "status": "pending",
+                               "error_message": "Insufficient energy", "timestamp": 4.0}
+    assert list(store.records(10, 13)) == [store.record(row) for row in (10, 11, 12)]
+    assert list(store.records(99, 500)) == [store.record(99)] and list(store.records(100)) == []
+    assert list(store.rows_of("status", "pending")) == list(range(0, 100, 4))
+
+
+def test_each_export_only_writes_the_new_records(tmp_path):
+    store = ComplianceRecords()
+    report, other = str(tmp_path / "report.jsonl"), str(tmp_path / "other.jsonl")
+    with open(report, "w") as f:
+        f.write("stale content\n")
+    for i in range(5):
+        store.append("CHILD_1", i, i % 2 == 0, float(i))
+
+    assert store.export_jsonl(report, chunk_size=2) == 5
+    store.append("CHILD_2", "Collect data", "completed", 5.0)
+    assert store.export_jsonl(report) == 1 and store.export_jsonl(report) == 0
+    assert store.export_jsonl(other) == 6  # Every file gets its own position
+
+    for path in (report, other):
+        with open(path) as f:
+            records = [json.loads(line) for line in f]
+        assert records == list(store.records())
+    assert [record["status"] for record in records[:2]] == [True, False]
@@ -0,0 +1,85 @@
+import os
+import time
+import json
+from core.dream_log import DreamLog
+
+
+def test_legacy_text_log_is_migrated(tmp_path):
+    file_path = str(tmp_path / "dream_log.txt")
+    with open(file_path, "w") as f:
+        for content, duration in (("Flying through the clouds.", 7), ("Exploring the ocean.", 12)):
+            f.write(f"Dream: {content}\nDuration: {duration} seconds\n-----------\n")
+        f.write(json.dumps({"timestamp": 1000.0, "content": "New dream", "duration": 5}) + "\n")
+    os.utime(file_path, (2000.0, 2000.0))
+
+    log = DreamLog(file_path)
+    log.append({"timestamp": 1001.0, "content": "Newer dream", "duration": 9})
+
+    dreams = list(log.iter_dreams())
+    assert [(dream["content"], dream["duration"]) for dream in dreams] == [
+        ("Flying through the clouds.", 7), ("Exploring the ocean.", 12), ("New dream", 5), ("Newer dream", 9)]
+    assert [dream["timestamp"] for dream in dreams] == [1000.0, 1000.0, 1000.0, 1001.0]
+    assert dreams[0]["legacy"] and "legacy" not in dreams[2]
+    assert len(DreamLog(file_path)) == 4
+
+
+def test_text_only_log_uses_the_file_time(tmp_path):
+    file_path = str(tmp_path / "dream_log.txt")
+    with open(file_path, "w") as f:
+        f.write("Dream: Wandering through a city.\nDuration: 5 seconds\n-----------\n")
+    os.utime(file_path, (2000.0, 2000.0))
+
+    assert DreamLog(file_path).tail(5) == [
+        {"timestamp": 2000.0, "content": "Wandering through a city.", "duration": 5, "legacy": True}]
+
+
+def test_since_queries_tolerate_out_of_order_timestamps(tmp_path):
+    log = DreamLog(str(tmp_path / "dream_log.txt"), max_segment_bytes=2048)
+    timestamps = [(i * 7919) % 1000 for i in range(1000)]
+    for i, timestamp in enumerate(timestamps):
+        log.append({"timestamp": float(timestamp), "content": f"Dream {i}", "duration": 5})
+    assert log.segments
+
+    for since in (0, 1, 250, 999, 1000):
+        assert [dream["timestamp"] for dream in log.iter_dreams(since=since)] == [
+            timestamp for timestamp in timestamps if timestamp >= since]
+
+
+def test_virtual_and_real_time_dreams_share_one_clock(tmp_path):
+    from core.dream_scheduler import DreamScheduler
+    from core.dream_state import DreamState
+
+    started = time.time()
+    virtual = DreamState(str(tmp_path / "shared_log.txt"), scheduler=DreamScheduler(virtual=True))
+    virtual.enter_dream_state()
+    virtual.scheduler.run()
+    real = DreamState(str(tmp_path / "shared_log.txt"), scheduler=DreamScheduler())
+    real.save_dream_to_log()
+
+    dreams = list(virtual.iter_dreams(since=started))
+    assert len(dreams) == 2
+    assert dreams[0]["virtual_time"] == virtual.dream_duration and "virtual_time" not in dreams[1]
+
+
+def test_readers_see_every_dream_during_rotations(tmp_path):
+    import threading
+
+    log = DreamLog(str(tmp_path / "dream_log.txt"), max_segment_bytes=1024)
+    done = threading.Event()
+
+    def write():
+        for i in range(3000):
+            log.append({"timestamp": float(i), "content": f"Dream {i}", "duration": 5})
+        done.set()
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    reads = 0
+    while not done.is_set() or reads == 0:
+        seen = [dream["timestamp"] for dream in log.iter_dreams()]
+        assert seen == [float(i) for i in range(len(seen))]
+        tail = [dream["timestamp"] for dream in log.tail(20)]
+        assert tail == [tail[0] + i for i in range(len(tail))]
+        reads += 1
+    writer.join()
+    assert len(list(log.iter_dreams())) == 3000
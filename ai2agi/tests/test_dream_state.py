@@ -0,0 +1,49 @@
+from core.dream_scheduler import DreamScheduler
+from core.dream_state import DreamState
+
+
+def make_dream_state(tmp_path):
+    return DreamState(str(tmp_path / "dream_log.txt"), scheduler=DreamScheduler(virtual=True))
+
+
+def test_dream_ends_and_is_logged(tmp_path):
+    dreams = []
+    state = make_dream_state(tmp_path)
+    future = state.enter_dream_state(on_complete=dreams.append)
+    assert state.enter_dream_state() is future
+
+    state.scheduler.run()
+
+    assert not state.dream_state
+    assert dreams == [future.result()]
+    assert [dream["content"] for dream in state.iter_dreams()] == [state.dream_content]
+
+
+def test_cancelled_dream_resets_the_state(tmp_path):
+    dreams = []
+    state = make_dream_state(tmp_path)
+    future = state.enter_dream_state(on_complete=dreams.append)
+
+    assert future.cancel()
+
+    assert not state.dream_state
+    next_future = state.enter_dream_state()
+    assert next_future is not future and not next_future.cancelled()
+    state.scheduler.run()
+    assert next_future.result()["content"] == state.dream_content
+    assert dreams == []
+    assert len(list(state.iter_dreams())) == 1
+
+
+def test_failed_dream_end_resets_the_state(tmp_path, monkeypatch):
+    state = make_dream_state(tmp_path)
+
+    def fail():
+        raise OSError("disk full")
+
+    monkeypatch.setattr(state, "save_dream_to_log", fail)
+    future = state.enter_dream_state()
+    state.scheduler.run()
+
+    assert isinstance(future.exception(), OSError)
+    assert not state.dream_state
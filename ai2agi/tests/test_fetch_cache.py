@@ -0,0 +1,57 @@
+import random
+from core.fetch_cache import FetchCache, SimHashIndex, simhash
+
+WORDS = [f"word{i}" for i in range(2000)]
+
+
+def page(words):
+    return f"<html><head><style>body {{}}</style></head><body><p>{' '.join(words)}</p></body></html>"
+
+
+def test_simhash_distances():
+    rng = random.Random(7)
+    text = rng.choices(WORDS, k=400)
+    edited = list(text)
+    edited[200] = "changed"
+    other = rng.choices(WORDS, k=400)
+
+    base = simhash(page(text))
+    assert simhash(page(text)) == base
+    assert simhash(f"<div>{' '.join(text)}</div>") == base  # Only the visible text counts
+    assert bin(base ^ simhash(page(edited))).count("1") <= 3
+    assert bin(base ^ simhash(page(other))).count("1") > 10
+    assert simhash(page(text[:10])) is None
+
+
+def test_index_finds_every_fingerprint_within_the_distance():
+    rng = random.Random(11)
+    index = SimHashIndex(max_distance=3)
+    stored = [rng.getrandbits(64) for _ in range(500)]
+    assert all(index.add(fingerprint) for fingerprint in stored)
+    assert index.size == 500
+
+    for fingerprint in stored[:100]:
+        flipped = fingerprint
+        for bit in rng.sample(range(64), rng.randint(0, 3)):
+            flipped ^= 1 << bit
+        assert index.find(flipped) == fingerprint
+        assert not index.add(flipped)
+    far = stored[0] ^ 0b1111  # Four bits away from stored[0], and (almost surely) from the others
+    assert index.find(far) is None and index.add(far)
+    assert index.size == 501
+
+
+def test_cache_round_trip(tmp_path):
+    cache = FetchCache(str(tmp_path / "cache.db"))
+    fingerprint = (1 << 63) | 5
+    cache.put("http://a/", '"v1"', None, {"title": "A"}, ["http://a/b"], fingerprint)
+    cache.put("http://a/b", None, "Mon, 01 Jan 2024 00:00:00 GMT", {"title": "B"}, [])
+
+    entry = cache.get("http://a/")
+    assert entry == {"etag": '"v1"', "last_modified": None, "record": {"title": "A"}, "links": ["http://a/b"],
+                     "fingerprint": fingerprint}
+    assert cache.conditional_headers(entry) == {"If-None-Match": '"v1"'}
+    assert cache.conditional_headers(cache.get("http://a/b")) == {
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    assert cache.get("http://a/missing") is None
+    cache.close()
@@ -0,0 +1,40 @@
+import json
+import logging
+import pytest
+from core.jsonl_writer import JsonlWriter
+from core.performance_log import get_performance_log
+
+
+def test_one_bad_record_does_not_drop_its_batch(tmp_path, caplog):
+    path = tmp_path / "records.jsonl"
+    writer = JsonlWriter(str(path), max_batch_size=1000, flush_interval=60, fsync=False)
+    for i in range(10):
+        writer.log({"record": i, "tags": {"bad"} if i == 4 else ["good"]})
+    with caplog.at_level(logging.ERROR):
+        writer.close()
+
+    assert [json.loads(line)["record"] for line in path.read_text().splitlines()] == [0, 1, 2, 3, 5, 6, 7, 8, 9]
+    assert writer.entries_written == 9 and writer.entries_dropped == 1
+    assert "Dropped a record" in caplog.text
+
+
+def test_batches_and_close(tmp_path):
+    path = tmp_path / "records.jsonl"
+    writer = JsonlWriter(str(path), max_batch_size=100, flush_interval=60, fsync=False)
+    for i in range(250):
+        writer.log({"record": i})
+    assert writer.batches_written == 2
+    writer.close()
+
+    assert len(path.read_text().splitlines()) == 250
+    with pytest.raises(ValueError):
+        writer.log({"record": 250})
+
+
+def test_performance_logs_are_shared_per_file(tmp_path):
+    path = str(tmp_path / "cell_performance.json")
+    writer = get_performance_log(path)
+    assert get_performance_log(path) is writer
+    writer.close()
+    assert get_performance_log(path) is not writer
+    get_performance_log(path).close()
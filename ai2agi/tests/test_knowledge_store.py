@@ -0,0 +1,64 @@
+import pytest
+from core.consciousness import AGI
+from core.knowledge_store import KnowledgeStore
+
+
+def test_agents_do_not_share_knowledge_by_default(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    first = AGI()
+    first.learn({"Goal": "Solve complex problems"})
+
+    assert dict(AGI().knowledge_base) == {}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_store_works_as_a_dict(tmp_path):
+    store = KnowledgeStore(str(tmp_path / "knowledge.db"))
+    store.update({"AI": "Self-improvement"}, goal="solve problems")
+    store["action"] = "Explore"
+    store["action"] = "Analyze"
+
+    assert store == {"AI": "Self-improvement", "goal": "solve problems", "action": "Analyze"}
+    assert sorted(store) == sorted(store.keys()) == ["AI", "action", "goal"]
+    assert sorted(store.values()) == ["Analyze", "Self-improvement", "solve problems"]
+    assert store.version("action") == 2
+
+    del store["goal"]
+    assert "goal" not in store and store.search("problems") == [] and store.history("goal") == []
+    store.close()
+
+    reopened = KnowledgeStore(str(tmp_path / "knowledge.db"))
+    assert dict(reopened) == {"AI": "Self-improvement", "action": "Analyze"}
+    assert [fact["value"] for fact in reopened.history("action")] == ["Analyze", "Explore"]
+    reopened.close()
+
+
+def test_unserializable_value_is_not_learned(tmp_path):
+    store = KnowledgeStore(str(tmp_path / "knowledge.db"))
+    store["colors"] = "red"
+
+    with pytest.raises(TypeError):
+        store["colors"] = {"green", "blue"}
+    with pytest.raises(TypeError):
+        store["shapes"] = {"circle"}
+
+    assert store["colors"] == "red" and store.version("colors") == 1 and "shapes" not in store
+    assert store.search("green") == [] and store.search("red") == [("colors", "red")]
+    assert [fact["value"] for fact in store.history("colors")] == ["red"]
+    store.close()
+
+
+def test_search_returns_the_most_recent_matches():
+    store = KnowledgeStore(":memory:")
+    for i in range(1000):
+        store.put(f"fact_{i}", f"sensor {i % 10} state {i % 7} common")
+    store.put("fact_3", "sensor 3 state 3 common")  # Re-learned: now the most recent
+
+    expected = sorted((key for key, value in store.items() if all(term in value.split() for term in ("3", "common"))),
+                      key=lambda key: store.facts[key][3], reverse=True)
+    assert [key for key, _ in store.search("common 3", limit=5)] == expected[:5]
+    assert [key for key, _ in store.search("common 3", limit=None)] == expected
+    assert expected[0] == "fact_3" and store.count("common 3") == len(expected)
+    assert store.search("sensor", prefix="comm", limit=2) == [("fact_3", "sensor 3 state 3 common"),
+                                                              ("fact_999", "sensor 9 state 5 common")]
+    assert store.count(prefix="stat") == 1000 and store.search("missing") == []
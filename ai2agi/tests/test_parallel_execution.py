@@ -0,0 +1,56 @@
+import numpy as np
+from core.cell_population import CellPopulation
+from core.cell_registry import IdAllocator
+from core.parallel_execution import ParallelCellExecutor, SYNCED_ARRAYS, apply_changes, array_changes
+
+
+def make_population():
+    population = CellPopulation(3000, parent_id="CHILD_1", seed=3, allocator=IdAllocator(), initial_energy=0.6)
+    population.assign_task("Analyze environment")
+    population.assign_task("Collect data", indices=np.arange(0, 3000, 3))
+    return population
+
+
+def test_sharded_batches_match_serial_ticks(caplog):
+    sharded, serial = make_population(), make_population()
+    serial_counts = {}
+
+    def tick_serial(steps, energy_amount=None):
+        for _ in range(steps):
+            _, codes = serial.perform_task()
+            for code in codes:
+                serial_counts[serial.task_names[code]] = serial_counts.get(serial.task_names[code], 0) + 1
+            serial.self_evolve()
+            if energy_amount is not None:
+                serial.receive_energy(energy_amount)
+
+    with ParallelCellExecutor(workers=3, min_shard_size=1000) as executor:
+        assert len(executor.shard_bounds(sharded.size)) == 3
+        with caplog.at_level("INFO"):
+            counts = executor.run(sharded, steps=2, energy_amount=0.05)
+        assert "by 3 shards" in caplog.text
+        tick_serial(2, 0.05)
+        assert counts == serial_counts
+        serial_counts.clear()
+        for population in (sharded, serial):  # Changes made between batches reach the workers
+            population.assign_task("Run adaptation protocol", indices=np.arange(1, 3000, 2))
+            population.energy_level[:10] = 0.0
+        counts2 = executor.run(sharded, steps=3)
+    tick_serial(3)
+
+    assert counts2 == serial_counts and sum(counts.values()) > 0 and counts2["Run adaptation protocol"] > 0
+    for name in SYNCED_ARRAYS:
+        assert np.array_equal(getattr(sharded, name), getattr(serial, name)), name
+
+
+def test_array_changes_round_trip():
+    before = np.arange(12).reshape(3, 4)
+    after = before.copy()
+    after[1, 2] = 99
+
+    indices, values = array_changes(before, after)
+    assert list(indices) == [6] and list(values) == [99]
+    assert np.array_equal(apply_changes(before.copy(), (indices, values)), after)
+
+    grown = np.zeros((3, 8))
+    assert apply_changes(before, array_changes(before, grown)).shape == (3, 8)
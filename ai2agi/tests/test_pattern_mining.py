@@ -0,0 +1,66 @@
+import random
+from collections import Counter
+from core.pattern_mining import FrequentPatternMiner, SpaceSaving
+
+
+def check_buckets(sketch):
+    assert sketch.min_count == min(sketch.counts.values())
+    assert {count: items for count, items in sketch.buckets.items()} == {
+        count: {item for item, item_count in sketch.counts.items() if item_count == count}
+        for count in set(sketch.counts.values())}
+
+
+def test_min_count_follows_evictions_and_increments():
+    sketch = SpaceSaving(capacity=2)
+    sketch.add("a")
+    sketch.add("a")
+    sketch.add("b")
+    assert sketch.min_count == 1
+    sketch.add("b")  # The only count-1 item moves up: the minimum is now 2
+    assert sketch.min_count == 2 and sketch.buckets == {2: {"a", "b"}}
+
+    sketch.add("c")  # Evicts a count-2 item and inherits its count as error
+    evicted = ({"a", "b"} - set(sketch.counts)).pop()
+    assert sketch.count("c") == 3 and sketch.guaranteed_count("c") == 1 and evicted not in sketch
+    assert sketch.min_count == 2
+    check_buckets(sketch)
+    sketch.add("b" if evicted == "a" else "a")  # The remaining count-2 item: minimum moves to 3
+    assert sketch.min_count == 3 and sketch.total == 6
+    check_buckets(sketch)
+
+
+def test_sketch_bounds_hold_on_a_skewed_stream():
+    rng = random.Random(5)
+    sketch = SpaceSaving(capacity=20)
+    stream = [min(int(rng.paretovariate(1.2)), 500) for _ in range(5000)]
+    true_counts = Counter()
+    for i, item in enumerate(stream):
+        sketch.add(item)
+        true_counts[item] += 1
+        if i % 97 == 0:
+            check_buckets(sketch)
+
+    check_buckets(sketch)
+    assert len(sketch) == 20 and sum(sketch.counts.values()) == sketch.total == 5000
+    for item, count in sketch.items():
+        assert sketch.guaranteed_count(item) <= true_counts[item] <= count
+    assert all(item in sketch for item, count in true_counts.items() if count > 5000 / 20)
+    assert [item for item, _ in sketch.top(2)] == [item for item, _ in true_counts.most_common(2)]
+
+
+def test_miner_finds_pairs_sequences_and_next_behaviors():
+    miner = FrequentPatternMiner(capacity=50)
+    triggers = {"stress": "deadline", "coping": "breathing", "calmness": "rest"}
+    for i in range(300):
+        behavior = ("stress", "coping", "calmness")[i % 3]
+        miner.observe(behavior, trigger=triggers[behavior])
+        if i % 10 == 0:
+            miner.observe("coping")  # Without a trigger: only sequences are updated
+
+    assert miner.top_pairs(1) == [(("deadline", "stress"), 100)]
+    assert miner.behaviors_for("deadline") == [("stress", 100, 1.0)] and miner.behaviors_for("unknown") == []
+    assert miner.top_sequences(1, length=3)[0][0] in {("stress", "coping", "calmness"),
+                                                      ("coping", "calmness", "stress")}
+    assert miner.predict_next(["stress", "coping"])[0][0] == "calmness"
+    assert miner.predict_next(["unknown", "calmness"])[0][0] == "stress"  # Falls back to a shorter context
+    assert miner.predict_next(["unknown"]) == []
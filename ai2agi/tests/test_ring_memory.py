@@ -0,0 +1,64 @@
+import json
+import numpy as np
+import pytest
+from core.ring_memory import RingMemoryChannel, NumericRingChannel
+
+TIERS = ((10, 2), (100, 2))
+
+
+@pytest.mark.parametrize("channel_type", [RingMemoryChannel, NumericRingChannel])
+def test_full_channel_wraps_around_and_rolls_up_the_oldest_entries(channel_type):
+    channel = channel_type(3, numeric_fields=("v",), tiers=TIERS)
+    for i in range(7):
+        channel.append({"timestamp": float(i), "v": float(i)})
+
+    assert list(channel) == [{"timestamp": float(i), "v": float(i)} for i in (4, 5, 6)]
+    assert channel[0]["v"] == 4.0 and channel[-1]["v"] == 6.0 and channel[1:] == list(channel)[1:]
+    assert len(channel) == 3 and channel.total_appended == 7
+    assert list(channel.timestamps()) == [4.0, 5.0, 6.0] and list(channel.field_values("v")) == [4.0, 5.0, 6.0]
+    assert list(channel.rollups[0]) == [{"start": 0.0, "count": 4, "fields": {"v": [6.0, 0.0, 3.0]}}]
+    assert channel.series("v") == [(0.0, 7, 3.0)]
+
+
+@pytest.mark.parametrize("channel_type", [RingMemoryChannel, NumericRingChannel])
+def test_rollups_cascade_to_coarser_tiers(channel_type):
+    channel = channel_type(1, numeric_fields=("v",), tiers=TIERS)
+    for timestamp in range(0, 40, 10):
+        channel.append({"timestamp": timestamp, "v": timestamp})
+
+    assert [bucket["start"] for bucket in channel.rollups[0]] == [10, 20]
+    assert list(channel.rollups[1]) == [{"start": 0, "count": 1, "fields": {"v": [0, 0, 0]}}]
+    assert channel.series("v", resolution=100) == [(0, 4, 15.0)]
+    assert channel.series("v") == [(0, 1, 0.0), (10, 1, 10.0), (20, 1, 20.0), (30, 1, 30.0)]
+    assert channel.count_since(10) == 3
+
+
+def test_missing_and_non_numeric_fields_are_left_out():
+    entries = [{"timestamp": 1.0, "a": 1.0}, {"timestamp": 2.0, "a": "high", "b": 2.0},
+               {"timestamp": 3.0, "a": 3.0, "b": 4.0}]
+    channel = NumericRingChannel(2, numeric_fields=("a", "b"), tiers=TIERS)
+    reference = RingMemoryChannel(2, numeric_fields=("a", "b"), tiers=TIERS)
+    channel.extend(entries)
+    reference.extend(entries)
+
+    assert list(channel) == [{"timestamp": 2.0, "b": 2.0}, {"timestamp": 3.0, "a": 3.0, "b": 4.0}]
+    assert list(channel.field_values("a")) == [3.0] and list(channel.field_values("c")) == []
+    assert list(channel.rollups[0]) == list(reference.rollups[0]) == [
+        {"start": 0.0, "count": 1, "fields": {"a": [1.0, 1.0, 1.0], "b": [0.0, None, None]}}]
+    for field in ("a", "b", None):
+        assert channel.series(field) == reference.series(field)
+    assert channel.series("a") == [(0.0, 3, 2.0)]
+
+
+@pytest.mark.parametrize("channel_type", [RingMemoryChannel, NumericRingChannel])
+def test_channel_survives_a_json_round_trip(channel_type):
+    channel = channel_type(5, numeric_fields=("v",), tiers=TIERS)
+    for i in range(50):
+        channel.append({"timestamp": float(i * 3), "v": i % 4} if i % 7 else {"timestamp": float(i * 3)})
+
+    restored = channel_type.from_dict(json.loads(json.dumps(channel.to_dict())))
+
+    assert list(restored) == list(channel) and restored.total_appended == 50
+    assert restored.series("v", resolution=30) == channel.series("v", resolution=30)
+    restored.append({"timestamp": 150.0, "v": 1})
+    assert np.array_equal(restored.timestamps(), [138.0, 141.0, 144.0, 147.0, 150.0])
@@ -0,0 +1,97 @@
+import json
+import random
+import numpy as np
+from core.rule_engine import DecisionTable
+from core.decision_making import DecisionMaking
+from core.ai_control import AIControl
+
+ROWS = 200000
+
+
+def previous_decide(analysis):
+    """DecisionMaking.decide before the decision tables."""
+    actions = []
+    if "temperature" in analysis:
+        if analysis["temperature"] > 30:
+            actions.append("Activate cooling system.")
+        elif analysis["temperature"] < 15:
+            actions.append("Activate heating system.")
+    if "light" in analysis:
+        if analysis["light"] == "high":
+            actions.append("Optimize energy usage.")
+        elif analysis["light"] == "low":
+            actions.append("Increase lighting.")
+    if "humidity" in analysis:
+        if analysis["humidity"] > 80:
+            actions.append("Activate dehumidifier.")
+        elif analysis["humidity"] < 20:
+            actions.append("Activate humidifier.")
+    if not actions:
+        actions.append("No action needed.")
+    return actions
+
+
+def previous_make_decision(environmental_data):
+    """AIControl.make_decision before the decision tables."""
+    if environmental_data.get("temperature") > 30:
+        return "Cool down the environment."
+    elif environmental_data.get("light") == "low":
+        return "Increase light."
+    else:
+        return "Maintain current state."
+
+
+def random_readings(rows, seed=7):
+    rng = random.Random(seed)
+    boundaries = [14, 14.999, 15, 15.001, 20, 29.999, 30, 30.001, 80, 80.001, 19.999]
+    readings = []
+    for _ in range(rows):
+        reading = {}
+        for field, low, high in (("temperature", -10, 50), ("humidity", 0, 100)):
+            if rng.random() < 0.9:
+                reading[field] = rng.choice(boundaries) if rng.random() < 0.3 else rng.uniform(low, high)
+        if rng.random() < 0.9:
+            reading["light"] = rng.choice(["low", "medium", "high", "dark"])
+        readings.append(reading)
+    return readings
+
+
+def test_decide_matches_the_previous_branches():
+    decision_maker = DecisionMaking(verbose=False)
+    readings = random_readings(ROWS)
+    assert [decision_maker.decide(reading) for reading in readings] == [previous_decide(r) for r in readings]
+
+
+def test_decide_batch_matches_the_previous_branches():
+    decision_maker = DecisionMaking(verbose=False)
+    readings = [reading for reading in random_readings(ROWS, seed=11) if len(reading) == 3]
+    columns = {field: np.array([reading[field] for reading in readings])
+               for field in ("temperature", "light", "humidity")}
+    assert decision_maker.decide_batch(columns) == [previous_decide(reading) for reading in readings]
+
+
+def test_make_decision_matches_the_previous_branches():
+    control = AIControl()
+    readings = [reading for reading in random_readings(ROWS // 10, seed=13) if "temperature" in reading]
+    assert [control.make_decision(r) for r in readings] == [previous_make_decision(r) for r in readings]
+
+
+def test_ungrouped_rules_fire_in_rule_order():
+    table = DecisionTable([{"when": {"x": {"gt": i}}, "action": f"above {i}"} for i in range(200)],
+                          default=["none"])
+    assert table.evaluate({"x": 3.5}) == ["above 0", "above 1", "above 2", "above 3"]
+    assert table.evaluate({"x": -1}) == ["none"]
+
+
+def test_from_file_reuses_the_compiled_table_until_the_file_changes(tmp_path):
+    rules_file = tmp_path / "rules.json"
+    rules = {"table": {"rules": [{"when": {"x": {"gt": 1}}, "action": "big"}]}}
+    rules_file.write_text(json.dumps(rules))
+    table = DecisionTable.from_file("table", str(rules_file))
+    assert DecisionTable.from_file("table", str(rules_file)) is table
+
+    rules["table"]["rules"][0]["action"] = "large"
+    rules_file.write_text(json.dumps(rules))
+    reloaded = DecisionTable.from_file("table", str(rules_file))
+    assert reloaded is not table
+    assert reloaded.evaluate({"x": 2}) == ["large"]
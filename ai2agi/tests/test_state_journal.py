@@ -0,0 +1,86 @@
+from core.state_journal import StateJournal
+from core.mother_cell import MotherCell
+
+
+def make_journal(tmp_path, compact_threshold=1000):
+    return StateJournal(str(tmp_path / "state.json"), str(tmp_path / "state.journal"), compact_threshold)
+
+
+def test_new_journal_continues_the_sequence(tmp_path):
+    journal = make_journal(tmp_path, compact_threshold=3)
+    for step in range(5):
+        journal.save({"x": step, "l": list(range(step + 1))})
+    journal.close()
+
+    journal = make_journal(tmp_path, compact_threshold=3)
+    journal.save({"x": 99, "l": [1]})
+    journal.close()
+
+    assert make_journal(tmp_path).load() == {"x": 99, "l": [1]}
+
+
+def test_dirty_paths_only_write_the_listed_parts(tmp_path):
+    journal = make_journal(tmp_path)
+    state = {"a": 1, "b": {"c": [1, 2]}, "d": {"e": 0}}
+    journal.save(state)
+    assert journal.save({"b": {"c": [1, 2, 3]}}, dirty=[["b", "c"]]) == 1
+    assert journal.save({"a": 2}, dirty=[["a"], ["z"]]) == 1
+    journal.close()
+
+    assert make_journal(tmp_path).load() == {"a": 2, "b": {"c": [1, 2, 3]}, "d": {"e": 0}}
+
+
+def test_mother_cell_journal_in_a_fresh_process(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    mother = MotherCell()
+    mother.enable_journal(compact_threshold=3)
+    for step in range(5):
+        mother.energy_level = step / 10
+        mother.memory["decision_log"].append({"timestamp": step, "decision": f"step {step}"})
+        mother.save_state()
+    mother.state_journal.close()
+
+    reloaded = MotherCell()
+    reloaded.enable_journal()
+    assert reloaded.load_state()
+    assert reloaded.get_state() == mother.get_state()
+    reloaded.state_journal.close()
+
+    restarted = MotherCell()
+    restarted.enable_journal(compact_threshold=3)
+    restarted.energy_level = 0.99
+    restarted.save_state()
+    restarted.state_journal.close()
+
+    restored = MotherCell()
+    restored.enable_journal()
+    assert restored.load_state()
+    assert restored.energy_level == 0.99
+    assert len(restored.memory["decision_log"]) == 0
+
+
+def test_children_are_registered_after_load_state(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    mother = MotherCell()
+    mother.enable_journal()
+    child_ids = [mother.create_child().id for _ in range(3)]
+    mother.save_state()
+    mother.state_journal.close()
+
+    for journaled in (True, False):
+        restored = MotherCell()
+        restored.create_child()  # Not part of the saved state
+        if journaled:
+            restored.enable_journal()
+        else:
+            mother.state_journal = None
+            mother.save_state()
+        assert restored.load_state()
+
+        assert restored.children == child_ids
+        assert [restored.get_child(child_id).id for child_id in child_ids] == child_ids
+        assert restored.registry.children_ids(restored.id) == child_ids
+        assert restored.get_child(restored.create_child().id) is not None
+        assert len(set(restored.children)) == 4
+        if journaled:
+            restored.state_journal.close()
@@ -0,0 +1,29 @@
+import time
+from core.subconscious import Subconscious
+
+
+def test_behavior_trend_is_judged_on_the_window():
+    subconscious = Subconscious(retention=3, trend_window=60, positive_threshold=2)
+    for _ in range(4):
+        subconscious.record_subconscious_behavior("stress", trigger="deadline")
+    subconscious.record_subconscious_behavior("calmness")
+
+    assert len(subconscious.subconscious_data["stress"]) == 3  # Bounded retention, counters keep the total
+    assert subconscious.analyze_behavior_trend("stress") == "Positive"
+    assert subconscious.analyze_behavior_trend("stress", now=time.time() + 120) == "Neutral"
+    assert subconscious.analyze_behavior_trend("calmness") == "Neutral"
+    assert subconscious.analyze_behavior_trend("unknown") == "Neutral"
+    assert subconscious.get_behavior_trend("stress")["total"] == 4
+    assert subconscious.count_behavior_since("stress", 60) == 4
+    assert subconscious.trigger_subconscious_action(trigger="deadline") == "Initiate coping mechanism"
+
+
+def test_entry_lists_are_judged_by_their_length():
+    subconscious = Subconscious(positive_threshold=2)
+    entries = [{"behavior": "stress", "trigger": None, "timestamp": 0.0}] * 3
+
+    assert subconscious.analyze_entries_trend(entries) == "Positive"
+    assert subconscious.analyze_entries_trend(entries[:2]) == "Neutral"
+    for entry in entries:
+        subconscious.record_subconscious_behavior(entry["behavior"])
+    assert subconscious.analyze_entries_trend(subconscious.subconscious_data["stress"]) == "Positive"
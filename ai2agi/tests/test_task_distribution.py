@@ -0,0 +1,88 @@
+import pytest
+from core.task_distribution import TaskDistribution
+
+
+class FakeCell:
+    def __init__(self, cell_id, energy_level=1.0, status="active"):
+        self.id = cell_id
+        self.energy_level = energy_level
+        self.status = status
+        self.assigned = []
+        self.performed = []
+
+    def assign_task(self, task):
+        self.assigned.append(task)
+
+    def perform_task(self):
+        self.performed.append(self.assigned[-1])
+
+
+def test_distribute_tasks_delivers_immediately_and_keeps_the_rest():
+    scheduler = TaskDistribution()
+    strong, weak, resting = FakeCell("A", 0.9), FakeCell("B", 0.3), FakeCell("C", status="resting")
+
+    assert scheduler.distribute_tasks([weak, strong, resting], ["t1", "t2", "t3"]) == 2
+
+    assert strong.assigned == ["t1"] and weak.assigned == ["t2"] and resting.assigned == []
+    assert [task for _, _, task, _ in scheduler.task_queue] == ["t3"]
+
+
+def test_urgent_task_overtakes_queued_low_priority_tasks():
+    scheduler = TaskDistribution()
+    cell = FakeCell("A")
+    scheduler.add_cells([cell])
+    for i in range(10):
+        scheduler.submit_task(f"low {i}", priority=5)
+
+    assert scheduler.run_step() == 1
+    scheduler.submit_task("urgent", priority=0)
+    scheduler.run_step()
+    scheduler.run_step()
+
+    assert cell.performed == ["low 0", "urgent", "low 1"]
+    assert scheduler.pending_tasks() == 8
+
+
+def test_free_slots_go_to_the_highest_energy_cells():
+    scheduler = TaskDistribution(max_queue_depth=2)
+    cells = [FakeCell("A", 0.2), FakeCell("B", 0.8), FakeCell("C", 0.0)]
+    scheduler.add_cells(cells)
+    for i in range(3):
+        scheduler.submit_task(i)
+
+    assert scheduler.schedule() == 3
+    assert {cell_id: len(queue) for cell_id, queue in scheduler.cell_queues.items()} == {"A": 1, "B": 2, "C": 0}
+    assert scheduler.schedule() == 0
+
+
+def test_idle_cells_steal_from_unavailable_and_overloaded_cells():
+    scheduler = TaskDistribution(max_queue_depth=4)
+    busy, sleeping, idle = FakeCell("A"), FakeCell("B"), FakeCell("C")
+    scheduler.add_cells([busy, sleeping, idle])
+    for task in ("a1", "a2", "a3"):
+        scheduler.queue_task_for_cell(busy, task)
+    scheduler.queue_task_for_cell(sleeping, "b1")
+    sleeping.status = "resting"
+
+    assert scheduler.steal_work() == 1
+    assert list(scheduler.cell_queues["C"]) and scheduler.cell_queues["C"][0][0] == "b1"
+    assert scheduler.run_step() == 2
+    assert busy.performed == ["a1"] and idle.performed == ["b1"] and sleeping.performed == []
+
+    assert scheduler.steal_work() == 1  # C is idle again: it takes the tail of A's queue
+    assert scheduler.cell_queues["C"][0][0] == "a3"
+    assert scheduler.stolen == 2
+
+
+@pytest.mark.parametrize("depth", [1, 3])
+def test_every_task_runs_once(depth):
+    scheduler = TaskDistribution(max_queue_depth=depth)
+    cells = [FakeCell(f"CELL_{i}", energy_level=0.1 + i / 10) for i in range(5)]
+    scheduler.add_cells(cells)
+    for i in range(100):
+        scheduler.submit_task(i, priority=i % 3)
+    while scheduler.pending_tasks():
+        assert scheduler.run_step()
+
+    assert sorted(task for cell in cells for task in cell.performed) == list(range(100))
+    assert scheduler.get_metrics()["completed_tasks"] == 100
@@ -0,0 +1,50 @@
+import math
+import pytest
+from core.trend_counters import BehaviorTrend, DecayedRate, SlidingWindowCounter
+
+
+def test_ring_slots_are_reused_once_they_leave_the_window():
+    counter = SlidingWindowCounter(resolution=1.0, slots=4)
+    for timestamp in (0.2, 0.7, 1.5, 3.9):
+        counter.add(timestamp)
+    assert counter.count(4, now=3.9) == 4
+
+    counter.add(4.1, count=5)  # Same position as slot 0: its two events are overwritten
+    assert counter.counts[0] == 5 and counter.slot_ids[0] == 4
+    assert counter.count(4, now=4.5) == 7 and counter.count(1, now=4.5) == 5
+    assert counter.count(100, now=4.5) == 7  # Capped to the window span
+
+    counter.add(0.5)  # Older than the slot now held by its position: dropped
+    counter.add(2.5)  # Late but still inside the window
+    assert counter.counts[0] == 5 and counter.count(4, now=4.5) == 8
+
+    counter.add(9.0)  # Slot 9 takes position 1; slot 1 (1.5) is gone, slots 2 and 3 are outside the window
+    assert counter.count(4, now=9.0) == 1 and counter.count(4, now=4.5) == 7
+    assert counter.count(4, now=100.0) == 0
+
+
+def test_decayed_rate_halves_after_each_half_life():
+    rate = DecayedRate(half_life=10.0)
+    assert rate.rate(now=0.0) == 0.0
+    rate.add(0.0, count=4)
+
+    assert rate.rate(now=10.0) == pytest.approx(2 * rate.decay)
+    assert rate.rate(now=20.0) == pytest.approx(rate.decay)
+    rate.add(20.0)
+    rate.add(10.0)  # A late event is weighted as if it had been added in order
+    assert rate.value == pytest.approx(1 + 1 + 0.5)
+    assert rate.decay == pytest.approx(math.log(2) / 10.0)
+
+
+def test_behavior_trend_summary_and_direction():
+    trend = BehaviorTrend()
+    for minute in range(120):
+        trend.add(60.0 * minute)  # One event per minute for two hours
+    assert trend.direction(now=7170.0) == "Steady"
+    for second in range(30):
+        trend.add(7170.0 + second)  # Then a burst
+
+    summary = trend.summary(now=7199.0)
+    assert summary["total"] == 150 and summary["first_seen"] == 0.0 and summary["last_seen"] == 7199.0
+    assert summary["last_minute"] == 31 and summary["last_hour"] == 90  # The burst and the event at 7140 and summary["last_day"] == 150
+    assert summary["direction"] == "Rising" and trend.direction(now=7199.0 + 3 * 3600) == "Falling"
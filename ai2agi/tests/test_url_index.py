@@ -0,0 +1,32 @@
+import pytest
+from core.url_index import VisitedIndex, canonicalize_url
+
+
+@pytest.mark.parametrize("url, canonical", [
+    ("HTTP://Example.COM:80/a#top", "http://example.com/a"),
+    ("https://example.com:8443", "https://example.com:8443/"),
+    ("/a?utm_source=x&b=2&a=1", "http://example.com/a?a=1&b=2"),
+    ("/a?b=x%20y+z&a=%7e&&", "http://example.com/a?a=~&b=x+y+z"),
+    ("/a?flag", "http://example.com/a?flag"),
+    ("/a?flag=", "http://example.com/a?flag="),
+    ("/a?z=1&flag&b", "http://example.com/a?b&flag&z=1"),
+    ("/%7euser/%c3%a9", "http://example.com/%7Euser/%C3%A9"),
+    ("http://user:pw@[::1]:8080/", "http://user:pw@[::1]:8080/"),
+    ("mailto:someone@example.com", None),
+    ("http://example.com:port/", None),
+])
+def test_canonical_urls(url, canonical):
+    assert canonicalize_url(url, "http://example.com/index.html") == canonical
+
+
+def test_visited_index_merges_and_serializes():
+    index = VisitedIndex(merge_threshold=10)
+    urls = [f"http://example.com/{i}" for i in range(100)]
+
+    assert all(index.add(url) for url in urls)
+    assert not any(index.add(url) for url in urls)
+    assert len(index) == 100 and len(index.hashes) >= 90
+
+    restored = VisitedIndex.from_string(index.to_string())
+    assert all(url in restored for url in urls) and "http://example.com/100" not in restored
+    assert len(restored) == 100 and restored.add("http://example.com/100")
@@ -0,0 +1,201 @@
+import json
+import threading
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pytest
+from core.web_spiders import WebSpider
+from core.sharded_crawl import ShardedCrawler, shard_for_url
+
+
+class Site:
+    """A local web site: path -> HTML, served with an ETag per page."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = Counter()  # Path -> GET requests (query string included)
+        self.not_modified = Counter()  # Path -> 304 answers
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                site.requests[self.path] += 1
+                path = self.path.split("?")[0]
+                if path not in site.pages:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                etag = f'"{hash(site.pages[path]) & 0xffffffff}"'
+                if self.headers.get("If-None-Match") == etag:
+                    site.not_modified[path] += 1
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                body = site.pages[path].encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def html(title, links=(), text=None):
+    text = text if text is not None else " ".join(f"{title.replace(' ', '_')}_{i}" for i in range(200))
+    anchors = "".join(f'<a href="{link}">link</a>' for link in links)
+    return f"<html><head><title>{title}</title></head><body><p>{text}</p>{anchors}</body></html>"
+
+
+@pytest.fixture
+def make_site():
+    sites = []
+
+    def make(pages):
+        sites.append(Site(pages))
+        return sites[-1]
+
+    yield make
+    for site in sites:
+        site.close()
+
+
+def crawl(site, depth=10, **options):
+    options.setdefault("politeness_delay", 0)
+    spider = WebSpider(site.url, verbose=False, **options)
+    spider.crawl(site.url + "/", depth=depth)
+    spider.close()
+    return spider
+
+
+def titles(spider, output_path=None):
+    records = spider.data if output_path is None else [json.loads(line) for line in open(output_path)]
+    return sorted(record.get("title", record["url"]) for record in records)
+
+
+def test_near_duplicates_are_flagged_without_parsing(make_site, tmp_path, monkeypatch):
+    site = make_site({
+        "/": html("home", ["/a", "/copy"]),
+        "/a": html("A"),
+        "/copy": html("home", ["/hidden"]),  # Same text as the home page, different links
+        "/hidden": html("hidden"),
+    })
+    parsed = []
+    parse_page = WebSpider.parse_page
+    monkeypatch.setattr(WebSpider, "parse_page", lambda self, page, url=None: parsed.append(url) or
+                        parse_page(self, page, url))
+
+    assert titles(crawl(site)) == ["A", "hidden", "home", "home"]  # Off by default
+    parsed.clear()
+
+    cache_path = str(tmp_path / "cache.db")
+    spider = crawl(site, dedup_distance=3, cache_path=cache_path)
+    assert titles(spider) == ["A", "home", site.url + "/copy"]
+    assert {"url": site.url + "/copy", "duplicate": True} in spider.data
+    assert site.url + "/copy" not in parsed and spider.pages_duplicate == 1
+    assert site.requests["/hidden"] == 1  # Only fetched by the crawl without dedup
+
+    spider = crawl(site, dedup_distance=3, cache_path=cache_path)  # Revalidated, flag kept
+    assert spider.pages_not_modified == 3 and site.not_modified["/copy"] == 1
+    assert {"url": site.url + "/copy", "duplicate": True} in spider.data
+
+
+def test_fragment_and_tracking_variants_are_fetched_once(make_site):
+    site = make_site({
+        "/": html("home", ["/a#top", "/a?utm_source=x", "a", "/a?utm_medium=y#z", "/b?y=2&x=1", "/b?x=1&y=2",
+                           "/c?flag", "/c?flag="]),
+        "/a": html("A", ["/#top", "/"]),
+        "/b": html("B"),
+        "/c": html("C"),
+    })
+
+    spider = crawl(site)
+
+    assert titles(spider) == ["A", "B", "C", "C", "home"]
+    assert site.requests == {"/": 1, "/a": 1, "/b?x=1&y=2": 1, "/c?flag": 1, "/c?flag=": 1}
+
+
+def test_interrupted_crawl_resumes_from_its_checkpoint(make_site, tmp_path, monkeypatch):
+    pages = {f"/p{i}": html(f"page {i}", [f"/p{i}/child"]) for i in range(6)}
+    pages.update({f"/p{i}/child": html(f"child {i}") for i in range(6)})
+    site = make_site(dict(pages, **{"/": html("home", list(pages)[:6])}))
+    options = {"concurrency": 1, "checkpoint_path": str(tmp_path / "crawl.checkpoint"), "checkpoint_interval": 1,
+               "output_path": str(tmp_path / "records.jsonl")}
+
+    store_record = WebSpider.store_record
+
+    class Interrupted(Exception):
+        pass
+
+    def interrupt_after_five(self, data):
+        if self.pages_fetched == 5:
+            raise Interrupted
+        store_record(self, data)
+
+    monkeypatch.setattr(WebSpider, "store_record", interrupt_after_five)
+    with pytest.raises(Interrupted):
+        crawl(site, depth=3, **options)
+    monkeypatch.setattr(WebSpider, "store_record", store_record)
+    assert len(titles(None, options["output_path"])) == 5
+
+    spider = WebSpider(site.url, verbose=False, politeness_delay=0, **options)
+    spider.crawl(site.url + "/", depth=3, resume=True)
+    spider.close()
+
+    assert titles(None, options["output_path"]) == sorted(["home"] + [f"page {i}" for i in range(6)] +
+                                                          [f"child {i}" for i in range(6)])
+    assert spider.pages_fetched == 13 and sum(site.requests.values()) == 14  # The interrupted page is fetched again
+
+
+def test_unchanged_pages_are_revalidated_and_changed_ones_parsed(make_site, tmp_path, monkeypatch):
+    site = make_site({
+        "/": html("home", ["/a", "/b"]),
+        "/a": html("A", ["/hidden"]),
+        "/b": html("B"),
+        "/hidden": html("hidden"),
+    })
+    cache_path = str(tmp_path / "cache.db")
+    first = crawl(site, cache_path=cache_path)
+
+    site.pages["/b"] = html("B v2")
+    parsed = []
+    parse_page = WebSpider.parse_page
+    monkeypatch.setattr(WebSpider, "parse_page", lambda self, page, url=None: parsed.append(url) or
+                        parse_page(self, page, url))
+    second = crawl(site, cache_path=cache_path)
+
+    assert titles(first) == ["A", "B", "hidden", "home"] and titles(second) == ["A", "B v2", "hidden", "home"]
+    assert second.pages_not_modified == 3 and parsed == [site.url + "/b"]
+    assert site.not_modified == {"/": 1, "/a": 1, "/hidden": 1}  # Reached through the cached links of /a
+
+
+def test_sharded_crawl_ends_once_every_shard_is_idle(make_site):
+    site = make_site({})
+    other_host = site.url.replace("127.0.0.1", "localhost")
+    workers = next(count for count in range(2, 16)
+                   if shard_for_url(site.url, count) != shard_for_url(other_host, count))
+    site.pages.update({
+        "/": html("home", ["/a", other_host + "/b"]),
+        "/a": html("A", [other_host + "/a"]),
+        "/b": html("B", [site.url + "/b", "/missing"]),
+    })
+    crawler = ShardedCrawler(site.url, workers=workers, politeness_delay=0, verbose=False)
+    fetched = []
+    thread = threading.Thread(target=lambda: fetched.append(crawler.crawl(site.url + "/", depth=5)))
+    thread.start()
+    thread.join(timeout=60)
+
+    assert not thread.is_alive() and fetched == [7]  # /missing of both hosts included
+    assert titles(crawler) == ["A", "A", "B", "B", "home"]
+    assert sum(stats["links_sent"] for stats in crawler.shard_stats.values()) >= 2
+    assert site.requests["/missing"] == 2 and site.requests["/b"] == 2